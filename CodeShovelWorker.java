@@ -0,0 +1,106 @@
+import com.felixgrund.codeshovel.execution.MainCli;
+import com.google.gson.Gson;
+import com.google.gson.JsonArray;
+import com.google.gson.JsonObject;
+import com.google.gson.JsonParser;
+
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+
+/**
+ * Worker persistente do CodeShovel
+ *
+ * Lê uma requisição JSON por linha da entrada padrão, executa o MainCli na
+ * mesma JVM e responde com uma linha JSON na saída padrão. Toda a saída do
+ * próprio CodeShovel é redirecionada para stderr para não corromper o
+ * protocolo. O arquivo gerado pelo CodeShovel fica no diretório privado do
+ * worker, é embutido na resposta e removido em seguida.
+ *
+ * Requisições:
+ *   {"id": 1, "type": "ping"}
+ *   {"id": 2, "type": "analyze", "args": [...]}
+ *
+ * Respostas:
+ *   {"id": 1, "ok": true}
+ *   {"id": 2, "ok": true, "result": {...}}
+ *   {"id": 3, "ok": false, "error": "..."}
+ *
+ * Uso (Java 11+):
+ *   java -cp codeshovel.jar CodeShovelWorker.java <diretório-privado>
+ */
+public class CodeShovelWorker {
+
+    public static void main(String[] args) throws Exception {
+        Path outputDir = Paths.get(args.length > 0 ? args[0] : System.getProperty("java.io.tmpdir"));
+        long requests = 0;
+
+        PrintStream protocol = new PrintStream(
+                new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        System.setOut(System.err);
+
+        BufferedReader in = new BufferedReader(
+                new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        Gson gson = new Gson();
+        JsonParser parser = new JsonParser();
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.trim().isEmpty()) {
+                continue;
+            }
+
+            JsonObject response = new JsonObject();
+            try {
+                JsonObject request = parser.parse(line).getAsJsonObject();
+                response.add("id", request.get("id"));
+
+                String type = request.get("type").getAsString();
+                if ("ping".equals(type)) {
+                    response.addProperty("ok", true);
+                } else if ("analyze".equals(type)) {
+                    Path outfile = outputDir.resolve("result-" + (requests++) + ".json");
+
+                    JsonArray jsonArgs = request.getAsJsonArray("args");
+                    String[] cliArgs = new String[jsonArgs.size() + 2];
+                    for (int i = 0; i < jsonArgs.size(); i++) {
+                        cliArgs[i] = jsonArgs.get(i).getAsString();
+                    }
+                    cliArgs[cliArgs.length - 2] = "-outfile";
+                    cliArgs[cliArgs.length - 1] = outfile.toString();
+
+                    try {
+                        MainCli.main(cliArgs);
+
+                        String content = Files.exists(outfile)
+                                ? new String(Files.readAllBytes(outfile), StandardCharsets.UTF_8).trim()
+                                : "";
+                        if (content.isEmpty()) {
+                            response.addProperty("ok", false);
+                            response.addProperty("error", "arquivo de saída vazio ou não gerado");
+                        } else {
+                            response.addProperty("ok", true);
+                            response.add("result", parser.parse(content));
+                        }
+                    } finally {
+                        Files.deleteIfExists(outfile);
+                    }
+                } else {
+                    response.addProperty("ok", false);
+                    response.addProperty("error", "tipo de requisição desconhecido: " + type);
+                }
+            } catch (Throwable t) {
+                response.addProperty("ok", false);
+                response.addProperty("error", t.toString());
+            }
+
+            protocol.println(gson.toJson(response));
+        }
+    }
+}
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+DataFrame de análise compartilhado por estatísticas, visualizações e relatório
+
+O DataFrame é montado uma única vez a partir das análises (ou dos resultados
+gravados), com as colunas do relatório e as colunas derivadas usadas pelos
+consumidores: categoria de tamanho e agregados por repositório.
+
+As categorias de tamanho vêm de config.METHOD_SIZE_CATEGORIES (qualquer
+número de faixas): cada método é categorizado por um único pd.cut sobre os
+limites superiores das faixas, e as estatísticas por categoria saem de um
+único groupby.
+"""
+
+from typing import Dict, List, Mapping, Tuple
+
+import pandas as pd
+
+from config import get_method_size_categories
+from results_loader import REPORT_COLUMNS
+
+# Nomes em português das categorias conhecidas (as demais usam o próprio nome)
+SIZE_CATEGORY_TITLES = {"small": "Pequeno", "medium": "Médio", "large": "Grande"}
+
+# Colunas derivadas acrescentadas por add_derived_columns()
+DERIVED_COLUMNS = [
+    "size_category",
+    "has_fix",
+    "repo_method_count",
+    "repo_avg_fix_ratio",
+]
+
+
+def size_category_bins(
+    categories: Mapping[str, Tuple[float, float]],
+) -> Tuple[List[float], List[str]]:
+    """
+    Limites do pd.cut e nomes das categorias, em ordem crescente
+
+    Cada faixa (mínimo, máximo) é inclusiva; tamanhos abaixo da primeira faixa
+    contam na primeira.
+
+    Raises:
+        ValueError: Se as faixas se sobrepuserem
+    """
+    ordered = sorted(categories.items(), key=lambda item: item[1][1])
+    upper_bounds = [upper for _, (_, upper) in ordered]
+    if any(a >= b for a, b in zip(upper_bounds, upper_bounds[1:])):
+        raise ValueError(f"Categorias de tamanho sobrepostas: {dict(categories)}")
+    return [float("-inf")] + upper_bounds, [name for name, _ in ordered]
+
+
+def _range_label(lower: float, upper: float, first: bool) -> str:
+    if first:
+        return f"≤{upper:g}"
+    if upper == float("inf"):
+        return f">{lower - 1:g}"
+    return f"{lower:g}-{upper:g}"
+
+
+# Limites e nomes das categorias configuradas
+_SIZE_CATEGORIES = get_method_size_categories()
+SIZE_CATEGORY_BINS, SIZE_CATEGORY_NAMES = size_category_bins(_SIZE_CATEGORIES)
+
+# Faixa de cada categoria em linhas, ex. "11-50"
+SIZE_CATEGORY_RANGES = {
+    name: _range_label(*_SIZE_CATEGORIES[name], first=index == 0)
+    for index, name in enumerate(SIZE_CATEGORY_NAMES)
+}
+
+# Rótulos das categorias nos gráficos e no relatório, ex. "Pequeno (≤10)"
+SIZE_CATEGORY_LABELS = {
+    name: f"{SIZE_CATEGORY_TITLES.get(name, name)} ({SIZE_CATEGORY_RANGES[name]})"
+    for name in SIZE_CATEGORY_NAMES
+}
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Acrescenta (no próprio DataFrame) as colunas derivadas, se faltarem
+
+    - size_category: categoria de tamanho do método
+    - has_fix: se o método tem ao menos um commit de fix
+    - repo_method_count / repo_avg_fix_ratio: métodos e fix ratio médio do
+      repositório do método
+    """
+    if all(column in df.columns for column in DERIVED_COLUMNS):
+        return df
+
+    df["size_category"] = pd.cut(
+        df["size_lines"], bins=SIZE_CATEGORY_BINS, labels=SIZE_CATEGORY_NAMES
+    )
+    df["has_fix"] = df["fix_commit_count"] > 0
+    by_repository = df.groupby("repository", sort=False)["fix_ratio"]
+    df["repo_method_count"] = by_repository.transform("size")
+    df["repo_avg_fix_ratio"] = by_repository.transform("mean")
+    return df
+
+
+def frame_from_analyses(analyses: List) -> pd.DataFrame:
+    """
+    DataFrame de análise de uma lista de FixAnalysis
+
+    As colunas são preenchidas diretamente, sem a lista intermediária de
+    dicionários.
+    """
+    columns: Dict[str, List] = {column: [] for column in REPORT_COLUMNS}
+    for analysis in analyses:
+        info = analysis.method_info
+        columns["method_name"].append(info.name)
+        columns["repository"].append(info.repository)
+        columns["size_lines"].append(info.size_lines)
+        columns["commit_count"].append(info.commit_count)
+        columns["fix_commit_count"].append(info.fix_commit_count)
+        columns["fix_ratio"].append(info.fix_ratio)
+    return add_derived_columns(pd.DataFrame(columns, columns=REPORT_COLUMNS))
+
+
+def repository_fix_ratios(df: pd.DataFrame) -> pd.Series:
+    """Fix ratio médio por repositório, em ordem decrescente"""
+    add_derived_columns(df)
+    return (
+        df.drop_duplicates("repository")
+        .set_index("repository")["repo_avg_fix_ratio"]
+        .sort_values(ascending=False)
+    )
+
+
+def size_category_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agregados por categoria de tamanho, em um único groupby
+
+    Returns:
+        DataFrame indexado pelo nome da categoria (todas as categorias
+        configuradas, mesmo sem métodos) com methods_count, avg_size,
+        median_size, methods_with_fixes, fix_commit_count, avg_fix_ratio e
+        median_fix_ratio
+    """
+    add_derived_columns(df)
+    return df.groupby("size_category", observed=False).agg(
+        methods_count=("size_lines", "size"),
+        avg_size=("size_lines", "mean"),
+        median_size=("size_lines", "median"),
+        methods_with_fixes=("has_fix", "sum"),
+        fix_commit_count=("fix_commit_count", "sum"),
+        avg_fix_ratio=("fix_ratio", "mean"),
+        median_fix_ratio=("fix_ratio", "median"),
+    )
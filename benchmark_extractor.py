@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark do extrator de métodos
+
+Compara a vazão do extrator por tokens (method_extractor) com o extrator por
+linhas usado anteriormente em fix_analysis.py e extract_methods.py. Os
+arquivos são lidos para a memória antes da medição, de modo que apenas o
+processamento é cronometrado. Também informa em quantos arquivos os dois
+extratores discordam.
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from method_extractor import extract_methods_from_source
+
+
+def legacy_extract_methods(source: bytes) -> List[Tuple[str, int, int]]:
+    """Extrator por linhas anterior, mantido apenas para comparação"""
+    methods = []
+    lines = source.decode("utf-8", errors="ignore").splitlines(keepends=True)
+
+    in_method = False
+    method_start = 0
+    method_name = ""
+    brace_count = 0
+
+    for i, line in enumerate(lines, 1):
+        line_content = line.strip()
+
+        if re.match(
+            r"^\s*(public|private|protected|static|\s) +[\w\<\>\[\]]+\s+(\w+) *\([^\)]*\) *\{?",
+            line_content,
+        ):
+            if in_method:
+                methods.append((method_name, method_start, i - 1))
+
+            method_name = re.search(r"(\w+) *\(", line_content).group(1)
+            method_start = i
+            in_method = True
+            brace_count = 1 if line_content.endswith("{") else 0
+
+        elif in_method:
+            if line_content.endswith("{"):
+                brace_count += 1
+            elif line_content.endswith("}"):
+                brace_count -= 1
+                if brace_count == 0:
+                    methods.append((method_name, method_start, i))
+                    in_method = False
+
+    if in_method:
+        methods.append((method_name, method_start, len(lines)))
+
+    return sorted(methods, key=lambda x: (x[0], x[1]))
+
+
+def measure(
+    extractor: Callable[[bytes], List[Tuple[str, int, int]]],
+    sources: List[bytes],
+    repeat: int,
+) -> Tuple[float, List[List[Tuple[str, int, int]]]]:
+    """Retorna (melhor tempo em segundos, resultados da última rodada)"""
+    best = float("inf")
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [extractor(source) for source in sources]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark do extrator de métodos Java")
+    parser.add_argument("paths", nargs="+", help="Diretórios ou arquivos .java")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Rodadas por extrator (padrão: 3)"
+    )
+    args = parser.parse_args()
+
+    files = []
+    for path in map(Path, args.paths):
+        files.extend(sorted(path.rglob("*.java")) if path.is_dir() else [path])
+
+    sources = [f.read_bytes() for f in files]
+    total_bytes = sum(len(s) for s in sources)
+
+    if not sources:
+        print("Nenhum arquivo Java encontrado")
+        return
+
+    print(f"{len(sources)} arquivos, {total_bytes / 1024 ** 2:.1f} MB")
+
+    legacy_time, legacy_results = measure(legacy_extract_methods, sources, args.repeat)
+    token_time, token_results = measure(extract_methods_from_source, sources, args.repeat)
+
+    for label, elapsed, results in (
+        ("por linhas", legacy_time, legacy_results),
+        ("por tokens", token_time, token_results),
+    ):
+        print(
+            f"{label:>11}: {elapsed:.3f}s  "
+            f"{total_bytes / 1024 ** 2 / elapsed:7.1f} MB/s  "
+            f"{len(sources) / elapsed:8.0f} arquivos/s  "
+            f"{sum(len(r) for r in results)} métodos"
+        )
+
+    differing = [
+        f for f, a, b in zip(files, legacy_results, token_results) if a != b
+    ]
+    print(f"Arquivos com resultados diferentes: {len(differing)}/{len(files)}")
+    for f in differing[:10]:
+        print(f"  {f}")
+
+
+if __name__ == "__main__":
+    main()
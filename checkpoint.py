@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Checkpoint de análise por método
+
+O estado de cada repositório é mantido no formato de models.Repository, usando
+as flags `complete` de Repository, File e Method. Cada método concluído é
+registrado imediatamente em um journal (JSON Lines, com fsync a cada
+CHECKPOINT_FSYNC_INTERVAL eventos), e o snapshot completo é regravado de
+forma atômica quando o repositório termina. Ao reiniciar, snapshot + journal
+reconstroem o estado e o trabalho concluído é pulado.
+
+Cada método guarda só as contagens e as arestas (SHA, tipo) para os seus
+commits; os metadados de cada commit (mensagem, autor, data) são registrados
+uma única vez por SHA, no primeiro método que o referencia.
+
+O checkpoint registra o HEAD em que os métodos foram extraídos. Se o
+repositório avançou desde então, o estado é atualizado pelo diff entre os
+dois commits (incremental.update_repository), que invalida apenas os métodos
+tocados; sem diff possível, o checkpoint é descartado.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import CHECKPOINT_FSYNC_INTERVAL, EXTRACTION_WORKERS
+from extraction_index import ExtractionIndex
+from incremental import update_repository
+from models import (
+    COMMIT_FIELDS,
+    CodeShovelMethodInfo,
+    File,
+    Method,
+    MethodInfo,
+    Repository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_json(path: Path, data, indent: Optional[int] = 2):
+    """Grava JSON em um arquivo temporário e o renomeia sobre o destino"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _analysis_from_dict(
+    data: Dict, commits: Optional[Dict[str, Dict]]
+) -> CodeShovelMethodInfo:
+    """
+    Reconstrói um CodeShovelMethodInfo; checkpoints antigos, com as listas
+    completas de mudanças, são convertidos em arestas e os metadados dos
+    commits vão para commits
+    """
+    if "total_changes" not in data:
+        return CodeShovelMethodInfo(**data)
+
+    edges = []
+    for change in data["total_changes"]:
+        sha = change.get("commitName")
+        edges.append([sha, change.get("type")])
+        if commits is not None and sha is not None:
+            commits.setdefault(sha, {field: change.get(field) for field in COMMIT_FIELDS})
+    return CodeShovelMethodInfo(
+        commit_count=data["commit_count"],
+        fix_commit_count=data["fix_commit_count"],
+        fix_ratio=data["fix_ratio"],
+        commits=edges,
+    )
+
+
+def method_from_dict(data: Dict, commits: Optional[Dict[str, Dict]] = None) -> Method:
+    """Reconstrói um Method a partir do seu asdict()"""
+    analysis = data.get("codeshovel_analysis")
+    return Method(
+        name=data["name"],
+        complete=data["complete"],
+        method_info=MethodInfo(**data["method_info"]),
+        codeshovel_analysis=_analysis_from_dict(analysis, commits) if analysis else None,
+    )
+
+
+def file_from_dict(data: Dict, commits: Optional[Dict[str, Dict]] = None) -> File:
+    """Reconstrói um File a partir do seu asdict()"""
+    return File(
+        name=data["name"],
+        path=data["path"],
+        complete=data["complete"],
+        methods=[method_from_dict(m, commits) for m in data["methods"]],
+    )
+
+
+class RepositoryCheckpoint:
+    """Estado retomável da análise de um repositório"""
+
+    def __init__(
+        self,
+        results_dir: Path,
+        repo_name: str,
+        resume: bool = True,
+        fsync_interval: int = CHECKPOINT_FSYNC_INTERVAL,
+    ):
+        """
+        Carrega (ou cria) o checkpoint do repositório
+
+        Args:
+            results_dir: Diretório de resultados
+            repo_name: Nome do repositório
+            resume: Se False, descarta qualquer checkpoint existente
+            fsync_interval: Eventos do journal gravados entre dois fsync
+        """
+        self.repo_name = repo_name
+        self.snapshot_path = Path(results_dir) / f"{repo_name}_checkpoint.json"
+        self.journal_path = Path(results_dir) / f"{repo_name}_checkpoint.jsonl"
+
+        self.fsync_interval = max(1, fsync_interval)
+
+        self.repository = Repository(name=repo_name, complete=False, files=[])
+        # Metadados dos commits referenciados pelos métodos concluídos, por SHA
+        self.commits: Dict[str, Dict] = {}
+        self._files: Dict[str, File] = {}
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+        else:
+            for path in (self.snapshot_path, self.journal_path):
+                if path.exists():
+                    path.unlink()
+
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    @property
+    def complete(self) -> bool:
+        return self.repository.complete
+
+    @staticmethod
+    def is_pending(results_dir: Path, repo_name: str) -> bool:
+        """
+        Indica se há um checkpoint não concluído do repositório (execução
+        interrompida ou com métodos que falharam)
+        """
+        results_dir = Path(results_dir)
+        if (results_dir / f"{repo_name}_checkpoint.jsonl").exists():
+            return True
+        snapshot_path = results_dir / f"{repo_name}_checkpoint.json"
+        if not snapshot_path.exists():
+            return False
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                return not json.load(f)["complete"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return True
+
+    def _load(self):
+        """Carrega o snapshot e reaplica o journal"""
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                commits = dict(data.get("commits") or {})
+                self.repository = Repository(
+                    name=data["name"],
+                    complete=data["complete"],
+                    files=[file_from_dict(f, commits) for f in data["files"]],
+                    head_sha=data.get("head_sha"),
+                )
+                self.commits = commits
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Snapshot de checkpoint inválido {self.snapshot_path}: {e}")
+
+        self._files = {f.path: f for f in self.repository.files}
+
+        if not self.journal_path.exists():
+            return
+
+        replayed = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Linha truncada por um crash durante a escrita
+                    logger.warning(f"Linha inválida ignorada no journal de {self.repo_name}")
+                    continue
+                self._apply(entry)
+                replayed += 1
+
+        logger.info(f"Checkpoint de {self.repo_name}: {replayed} eventos reaplicados")
+
+    def _apply(self, entry: Dict):
+        """Aplica um evento do journal ao estado em memória"""
+        kind = entry.get("type")
+
+        if kind == "head":
+            self.repository.head_sha = entry["head_sha"]
+
+        elif kind == "file":
+            file = file_from_dict(entry["file"], self.commits)
+            if file.path not in self._files:
+                self.repository.files.append(file)
+                self._files[file.path] = file
+
+        elif kind == "method":
+            file = self._files.get(entry["file"])
+            if file is None:
+                return
+            self.commits.update(entry.get("commits") or {})
+            method = method_from_dict(entry["method"], self.commits)
+            for i, existing in enumerate(file.methods):
+                if (existing.name, existing.method_info.start_line) == (
+                    method.name,
+                    method.method_info.start_line,
+                ):
+                    file.methods[i] = method
+                    break
+            else:
+                file.methods.append(method)
+
+        elif kind == "file_complete":
+            file = self._files.get(entry["file"])
+            if file is not None:
+                file.complete = True
+
+    def _append(self, entry: Dict):
+        """Registra um evento no journal e faz fsync periodicamente"""
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_interval:
+            self._sync()
+        self._apply(entry)
+
+    def _sync(self):
+        """Grava em disco os eventos pendentes do journal"""
+        if self._unsynced:
+            os.fsync(self._journal.fileno())
+            self._unsynced = 0
+
+    def update_head(
+        self,
+        repo_path: Path,
+        head_sha: Optional[str],
+        index: Optional[ExtractionIndex] = None,
+        workers: int = EXTRACTION_WORKERS,
+    ):
+        """
+        Ajusta o checkpoint ao HEAD atual do repositório
+
+        Métodos registrados em outro HEAD têm as linhas atualizadas pelo diff
+        e só são invalidados se o diff os tocar; sem HEAD registrado ou diff
+        disponível, o checkpoint é descartado.
+
+        Args:
+            repo_path: Caminho para o repositório
+            head_sha: HEAD atual
+            index: Índice de extração usado nos arquivos alterados
+            workers: Processos usados na extração de métodos
+        """
+        with self._lock:
+            recorded = self.repository.head_sha
+            if recorded == head_sha:
+                return
+
+            if not self.repository.files:
+                self.repository.head_sha = head_sha
+                self._append({"type": "head", "head_sha": head_sha})
+                return
+
+            data = asdict(self.repository)
+            stats = update_repository(data, repo_path, workers, index) if recorded else None
+            if stats is None:
+                logger.info(f"Checkpoint de {self.repo_name} descartado: HEAD alterado")
+                self.repository = Repository(name=self.repo_name, complete=False, files=[])
+                self.commits = {}
+            else:
+                logger.info(f"Checkpoint de {self.repo_name} atualizado para o HEAD atual: {stats}")
+                self.repository = Repository(
+                    name=data["name"],
+                    complete=data["complete"],
+                    files=[file_from_dict(f, self.commits) for f in data["files"]],
+                )
+            self._files = {f.path: f for f in self.repository.files}
+            self.repository.head_sha = head_sha
+            self._compact()
+
+    def get_file(self, file_path: str) -> Optional[File]:
+        """Retorna o arquivo registrado no checkpoint, se houver"""
+        return self._files.get(file_path)
+
+    def register_file(self, file_path: str, methods: List[Tuple[str, int, int]]) -> File:
+        """
+        Registra os métodos extraídos de um arquivo (se ainda não registrado)
+
+        Returns:
+            Estado do arquivo no checkpoint
+        """
+        with self._lock:
+            if file_path in self._files:
+                return self._files[file_path]
+
+            file = File(
+                name=Path(file_path).name,
+                path=file_path,
+                complete=False,
+                methods=[
+                    Method(
+                        name=name,
+                        complete=False,
+                        method_info=MethodInfo(
+                            start_line=start,
+                            end_line=end,
+                            size_lines=end - start + 1,
+                        ),
+                    )
+                    for name, start, end in methods
+                ],
+            )
+            self._append({"type": "file", "file": asdict(file)})
+
+            if not file.methods:
+                self._append({"type": "file_complete", "file": file_path})
+
+            return self._files[file_path]
+
+    def mark_method_complete(
+        self,
+        file_path: str,
+        method_name: str,
+        start_line: int,
+        end_line: int,
+        analysis: Optional[CodeShovelMethodInfo],
+        commits: Optional[Dict[str, Dict]] = None,
+    ):
+        """
+        Marca um método como concluído e, se for o último, também o arquivo
+
+        Args:
+            analysis: Contagens e arestas dos commits do método
+            commits: Metadados dos commits do método, por SHA; só os ainda
+                não registrados no checkpoint entram no journal
+        """
+        method = Method(
+            name=method_name,
+            complete=True,
+            method_info=MethodInfo(
+                start_line=start_line,
+                end_line=end_line,
+                size_lines=end_line - start_line + 1,
+            ),
+            codeshovel_analysis=analysis,
+        )
+
+        with self._lock:
+            entry = {"type": "method", "file": file_path, "method": asdict(method)}
+            new_commits = {
+                sha: commit for sha, commit in (commits or {}).items() if sha not in self.commits
+            }
+            if new_commits:
+                entry["commits"] = new_commits
+            self._append(entry)
+
+            file = self._files.get(file_path)
+            if file is not None and not file.complete and all(m.complete for m in file.methods):
+                self._append({"type": "file_complete", "file": file_path})
+
+    def finish(self):
+        """Marca o repositório como concluído e compacta o journal no snapshot"""
+        with self._lock:
+            self.repository.complete = all(f.complete for f in self.repository.files)
+            self._compact()
+            if self.repository.complete:
+                self._journal.close()
+                self.journal_path.unlink()
+
+    def _compact(self):
+        """Grava o snapshot atômico e descarta o journal já incorporado"""
+        atomic_write_json(self.snapshot_path, dict(asdict(self.repository), commits=self.commits))
+        self._journal.close()
+        self._unsynced = 0
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+
+    def close(self):
+        """Fecha o journal"""
+        with self._lock:
+            if not self._journal.closed:
+                self._sync()
+                self._journal.close()
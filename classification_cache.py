@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Memo da classificação de commits por repositório
+
+Cada commit é classificado uma única vez por repositório: o resultado
+(é fix?, palavras-chave encontradas) é reutilizado por todos os métodos que o
+commit tocou e, quando há um diretório de cache, também por execuções
+seguintes com o mesmo classificador. Trocar as palavras-chave (ou a regra de
+casamento) descarta o memo gravado.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from checkpoint import atomic_write_json
+from fix_classifier import Classification, FixClassifier
+
+logger = logging.getLogger(__name__)
+
+class ClassificationCache:
+    """SHA -> (é fix, palavras-chave) de um repositório"""
+
+    def __init__(
+        self,
+        repo_name: str,
+        classifier: FixClassifier,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Carrega o memo gravado do repositório, se houver
+
+        Args:
+            repo_name: Nome do repositório
+            classifier: Classificador das mensagens de commit
+            cache_dir: Diretório dos memos (None mantém só em memória)
+        """
+        self.repo_name = repo_name
+        self.classifier = classifier
+        self.path = Path(cache_dir) / f"{repo_name}.json" if cache_dir else None
+        self._classifications: Dict[str, Classification] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Memo de classificação inválido {self.path}: {e}")
+            return
+
+        if (
+            data.get("keywords") != self.classifier.keywords
+            or data.get("pattern") != self.classifier.pattern.pattern
+        ):
+            logger.info(
+                f"{self.repo_name}: palavras-chave mudaram, memo de classificação descartado"
+            )
+            return
+
+        self._classifications = {
+            sha: (bool(is_fix), list(matched))
+            for sha, (is_fix, matched) in data.get("commits", {}).items()
+        }
+
+    def classify(self, sha: str, message: str) -> Classification:
+        """Classifica o commit na primeira consulta e reutiliza o resultado"""
+        with self._lock:
+            cached = self._classifications.get(sha)
+            if cached is not None:
+                return cached
+
+            result = self.classifier.classify(message)
+            self._classifications[sha] = result
+            self._dirty = True
+            return result
+
+    def get(self, sha: str) -> Optional[Classification]:
+        """Classificação já conhecida do commit, se houver"""
+        with self._lock:
+            return self._classifications.get(sha)
+
+    def __len__(self) -> int:
+        return len(self._classifications)
+
+    def save(self):
+        """Grava o memo, se houver classificações novas"""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_json(
+                self.path,
+                {
+                    "keywords": self.classifier.keywords,
+                    "pattern": self.classifier.pattern.pattern,
+                    "commits": {
+                        sha: [is_fix, matched]
+                        for sha, (is_fix, matched) in self._classifications.items()
+                    },
+                },
+                indent=None,
+            )
+            self._dirty = False
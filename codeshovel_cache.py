@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Cache persistente dos resultados do CodeShovel
+
+Cada resultado é endereçado pelo conteúdo: (HEAD do repositório, caminho do
+arquivo, SHA do blob, nome do método, linha de início). Enquanto nenhum desses
+valores mudar o histórico minerado é o mesmo, então uma nova execução (após
+um crash ou mudança de palavras-chave/relatórios) não precisa subir a JVM.
+
+Os resultados ficam comprimidos em um único arquivo SQLite, com despejo LRU
+quando o tamanho total ultrapassa o limite configurado.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from config import CODESHOVEL_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class CodeShovelCache:
+    """Cache LRU em disco dos resultados do CodeShovel"""
+
+    def __init__(
+        self, cache_path: Union[str, Path], max_bytes: int = CODESHOVEL_CACHE_MAX_BYTES
+    ):
+        """
+        Abre (ou cria) o cache
+
+        Args:
+            cache_path: Caminho do arquivo SQLite
+            max_bytes: Tamanho máximo dos resultados armazenados (bytes)
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS codeshovel_results (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_codeshovel_results_last_access "
+            "ON codeshovel_results (last_access)"
+        )
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM codeshovel_results").fetchone()
+        self._total_bytes = row[0]
+
+    @staticmethod
+    def make_key(
+        head_sha: str, file_path: str, blob_sha: str, method_name: str, start_line: int
+    ) -> str:
+        """Gera a chave de um método a partir dos seus identificadores de conteúdo"""
+        raw = "\0".join([head_sha, file_path, blob_sha, method_name, str(start_line)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retorna o resultado armazenado para a chave ou None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM codeshovel_results WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE codeshovel_results SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+        try:
+            data = json.loads(zlib.decompress(row[0]))
+        except (zlib.error, json.JSONDecodeError) as e:
+            logger.warning(f"Entrada corrompida no cache ({key[:12]}): {e}")
+            self.delete(key)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: Dict):
+        """Armazena um resultado e aplica o despejo LRU se necessário"""
+        value = zlib.compress(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM codeshovel_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._total_bytes -= row[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO codeshovel_results (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            self._total_bytes += len(value)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+            self._conn.commit()
+
+    def delete(self, key: str):
+        """Remove uma entrada do cache"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size FROM codeshovel_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return
+            self._conn.execute("DELETE FROM codeshovel_results WHERE key = ?", (key,))
+            self._conn.commit()
+            self._total_bytes -= row[0]
+
+    def _evict(self):
+        """Remove as entradas menos usadas até ficar abaixo de 90% do limite"""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        cursor = self._conn.execute(
+            "SELECT key, size FROM codeshovel_results ORDER BY last_access ASC"
+        )
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+            evicted += 1
+
+        self._conn.executemany("DELETE FROM codeshovel_results WHERE key = ?", victims)
+        logger.info(f"Cache do CodeShovel: {evicted} entradas removidas (LRU)")
+
+    def close(self):
+        """Fecha o cache"""
+        with self._lock:
+            self._conn.close()
+        logger.info(f"Cache do CodeShovel: {self.hits} acertos, {self.misses} faltas")
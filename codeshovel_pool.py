@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Pool de workers persistentes do CodeShovel
+
+Cada worker é uma JVM de longa duração executando CodeShovelWorker.java, que
+recebe requisições de análise de métodos por um pipe (stdin/stdout) e
+responde em JSON. Isso evita pagar a inicialização da JVM, o carregamento de
+classes e o aquecimento do JIT a cada método analisado.
+
+O resultado de cada método volta embutido na resposta do pipe, então nenhum
+arquivo temporário é lido pelo Python; o arquivo intermediário do CodeShovel
+fica em um diretório privado do worker (em tmpfs, quando disponível).
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    CODESHOVEL_HEALTH_CHECK_INTERVAL,
+    CODESHOVEL_TIMEOUT,
+    CODESHOVEL_TMP_DIR,
+    CODESHOVEL_WORKER_MAX_REQUESTS,
+    CODESHOVEL_WORKER_STARTUP_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+WORKER_SOURCE = Path(__file__).resolve().parent / "CodeShovelWorker.java"
+
+
+class CodeShovelWorkerError(Exception):
+    """Erro de comunicação com um worker do CodeShovel"""
+
+
+def private_output_dir(prefix: str) -> Path:
+    """
+    Cria um diretório privado para as saídas do CodeShovel
+
+    Usa CODESHOVEL_TMP_DIR (tmpfs) quando existir e for gravável, caindo para
+    o diretório temporário padrão do sistema caso contrário.
+    """
+    base_dir = None
+    if CODESHOVEL_TMP_DIR and os.access(CODESHOVEL_TMP_DIR, os.W_OK):
+        base_dir = CODESHOVEL_TMP_DIR
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=base_dir))
+
+
+class CodeShovelWorker:
+    """Processo JVM persistente que executa análises do CodeShovel"""
+
+    def __init__(self, codeshovel_jar_path: str, worker_id: int):
+        """
+        Inicializa o worker (o processo só é criado em start())
+
+        Args:
+            codeshovel_jar_path: Caminho para o JAR do CodeShovel
+            worker_id: Identificador do worker dentro do pool
+        """
+        self.codeshovel_jar_path = codeshovel_jar_path
+        self.worker_id = worker_id
+        self.process: Optional[subprocess.Popen] = None
+        self.output_dir: Optional[Path] = None
+        self.requests_served = 0
+        self.last_used = 0.0
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._request_ids = itertools.count(1)
+
+    @property
+    def alive(self) -> bool:
+        """Indica se o processo da JVM ainda está em execução"""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Inicia a JVM e aguarda o primeiro ping"""
+        self.output_dir = private_output_dir(f"codeshovel-worker-{self.worker_id}-")
+        self._responses = queue.Queue()
+
+        cmd = [
+            "java",
+            "-cp",
+            self.codeshovel_jar_path,
+            str(WORKER_SOURCE),
+            str(self.output_dir),
+        ]
+        logger.info(f"Iniciando worker {self.worker_id}: {' '.join(cmd)}")
+
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+
+        reader = threading.Thread(
+            target=self._read_responses,
+            args=(self.process, self._responses),
+            name=f"codeshovel-worker-{self.worker_id}-reader",
+            daemon=True,
+        )
+        reader.start()
+
+        self.requests_served = 0
+        if not self.ping(timeout=CODESHOVEL_WORKER_STARTUP_TIMEOUT):
+            self.stop()
+            raise CodeShovelWorkerError(
+                f"Worker {self.worker_id} não respondeu durante a inicialização"
+            )
+        self.last_used = time.monotonic()
+
+    def stop(self):
+        """Encerra a JVM e remove o diretório privado do worker"""
+        if self.process is not None:
+            try:
+                if self.process.stdin:
+                    self.process.stdin.close()
+            except OSError:
+                pass
+
+            if self.process.poll() is None:
+                self.process.kill()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Worker {self.worker_id} não encerrou após kill")
+            self.process = None
+
+        if self.output_dir is not None:
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+            self.output_dir = None
+
+    def restart(self):
+        """Reinicia o worker"""
+        self.stop()
+        self.start()
+
+    @staticmethod
+    def _read_responses(process: subprocess.Popen, responses: "queue.Queue[Optional[str]]"):
+        """Lê as respostas do worker em uma thread dedicada"""
+        try:
+            for line in process.stdout:
+                responses.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            responses.put(None)
+
+    def _send(self, payload: Dict, timeout: float) -> Dict:
+        """
+        Envia uma requisição e aguarda a resposta correspondente
+
+        Raises:
+            CodeShovelWorkerError: Se o worker morrer ou não responder a tempo
+        """
+        if not self.alive:
+            raise CodeShovelWorkerError(f"Worker {self.worker_id} não está em execução")
+
+        request_id = next(self._request_ids)
+        payload = dict(payload, id=request_id)
+
+        try:
+            self.process.stdin.write(json.dumps(payload) + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise CodeShovelWorkerError(f"Falha ao enviar requisição ao worker {self.worker_id}: {e}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CodeShovelWorkerError(f"Timeout aguardando worker {self.worker_id}")
+
+            try:
+                line = self._responses.get(timeout=remaining)
+            except queue.Empty:
+                raise CodeShovelWorkerError(f"Timeout aguardando worker {self.worker_id}")
+
+            if line is None:
+                raise CodeShovelWorkerError(f"Worker {self.worker_id} encerrou inesperadamente")
+
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"Linha inválida do worker {self.worker_id}: {line[:200]}")
+                continue
+
+            # Respostas atrasadas de requisições anteriores são descartadas
+            if response.get("id") == request_id:
+                self.last_used = time.monotonic()
+                return response
+
+    def ping(self, timeout: float = 10) -> bool:
+        """Verifica se o worker está respondendo"""
+        try:
+            return bool(self._send({"type": "ping"}, timeout).get("ok"))
+        except CodeShovelWorkerError as e:
+            logger.warning(f"Health check falhou: {e}")
+            return False
+
+    def analyze(self, args: List[str], timeout: float) -> Optional[Dict]:
+        """
+        Executa o CodeShovel para um método
+
+        Args:
+            args: Argumentos de linha de comando do CodeShovel (o worker
+                acrescenta -outfile no seu diretório privado)
+            timeout: Tempo máximo de espera pela resposta (segundos)
+
+        Returns:
+            Dicionário com o resultado do CodeShovel ou None se falhar
+
+        Raises:
+            CodeShovelWorkerError: Se o worker travar ou morrer
+        """
+        response = self._send({"type": "analyze", "args": args}, timeout)
+        self.requests_served += 1
+
+        if not response.get("ok"):
+            logger.warning(f"CodeShovel falhou no worker {self.worker_id}: {response.get('error')}")
+            return None
+
+        return response.get("result")
+
+
+class CodeShovelWorkerPool:
+    """Pool de workers persistentes do CodeShovel"""
+
+    def __init__(
+        self,
+        codeshovel_jar_path: str,
+        size: int,
+        request_timeout: float = CODESHOVEL_TIMEOUT,
+        max_requests_per_worker: int = CODESHOVEL_WORKER_MAX_REQUESTS,
+        health_check_interval: float = CODESHOVEL_HEALTH_CHECK_INTERVAL,
+    ):
+        """
+        Inicializa o pool e sobe todos os workers
+
+        Args:
+            codeshovel_jar_path: Caminho para o JAR do CodeShovel
+            size: Número de workers (JVMs) simultâneos
+            request_timeout: Tempo máximo por método (segundos)
+            max_requests_per_worker: Requisições atendidas antes de reciclar
+                a JVM (limita vazamentos de memória do CodeShovel/JGit)
+            health_check_interval: Tempo ocioso após o qual o worker recebe
+                um ping antes de ser reutilizado (segundos)
+        """
+        if size < 1:
+            raise ValueError("O pool precisa de pelo menos um worker")
+
+        self.codeshovel_jar_path = codeshovel_jar_path
+        self.request_timeout = request_timeout
+        self.max_requests_per_worker = max_requests_per_worker
+        self.health_check_interval = health_check_interval
+
+        self._workers = [CodeShovelWorker(codeshovel_jar_path, i) for i in range(size)]
+        self._idle: "queue.Queue[CodeShovelWorker]" = queue.Queue()
+        self._closed = False
+
+        for worker in self._workers:
+            worker.start()
+            self._idle.put(worker)
+
+        logger.info(f"Pool do CodeShovel iniciado com {size} workers")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _ensure_healthy(self, worker: CodeShovelWorker):
+        """Reinicia o worker se estiver morto, ocioso sem resposta ou esgotado"""
+        if not worker.alive:
+            logger.warning(f"Worker {worker.worker_id} morreu, reiniciando")
+            worker.restart()
+        elif worker.requests_served >= self.max_requests_per_worker:
+            logger.info(f"Reciclando worker {worker.worker_id} após {worker.requests_served} requisições")
+            worker.restart()
+        elif time.monotonic() - worker.last_used > self.health_check_interval and not worker.ping():
+            logger.warning(f"Worker {worker.worker_id} não respondeu ao health check, reiniciando")
+            worker.restart()
+
+    def run(
+        self, repo_path: str, file_path: str, method_name: str, start_line: int
+    ) -> Optional[Dict]:
+        """
+        Executa o CodeShovel para um método em um worker livre
+
+        Args:
+            repo_path: Caminho para o repositório
+            file_path: Caminho relativo do arquivo
+            method_name: Nome do método
+            start_line: Linha de início do método
+
+        Returns:
+            Dicionário com o resultado do CodeShovel ou None se falhar
+        """
+        if self._closed:
+            raise CodeShovelWorkerError("Pool do CodeShovel já foi encerrado")
+
+        args = [
+            "-repopath",
+            repo_path,
+            "-filepath",
+            file_path,
+            "-methodname",
+            method_name,
+            "-startline",
+            str(start_line),
+        ]
+
+        worker = self._idle.get()
+        try:
+            self._ensure_healthy(worker)
+            logger.info(f"Worker {worker.worker_id}: {method_name} ({file_path}:{start_line})")
+            return worker.analyze(args, self.request_timeout)
+        except CodeShovelWorkerError as e:
+            logger.warning(f"Falha no worker {worker.worker_id} para {method_name}: {e}")
+            try:
+                worker.restart()
+            except CodeShovelWorkerError as restart_error:
+                logger.error(f"Não foi possível reiniciar o worker {worker.worker_id}: {restart_error}")
+            return None
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        """Encerra todos os workers"""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.stop()
+        logger.info("Pool do CodeShovel encerrado")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Resultados em formato colunar (Parquet ou Arrow IPC)
+
+Cada repositório gera três tabelas, no mesmo arranjo do banco SQLite:
+`<repo>_methods.<ext>`, com uma linha por método, `<repo>_commits.<ext>`, com
+os metadados e a classificação de cada commit uma única vez por SHA, e
+`<repo>_method_commits.<ext>`, com as arestas método -> commit (SHA e tipo de
+mudança). Um commit que toca centenas de métodos não repete mensagem, autor e
+data em cada aresta. Os relatórios leem apenas as colunas de que precisam (leitura mapeada em
+memória), sem passar por listas de dicionários.
+
+Requer o pacote opcional pyarrow.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from results_loader import REPORT_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Dependência opcional: só os formatos colunares a exigem
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Extensão dos arquivos de cada formato colunar
+COLUMNAR_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def require_pyarrow():
+    """Falha com uma mensagem clara se o pyarrow não estiver instalado"""
+    if pa is None:
+        raise RuntimeError(
+            "Formato colunar requer o pacote pyarrow (pip install pyarrow)"
+        )
+
+
+def _method_schema():
+    return pa.schema(
+        [
+            ("repository", pa.string()),
+            ("file_path", pa.string()),
+            ("method_name", pa.string()),
+            ("start_line", pa.int32()),
+            ("end_line", pa.int32()),
+            ("size_lines", pa.int32()),
+            ("commit_count", pa.int32()),
+            ("fix_commit_count", pa.int32()),
+            ("fix_ratio", pa.float64()),
+        ]
+    )
+
+
+def _commit_schema():
+    return pa.schema(
+        [
+            ("sha", pa.string()),
+            ("commit_date", pa.string()),
+            ("author", pa.string()),
+            ("message", pa.string()),
+            ("is_fix", pa.bool_()),
+        ]
+    )
+
+
+def _method_commit_schema():
+    return pa.schema(
+        [
+            ("file_path", pa.string()),
+            ("method_name", pa.string()),
+            ("start_line", pa.int32()),
+            ("sha", pa.string()),
+            ("change_type", pa.string()),
+        ]
+    )
+
+
+# Tabelas gravadas para cada repositório
+TABLES = ("methods", "commits", "method_commits")
+
+
+def results_path(results_dir: Path, repo_name: str, table: str, fmt: str) -> Path:
+    """Caminho da tabela ("methods", "commits" ou "method_commits") de um repositório"""
+    return Path(results_dir) / f"{repo_name}_{table}.{COLUMNAR_EXTENSIONS[fmt]}"
+
+
+def _write_table(table, path: Path, fmt: str):
+    """Grava a tabela em um arquivo temporário e o renomeia sobre o destino"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    if fmt == "parquet":
+        pq.write_table(table, str(tmp_path))
+    else:
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_table(path: Path, fmt: str, columns: Optional[Sequence[str]] = None):
+    """Lê as colunas pedidas de uma tabela, com leitura mapeada em memória"""
+    if fmt == "parquet":
+        return pq.read_table(str(path), columns=columns, memory_map=True)
+
+    # Os buffers da tabela apontam para o mapeamento, que permanece aberto
+    # enquanto forem referenciados
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table if columns is None else table.select(list(columns))
+
+
+def write_repository(results_dir: Path, repo_name: str, analyses: List, fmt: str):
+    """
+    Grava as tabelas de métodos, commits e arestas método -> commit de um
+    repositório
+
+    Args:
+        results_dir: Diretório de resultados
+        repo_name: Nome do repositório
+        analyses: FixAnalysis do repositório
+        fmt: "parquet" ou "arrow"
+    """
+    require_pyarrow()
+
+    methods: Dict[str, List] = {name: [] for name in _method_schema().names}
+    edges: Dict[str, List] = {name: [] for name in _method_commit_schema().names}
+    commits: Dict[str, Dict] = {}
+
+    for analysis in analyses:
+        info = analysis.method_info
+        methods["repository"].append(info.repository)
+        methods["file_path"].append(info.file_path)
+        methods["method_name"].append(info.name)
+        methods["start_line"].append(info.start_line)
+        methods["end_line"].append(info.end_line)
+        methods["size_lines"].append(info.size_lines)
+        methods["commit_count"].append(info.commit_count)
+        methods["fix_commit_count"].append(info.fix_commit_count)
+        methods["fix_ratio"].append(info.fix_ratio)
+
+        details = {}
+        if isinstance(info.codeshovel_data, dict):
+            details = info.codeshovel_data.get("changeHistoryDetails") or {}
+        fix_names = {c.get("commitName") for c in analysis.fix_commits}
+
+        for sha, change in details.items():
+            if not isinstance(change, dict):
+                continue
+            edges["file_path"].append(info.file_path)
+            edges["method_name"].append(info.name)
+            edges["start_line"].append(info.start_line)
+            edges["sha"].append(sha)
+            edges["change_type"].append(change.get("type"))
+
+            if sha not in commits:
+                commits[sha] = {
+                    "sha": sha,
+                    "commit_date": change.get("commitDate"),
+                    "author": change.get("commitAuthor"),
+                    "message": change.get("commitMessage"),
+                    "is_fix": False,
+                }
+            if sha in fix_names or change.get("commitName") in fix_names:
+                commits[sha]["is_fix"] = True
+
+    _write_table(
+        pa.Table.from_pydict(methods, schema=_method_schema()),
+        results_path(results_dir, repo_name, "methods", fmt),
+        fmt,
+    )
+    _write_table(
+        pa.Table.from_pylist(list(commits.values()), schema=_commit_schema()),
+        results_path(results_dir, repo_name, "commits", fmt),
+        fmt,
+    )
+    _write_table(
+        pa.Table.from_pydict(edges, schema=_method_commit_schema()),
+        results_path(results_dir, repo_name, "method_commits", fmt),
+        fmt,
+    )
+
+
+def has_repository(results_dir: Path, repo_name: str, fmt: str) -> bool:
+    """Indica se as tabelas do repositório já foram gravadas"""
+    return all(
+        results_path(results_dir, repo_name, table, fmt).is_file()
+        for table in TABLES
+    )
+
+
+def iter_methods(
+    results_dir: Path, repo_name: str, fmt: str
+) -> Iterator[Tuple[Dict, List[Dict], Set[str]]]:
+    """
+    Percorre os métodos gravados de um repositório
+
+    Yields:
+        (colunas do método, [commits no formato de changeHistoryDetails],
+        SHAs dos commits de fix)
+    """
+    require_pyarrow()
+
+    methods = _read_table(results_path(results_dir, repo_name, "methods", fmt), fmt)
+    commits = {
+        row["sha"]: row
+        for row in _read_table(
+            results_path(results_dir, repo_name, "commits", fmt), fmt
+        ).to_pylist()
+    }
+    edges = _read_table(results_path(results_dir, repo_name, "method_commits", fmt), fmt)
+
+    changes_by_method: Dict[Tuple[str, str, int], List[Tuple[str, Optional[str]]]] = {}
+    for row in edges.to_pylist():
+        key = (row["file_path"], row["method_name"], row["start_line"])
+        changes_by_method.setdefault(key, []).append((row["sha"], row["change_type"]))
+
+    for method in methods.to_pylist():
+        method["name"] = method.pop("method_name")
+        changes = changes_by_method.get(
+            (method["file_path"], method["name"], method["start_line"]), []
+        )
+        rows = [(commits.get(sha) or {}, sha, change_type) for sha, change_type in changes]
+        yield method, [
+            {
+                "type": change_type,
+                "commitMessage": commit.get("message"),
+                "commitDate": commit.get("commit_date"),
+                "commitName": sha,
+                "commitAuthor": commit.get("author"),
+            }
+            for commit, sha, change_type in rows
+        ], {sha for commit, sha, _ in rows if commit.get("is_fix")}
+
+
+def reclassify_repository(results_dir: Path, repo_name: str, fmt: str, classifier) -> int:
+    """
+    Reclassifica os commits gravados de um repositório e regrava as tabelas
+    com os novos fix_commit_count e fix_ratio
+
+    Args:
+        classifier: FixClassifier com as novas palavras-chave
+
+    Returns:
+        Número de métodos reclassificados
+    """
+    require_pyarrow()
+
+    methods_path = results_path(results_dir, repo_name, "methods", fmt)
+    commits_path = results_path(results_dir, repo_name, "commits", fmt)
+    methods = _read_table(methods_path, fmt).to_pandas()
+    commits = _read_table(commits_path, fmt).to_pandas()
+    edges = _read_table(
+        results_path(results_dir, repo_name, "method_commits", fmt), fmt
+    ).to_pandas()
+
+    # Cada mensagem é classificada uma única vez; as arestas herdam a
+    # classificação do seu SHA
+    commits["is_fix"] = classifier.is_fix_many(commits["message"]).to_numpy()
+    fix_shas = commits.loc[commits["is_fix"], "sha"]
+    keys = ["file_path", "method_name", "start_line"]
+    fix_counts = (
+        edges[edges["sha"].isin(fix_shas)].groupby(keys).size().rename("new_fix_count")
+    )
+    methods = methods.join(fix_counts, on=keys)
+    methods["fix_commit_count"] = methods.pop("new_fix_count").fillna(0).astype("int32")
+    methods["fix_ratio"] = (
+        methods["fix_commit_count"] / methods["commit_count"].where(methods["commit_count"] > 0)
+    ).fillna(0.0)
+
+    _write_table(
+        pa.Table.from_pandas(methods, schema=_method_schema(), preserve_index=False),
+        methods_path,
+        fmt,
+    )
+    _write_table(
+        pa.Table.from_pandas(commits, schema=_commit_schema(), preserve_index=False),
+        commits_path,
+        fmt,
+    )
+    return len(methods)
+
+
+def load_methods_frame(
+    results_dir: Path, fmt: str, columns: Sequence[str] = REPORT_COLUMNS
+) -> pd.DataFrame:
+    """
+    DataFrame com uma linha por método de todos os repositórios
+
+    Apenas as colunas pedidas são lidas dos arquivos.
+    """
+    require_pyarrow()
+
+    paths = sorted(Path(results_dir).glob(f"*_methods.{COLUMNAR_EXTENSIONS[fmt]}"))
+    tables = []
+    for path in paths:
+        try:
+            tables.append(_read_table(path, fmt, columns))
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Erro ao carregar {path}: {e}")
+
+    if not tables:
+        return pd.DataFrame(columns=list(columns))
+    return pa.concat_tables(tables).to_pandas()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tabela de commits por repositório
+
+O histórico de cada método traz os metadados completos de cada commit
+(mensagem, autor, data), de modo que um commit que toca centenas de métodos,
+como uma grande refatoração, era repetido centenas de vezes em memória e nos
+arquivos de resultados. CommitTable guarda esses metadados uma única vez por
+SHA, e cada método passa a referenciá-los por uma lista de arestas
+(SHA, tipo de mudança). A classificação de fix vem do memo do repositório
+(classification_cache.py), consultado uma única vez por SHA.
+
+Os diffs por método do CodeShovel não entram na tabela: dependem do método e
+não são usados na análise.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from checkpoint import atomic_write_json
+from classification_cache import ClassificationCache
+from fix_classifier import Classification, FixClassifier
+from models import COMMIT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Aresta método -> commit: (SHA, tipo de mudança)
+CommitEdge = Tuple[str, Optional[str]]
+
+
+class CommitTable:
+    """Metadados e classificação dos commits de um repositório, um por SHA"""
+
+    def __init__(self, classifications: Optional[ClassificationCache] = None):
+        """
+        Args:
+            classifications: Memo de classificação do repositório (None
+                apenas para tabelas carregadas com load())
+        """
+        self.classifications = classifications
+        self._commits: Dict[str, Dict] = {}
+        self._changes: Dict[CommitEdge, Dict] = {}
+        self._classified: Dict[str, Classification] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._commits)
+
+    def __contains__(self, sha: str) -> bool:
+        return sha in self._commits
+
+    def change(self, sha: str, data: Dict) -> Dict:
+        """
+        Entrada de changeHistoryDetails compartilhada por todos os métodos
+        com a mesma mudança (SHA e tipo)
+        """
+        key = (sha, data.get("type"))
+        with self._lock:
+            shared = self._changes.get(key)
+            if shared is None:
+                commit = self._commits.setdefault(
+                    sha, {field: data.get(field) for field in COMMIT_FIELDS}
+                )
+                shared = dict(commit, type=key[1], commitName=sha)
+                self._changes[key] = shared
+            return shared
+
+    def normalize(self, codeshovel_data: Dict) -> Dict:
+        """Cópia dos dados do CodeShovel com os commits trocados pelas entradas compartilhadas"""
+        details = codeshovel_data.get("changeHistoryDetails")
+        if not isinstance(details, dict):
+            return codeshovel_data
+
+        normalized = dict(codeshovel_data)
+        normalized["changeHistoryDetails"] = {
+            sha: self.change(sha, data) if isinstance(data, dict) else data
+            for sha, data in details.items()
+        }
+        return normalized
+
+    def is_fix(self, sha: str, message: str) -> bool:
+        """Classifica o commit na primeira consulta e reutiliza o resultado"""
+        with self._lock:
+            classification = self._classified.get(sha)
+            if classification is None:
+                classification = self.classifications.classify(sha, message)
+                self._classified[sha] = classification
+            return classification[0]
+
+    def reclassify(self, classifier: FixClassifier) -> Set[str]:
+        """
+        Reclassifica todas as mensagens da tabela de uma vez
+
+        Returns:
+            SHAs dos commits de fix
+        """
+        with self._lock:
+            messages = pd.Series(
+                {sha: commit.get("commitMessage") for sha, commit in self._commits.items()},
+                dtype=object,
+            )
+            classified = classifier.classify_many(messages)
+            self._classified = {
+                sha: (bool(is_fix), fix_keywords)
+                for sha, is_fix, fix_keywords in zip(
+                    classified.index, classified["is_fix"], classified["fix_keywords"]
+                )
+            }
+            return set(classified.index[classified["is_fix"]])
+
+    @staticmethod
+    def edges(codeshovel_data: Optional[Dict]) -> List[CommitEdge]:
+        """Arestas (SHA, tipo) do método para os seus commits"""
+        if not isinstance(codeshovel_data, dict):
+            return []
+        details = codeshovel_data.get("changeHistoryDetails")
+        if not isinstance(details, dict):
+            return []
+        return [
+            (sha, data.get("type"))
+            for sha, data in details.items()
+            if isinstance(data, dict)
+        ]
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """{sha: {commitMessage, commitDate, commitAuthor, isFix, fixKeywords}}"""
+        with self._lock:
+            table = {}
+            for sha, commit in self._commits.items():
+                is_fix, matched = self._classified.get(sha, (None, []))
+                table[sha] = dict(commit, isFix=is_fix, fixKeywords=matched)
+            return table
+
+    def save(self, path: Union[str, Path]):
+        """Grava a tabela em JSON (escrita atômica)"""
+        atomic_write_json(Path(path), self.to_dict(), indent=None)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CommitTable":
+        """Carrega uma tabela gravada por save()"""
+        table = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for sha, commit in data.items():
+            table._commits[sha] = {field: commit.get(field) for field in COMMIT_FIELDS}
+            if commit.get("isFix") is not None:
+                table._classified[sha] = (commit["isFix"], commit.get("fixKeywords", []))
+        return table
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Concordância entre um backend aproximado e o CodeShovel
+
+Sorteia uma amostra de métodos dos repositórios, obtém o histórico de cada um
+pelo CodeShovel (referência, usando o cache quando disponível) e pelo backend
+aproximado (bulk ou blame) e mede o quanto os dois concordam: conjunto de
+commits, número de commits de fix e fix_ratio.
+"""
+
+import argparse
+import json
+import logging
+import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import CODESHOVEL_CACHE_PATH, CODESHOVEL_POOL_SIZE, DEFAULT_JOBS
+from fix_analysis import CodeShovelAnalyzer
+from history_engine import HISTORY_ENGINES
+
+logger = logging.getLogger(__name__)
+
+# (repositório, arquivo relativo, método, linha_inicio, linha_fim)
+SampledMethod = Tuple[str, str, str, int, int]
+
+
+def sample_methods(
+    analyzer: CodeShovelAnalyzer, repo_limit: int, sample_size: int, seed: int
+) -> List[SampledMethod]:
+    """Extrai os métodos dos repositórios e sorteia uma amostra reprodutível"""
+    repos = sorted(
+        (
+            d
+            for d in analyzer.repositories_dir.iterdir()
+            if d.is_dir() and (d / ".git").exists()
+        ),
+        key=lambda r: str(r).lower(),
+    )[:repo_limit]
+
+    candidates = []
+    for repo in repos:
+        for java_file in analyzer.find_java_files(repo):
+            relative_path = str(java_file.relative_to(repo))
+            for name, start, end in analyzer.extract_methods_from_file(java_file):
+                candidates.append((repo.name, relative_path, name, start, end))
+
+    logger.info(f"{len(candidates)} métodos candidatos em {len(repos)} repositórios")
+
+    rng = random.Random(seed)
+    return rng.sample(candidates, min(sample_size, len(candidates)))
+
+
+def approximate_histories(
+    analyzer: CodeShovelAnalyzer, mode: str, sample: List[SampledMethod]
+) -> Dict[Tuple[str, str, str, int], Dict]:
+    """Executa o backend aproximado uma vez por repositório da amostra"""
+    by_repo: Dict[str, Dict[str, List[Tuple[str, int, int]]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for repo_name, file_path, name, start, end in sample:
+        by_repo[repo_name][file_path].append((name, start, end))
+
+    histories = {}
+    for repo_name, methods in by_repo.items():
+        engine = HISTORY_ENGINES[mode](analyzer.repositories_dir / repo_name, repo_name)
+        for (file_path, name, start), data in engine.analyze(methods).items():
+            histories[(repo_name, file_path, name, start)] = data
+    return histories
+
+
+def compare_method(
+    analyzer: CodeShovelAnalyzer, reference: Optional[Dict], approximate: Optional[Dict]
+) -> Optional[Dict]:
+    """Compara os históricos de um método (None se a referência falhou)"""
+    if not reference:
+        return None
+
+    ref_commits = set(reference.get("changeHistoryDetails", {}))
+    approx_commits = set((approximate or {}).get("changeHistoryDetails", {}))
+    common = ref_commits & approx_commits
+    union = ref_commits | approx_commits
+
+    ref_total, ref_fixes = analyzer.analyze_fix_commits(reference)
+    approx_total, approx_fixes = (
+        analyzer.analyze_fix_commits(approximate) if approximate else (0, [])
+    )
+
+    return {
+        "reference_commits": len(ref_commits),
+        "approximate_commits": len(approx_commits),
+        "jaccard": len(common) / len(union) if union else 1.0,
+        "precision": len(common) / len(approx_commits) if approx_commits else None,
+        "recall": len(common) / len(ref_commits) if ref_commits else None,
+        "reference_fix_count": len(ref_fixes),
+        "approximate_fix_count": len(approx_fixes),
+        "fix_ratio_error": abs(
+            (len(ref_fixes) / ref_total if ref_total else 0.0)
+            - (len(approx_fixes) / approx_total if approx_total else 0.0)
+        ),
+    }
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def summarize(rows: List[Dict]) -> Dict:
+    """Agrega as métricas de concordância da amostra"""
+    if not rows:
+        return {"methods": 0}
+
+    return {
+        "methods": len(rows),
+        "exact_commit_set": sum(r["jaccard"] == 1.0 for r in rows) / len(rows),
+        "mean_jaccard": _mean([r["jaccard"] for r in rows]),
+        "mean_precision": _mean([r["precision"] for r in rows]),
+        "mean_recall": _mean([r["recall"] for r in rows]),
+        "exact_fix_count": sum(
+            r["reference_fix_count"] == r["approximate_fix_count"] for r in rows
+        )
+        / len(rows),
+        "has_fix_agreement": sum(
+            (r["reference_fix_count"] > 0) == (r["approximate_fix_count"] > 0)
+            for r in rows
+        )
+        / len(rows),
+        "mean_fix_ratio_error": _mean([r["fix_ratio_error"] for r in rows]),
+    }
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Concordância de um backend aproximado com o CodeShovel"
+    )
+    parser.add_argument(
+        "--codeshovel-jar", required=True, help="Caminho para o JAR do CodeShovel"
+    )
+    parser.add_argument(
+        "--repositories-dir",
+        required=True,
+        help="Diretório contendo os repositórios Java",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=sorted(HISTORY_ENGINES),
+        default="blame",
+        help="Backend comparado com o CodeShovel (padrão: blame)",
+    )
+    parser.add_argument(
+        "--sample-size",
+        type=int,
+        default=100,
+        help="Número de métodos sorteados (padrão: 100)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Semente do sorteio (padrão: 42)"
+    )
+    parser.add_argument(
+        "--repo-limit",
+        type=int,
+        default=5,
+        help="Limite de repositórios para amostrar (padrão: 5)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=CODESHOVEL_POOL_SIZE,
+        help="Número de workers persistentes do CodeShovel (padrão: 0, uma JVM por método)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="Número de métodos analisados em paralelo pelo CodeShovel (padrão: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Não usa o cache de resultados do CodeShovel",
+    )
+
+    args = parser.parse_args()
+
+    analyzer = CodeShovelAnalyzer(
+        args.codeshovel_jar,
+        args.repositories_dir,
+        pool_size=args.pool_size,
+        jobs=args.jobs,
+        cache_path=None if args.no_cache else CODESHOVEL_CACHE_PATH,
+    )
+
+    try:
+        sample = sample_methods(analyzer, args.repo_limit, args.sample_size, args.seed)
+        approximate = approximate_histories(analyzer, args.mode, sample)
+
+        def reference(method: SampledMethod) -> Optional[Dict]:
+            repo_name, file_path, name, start, _ = method
+            return analyzer.run_codeshovel(
+                str(analyzer.repositories_dir / repo_name), file_path, name, start
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            references = list(executor.map(reference, sample))
+
+        rows = []
+        for method, ref in zip(sample, references):
+            repo_name, file_path, name, start, end = method
+            row = compare_method(
+                analyzer, ref, approximate.get((repo_name, file_path, name, start))
+            )
+            if row is None:
+                logger.warning(f"Sem resultado do CodeShovel para {name} em {file_path}")
+                continue
+            row.update(
+                repository=repo_name,
+                file_path=file_path,
+                method_name=name,
+                start_line=start,
+                end_line=end,
+            )
+            rows.append(row)
+
+        summary = summarize(rows)
+        summary.update(mode=args.mode, sample_size=len(sample), seed=args.seed)
+
+        output_file = Path(analyzer.results_dir) / f"agreement_{args.mode}.json"
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "methods": rows}, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"Concordância {args.mode} x CodeShovel: {summary}")
+        logger.info(f"Detalhes salvos em: {output_file}")
+
+    finally:
+        analyzer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,9 +22,53 @@ DEFAULT_RESULTS_DIR = "./fix_analysis_results"
 DEFAULT_REPO_LIMIT = 5
 DEFAULT_METHOD_LIMIT = 50
 
+# Número de métodos analisados em paralelo
+DEFAULT_JOBS = 1
+
+# Processos usados na extração de métodos (0 = número de CPUs)
+EXTRACTION_WORKERS = 0
+
+# Backends de histórico de métodos
+#   codeshovel: uma execução do CodeShovel por método (mais preciso)
+#   bulk: uma única passada pelo git log do repositório para todos os métodos
+#   blame: um git blame por arquivo (aproximado: só as linhas atuais)
+ANALYSIS_MODES = ["codeshovel", "bulk", "blame"]
+DEFAULT_ANALYSIS_MODE = "codeshovel"
+
+# Métodos de arquivos com menos commits que isso não passam pelo CodeShovel:
+# o histórico trivial é montado a partir do git log (0 desativa). Com 2, só
+# arquivos de um único commit são resolvidos, e o resultado é exato.
+MIN_FILE_COMMITS = 2
+
 # Timeout para execução do CodeShovel (em segundos)
 CODESHOVEL_TIMEOUT = 300
 
+# Diretório base (tmpfs) para as saídas privadas do CodeShovel
+CODESHOVEL_TMP_DIR = "/dev/shm"
+
+# Pool de workers persistentes do CodeShovel (0 = uma JVM por método)
+CODESHOVEL_POOL_SIZE = 0
+
+# Tempo máximo para um worker subir e responder ao primeiro ping (em segundos)
+CODESHOVEL_WORKER_STARTUP_TIMEOUT = 120
+
+# Requisições atendidas por um worker antes de reciclar a JVM
+CODESHOVEL_WORKER_MAX_REQUESTS = 500
+
+# Tempo ocioso após o qual um worker recebe um ping antes de ser reutilizado
+CODESHOVEL_HEALTH_CHECK_INTERVAL = 60
+
+# Cache persistente dos resultados do CodeShovel
+CACHE_DIR = "./.codeshovel_cache"
+CODESHOVEL_CACHE_PATH = os.path.join(CACHE_DIR, "codeshovel_results.sqlite")
+CODESHOVEL_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+
+# Índice de métodos extraídos por SHA de blob, compartilhado entre repositórios
+EXTRACTION_INDEX_PATH = os.path.join(CACHE_DIR, "extraction_index.sqlite")
+
+# Memo por repositório da classificação de commits (SHA -> é fix, palavras-chave)
+CLASSIFICATION_CACHE_DIR = os.path.join(CACHE_DIR, "commit_classifications")
+
 # ============================================================================
 # CONFIGURAÇÕES DE ANÁLISE
 # ============================================================================
@@ -89,6 +133,27 @@ LOG_FILE = "fix_analysis.log"
 # Formatos de exportação suportados
 EXPORT_FORMATS = ["csv", "json", "xlsx"]
 
+# Armazenamento dos resultados por método
+#   json: um arquivo <repo>_fix_analysis.json por repositório
+#   sqlite: um único banco indexado, gravado à medida que os métodos terminam
+#   jsonl: uma linha por método, acrescentada assim que o método termina
+#   parquet/arrow: tabelas colunares de métodos e commits por repositório
+#     (requer pyarrow)
+RESULTS_FORMATS = ["json", "jsonl", "sqlite", "parquet", "arrow"]
+DEFAULT_RESULTS_FORMAT = "json"
+RESULTS_DB_NAME = "fix_analysis_results.sqlite"
+
+# Registros JSON Lines gravados entre dois fsync
+JSONL_FSYNC_INTERVAL = 100
+
+# Eventos do journal de checkpoint gravados entre dois fsync
+CHECKPOINT_FSYNC_INTERVAL = 100
+
+# Resumo das estatísticas atualizado à medida que os métodos terminam
+LIVE_STATS_FILE = "fix_analysis_live_stats.json"
+# Métodos concluídos entre duas gravações do resumo
+LIVE_STATS_FLUSH_INTERVAL = 50
+
 # Configurações de CSV
 CSV_CONFIG = {
     "encoding": "utf-8",
@@ -236,6 +301,8 @@ def print_config_summary():
     print(f"Limite de repositórios: {get_config_value('DEFAULT_REPO_LIMIT')}")
     print(f"Limite de métodos: {get_config_value('DEFAULT_METHOD_LIMIT')}")
     print(f"Timeout CodeShovel: {get_config_value('CODESHOVEL_TIMEOUT')}s")
+    print(f"Workers CodeShovel: {get_config_value('CODESHOVEL_POOL_SIZE')}")
+    print(f"Jobs paralelos: {get_config_value('DEFAULT_JOBS')}")
     
     print(f"\nPalavras-chave de fix: {', '.join(get_fix_keywords())}")
     print(f"Categorias de tamanho: {list(get_method_size_categories().keys())}")
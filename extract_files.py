@@ -1,9 +1,27 @@
 from models import File, DEFAULT_REPOSITORIES_DIR, DEFAULT_RESULTS_DIR
+from java_files import find_java_files
+from git_utils import get_head_sha
+from incremental import update_repository
+from extraction_index import ExtractionIndex
+from config import EXTRACTION_INDEX_PATH
 from pathlib import Path
 from dataclasses import asdict
 import json
+import logging
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
 
 def extract_files(results_dir: Path, repositories_dir: Path):
+    index = ExtractionIndex(EXTRACTION_INDEX_PATH)
+    try:
+        _extract_files(results_dir, repositories_dir, index)
+    finally:
+        index.close()
+
+def _extract_files(results_dir: Path, repositories_dir: Path, index: ExtractionIndex):
     java_files = []
 
     for result in results_dir.iterdir():
@@ -11,19 +29,29 @@ def extract_files(results_dir: Path, repositories_dir: Path):
             data = json.load(f)
             repo_path = repositories_dir / data["name"]
 
-        java_files = sorted(repo_path.rglob("*.java"), key=lambda f: str(f.name).lower())
+        if data["files"]:
+            stats = update_repository(data, repo_path, index=index)
+            if stats is not None:
+                logger.info(f"{data['name']}: atualização incremental {stats}")
+                with open(result, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                continue
+
+            logger.warning(f"{data['name']}: sem HEAD registrado ou diff indisponível, reconstruindo")
+            data["files"] = []
+            data["complete"] = False
+
+        data["head_sha"] = get_head_sha(repo_path)
+        java_files = sorted(find_java_files(repo_path), key=lambda f: str(f.name).lower())
         for java_file in java_files:
-            if not any(
-                part in str(java_file) for part in ["test", "Test", "target", "build"]
-            ):
-                file_json = File(
-                    name=java_file.name,
-                    path=str(java_file.relative_to(repo_path)),
-                    complete=False,
-                    methods=[]
-                )
-
-                data["files"].append(asdict(file_json))
+            file_json = File(
+                name=java_file.name,
+                path=str(java_file.relative_to(repo_path)),
+                complete=False,
+                methods=[]
+            )
+
+            data["files"].append(asdict(file_json))
 
         with open(result, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
@@ -2,7 +2,9 @@ from dataclasses import asdict
 from models import CodeShovelMethodInfo, Method, MethodInfo, DEFAULT_REPOSITORIES_DIR, DEFAULT_RESULTS_DIR
 from pathlib import Path
 import json
-import re
+import method_extractor
+from config import EXTRACTION_INDEX_PATH, EXTRACTION_WORKERS
+from extraction_index import ExtractionIndex, extract_methods_indexed
 import logging
 
 logging.basicConfig(
@@ -11,62 +13,34 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 def extract_methods_from_file(file_path: str, repo_name: str, repositories_dir: Path):
-    methods = []
-    java_file = repositories_dir / repo_name / file_path
-    try:
-        with open(java_file, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
-
-        in_method = False
-        method_start = 0
-        method_name = ""
-        brace_count = 0
-
-        for i, line in enumerate(lines, 1):
-            line_content = line.strip()
-
-            # Detectar início de método (padrão simplificado)
-            if re.match(
-                r"^\s*(public|private|protected|static|\s) +[\w\<\>\[\]]+\s+(\w+) *\([^\)]*\) *\{?",
-                line_content,
-            ):
-                if in_method:
-                    methods.append((method_name, method_start, i - 1))
-
-                match = re.search(r"(\w+) *\(", line_content)
-                if match:
-                    method_name = match.group(1)
-                else:
-                    method_name = f"unknown_method_at_line_{i}"
-                method_start = i
-                in_method = True
-                brace_count = 1 if line_content.endswith("{") else 0
-
-            elif in_method:
-                if line_content.endswith("{"):
-                    brace_count += 1
-                elif line_content.endswith("}"):
-                    brace_count -= 1
-                    if brace_count == 0:
-                        methods.append((method_name, method_start, i))
-                        in_method = False
-
-        if in_method:
-            methods.append((method_name, method_start, len(lines)))
-
-    except Exception as e:
-        logger.warning(f"Erro ao processar {java_file}: {e}")
-
-    methods = sorted(methods, key=lambda x: (x[0], x[1]))
-    return methods
+    return method_extractor.extract_methods_from_file(repositories_dir / repo_name / file_path)
 
 def extract_methods(repositories_dir: Path, results_dir: Path):
+    index = ExtractionIndex(EXTRACTION_INDEX_PATH)
+    try:
+        _extract_methods(results_dir, index)
+    finally:
+        index.close()
+
+def _extract_methods(results_dir: Path, index: ExtractionIndex):
     for result in results_dir.iterdir():
         with open(result, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        for file in data["files"]:
-            methods = extract_methods_from_file(file["path"], data["name"], Path(DEFAULT_REPOSITORIES_DIR))
+        # Arquivos já extraídos (inclusive pela atualização incremental) são
+        # mantidos; os sem métodos já ficam completos na extração
+        pending = [file for file in data["files"] if not file["methods"] and not file["complete"]]
+        repo_path = Path(DEFAULT_REPOSITORIES_DIR) / data["name"]
+        paths = [repo_path / file["path"] for file in pending]
+        extracted = extract_methods_indexed(repo_path, paths, index, EXTRACTION_WORKERS)
+
+        for file, (_, methods) in zip(pending, extracted):
+            if methods is None:
+                # Falha de leitura: o arquivo fica pendente para a próxima execução
+                continue
+            if not methods:
+                file["complete"] = True
+
             for method_name, start_line, end_line in methods:
                 method_info_json = MethodInfo(
                     start_line=start_line,
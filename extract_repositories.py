@@ -1,4 +1,5 @@
 from models import Repository, DEFAULT_REPOSITORIES_DIR, DEFAULT_RESULTS_DIR
+from git_utils import get_head_sha
 from pathlib import Path
 from dataclasses import asdict
 import json
@@ -19,7 +20,8 @@ def extract_repos(repositories_dir: Path, results_dir: Path):
         repo_json = Repository(
             name=repository.name,
             complete=False,
-            files = []
+            files = [],
+            head_sha=get_head_sha(repository)
         )
 
         with open(results_file, "w", encoding="utf-8") as f:
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Índice persistente de métodos extraídos, endereçado pelo SHA do blob
+
+O mesmo conteúdo aparece byte a byte em reexecuções, forks e cópias
+vendorizadas de outros projetos. Como a extração depende apenas dos bytes do
+arquivo, os métodos encontrados em um blob (SHA de `git ls-files -s`) valem
+para qualquer caminho, repositório ou branch que o contenha, e o arquivo não
+precisa ser tokenizado de novo.
+
+As entradas ficam em um arquivo SQLite junto do cache do CodeShovel e
+registram a versão do extrator que as gerou.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from git_utils import get_index_blob_shas
+from method_extractor import EXTRACTOR_VERSION, MethodSpan, extract_methods_parallel
+
+logger = logging.getLogger(__name__)
+
+# Limite de parâmetros por consulta "IN (...)" do SQLite
+LOOKUP_BATCH_SIZE = 500
+
+
+class ExtractionIndex:
+    """Métodos extraídos de cada blob Java, compartilhados entre execuções"""
+
+    def __init__(self, index_path: Union[str, Path]):
+        """
+        Abre (ou cria) o índice
+
+        Args:
+            index_path: Caminho do arquivo SQLite
+        """
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS method_spans (
+                blob_sha TEXT PRIMARY KEY,
+                extractor_version INTEGER NOT NULL,
+                spans TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, blob_shas: Iterable[str]) -> Dict[str, List[MethodSpan]]:
+        """Retorna os métodos registrados para os blobs encontrados no índice"""
+        blob_shas = list(dict.fromkeys(blob_shas))
+        found = {}
+
+        with self._lock:
+            for i in range(0, len(blob_shas), LOOKUP_BATCH_SIZE):
+                batch = blob_shas[i : i + LOOKUP_BATCH_SIZE]
+                rows = self._conn.execute(
+                    "SELECT blob_sha, spans FROM method_spans "
+                    f"WHERE extractor_version = ? AND blob_sha IN ({','.join('?' * len(batch))})",
+                    [EXTRACTOR_VERSION] + batch,
+                )
+                for blob_sha, spans in rows:
+                    found[blob_sha] = [tuple(span) for span in json.loads(spans)]
+
+        self.hits += len(found)
+        self.misses += len(blob_shas) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, List[MethodSpan]]):
+        """Registra os métodos extraídos de cada blob"""
+        if not entries:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO method_spans (blob_sha, extractor_version, spans) "
+                "VALUES (?, ?, ?)",
+                [
+                    (blob_sha, EXTRACTOR_VERSION, json.dumps(spans, ensure_ascii=False))
+                    for blob_sha, spans in entries.items()
+                ],
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Fecha o índice"""
+        with self._lock:
+            self._conn.close()
+        logger.info(f"Índice de extração: {self.hits} acertos, {self.misses} faltas")
+
+
+def extract_methods_indexed(
+    repo_path: Path,
+    files: Iterable[Path],
+    index: Optional[ExtractionIndex],
+    workers: int = 0,
+) -> Iterator[Tuple[Path, Optional[List[MethodSpan]]]]:
+    """
+    Extrai os métodos dos arquivos de um repositório, consultando o índice
+
+    Arquivos cujo blob já está no índice não são lidos; os demais passam por
+    extract_methods_parallel e são registrados ao final. Arquivos fora do
+    índice do Git ou com alterações locais são sempre extraídos.
+
+    Args:
+        repo_path: Caminho para o repositório
+        files: Arquivos Java (caminhos absolutos dentro do repositório)
+        index: Índice de extração (None extrai tudo)
+        workers: Processos usados na extração
+
+    Yields:
+        (arquivo, [(nome_metodo, linha_inicio, linha_fim)] ou None se o
+        arquivo não pôde ser lido), na ordem de entrada
+    """
+    files = list(files)
+    if index is None or not files:
+        yield from extract_methods_parallel(files, workers)
+        return
+
+    blobs = get_index_blob_shas(repo_path)
+    file_blobs = [blobs.get(f.relative_to(repo_path).as_posix()) for f in files]
+    known = index.get_many(sha for sha in file_blobs if sha)
+
+    missing = [f for f, sha in zip(files, file_blobs) if sha not in known]
+    extracted = extract_methods_parallel(missing, workers)
+    new_entries = {}
+
+    try:
+        for java_file, blob_sha in zip(files, file_blobs):
+            if blob_sha in known:
+                yield java_file, known[blob_sha]
+                continue
+
+            java_file, methods = next(extracted)
+            # Blobs sem métodos também são registrados, com uma lista vazia;
+            # falhas de leitura (None) não, para serem extraídas de novo
+            if blob_sha and methods is not None:
+                new_entries[blob_sha] = methods
+            yield java_file, methods
+    finally:
+        index.put_many(new_entries)
@@ -10,16 +10,64 @@ de commits de "fix" usando o CodeShovel.
 import os
 import json
 import subprocess
-import re
+import shutil
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple, Optional
 import logging
 from dataclasses import dataclass
 from collections import defaultdict
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor
 import argparse
+import threading
+
+import columnar_results
+from analysis_frame import (
+    SIZE_CATEGORY_LABELS,
+    SIZE_CATEGORY_NAMES,
+    SIZE_CATEGORY_RANGES,
+    SIZE_CATEGORY_TITLES,
+    add_derived_columns,
+    frame_from_analyses,
+    repository_fix_ratios,
+    size_category_stats,
+)
+from checkpoint import RepositoryCheckpoint
+from codeshovel_cache import CodeShovelCache
+from classification_cache import ClassificationCache
+from commit_table import CommitTable
+from codeshovel_pool import CodeShovelWorkerPool, private_output_dir
+from config import (
+    ANALYSIS_MODES,
+    CLASSIFICATION_CACHE_DIR,
+    CODESHOVEL_CACHE_PATH,
+    CODESHOVEL_POOL_SIZE,
+    CODESHOVEL_TIMEOUT,
+    DEFAULT_ANALYSIS_MODE,
+    DEFAULT_JOBS,
+    DEFAULT_RESULTS_FORMAT,
+    EXTRACTION_INDEX_PATH,
+    EXTRACTION_WORKERS,
+    LIVE_STATS_FILE,
+    MIN_FILE_COMMITS,
+    RESULTS_DB_NAME,
+    RESULTS_FORMATS,
+)
+from extraction_index import ExtractionIndex, extract_methods_indexed
+from fix_classifier import FixClassifier
+from git_utils import get_blob_shas, get_head_sha
+from history_engine import HISTORY_ENGINES, FileHistoryPrefilter
+from java_files import find_java_files
+from jsonl_results import JsonlResultsWriter, iter_jsonl
+from method_extractor import extract_methods_from_file
+from models import COMMIT_FIELDS, CodeShovelMethodInfo, Method
+from online_stats import OnlineStatistics
+from reclassify import iter_reclassified_results
+from results_loader import REPORT_COLUMNS, iter_json_array, iter_projected_results
+from results_store import ResultsStore
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -55,33 +103,153 @@ class FixAnalysis:
 class CodeShovelAnalyzer:
     """Analisador usando CodeShovel para métodos Java"""
 
-    def __init__(self, codeshovel_jar_path: str, repositories_dir: str):
+    def __init__(
+        self,
+        codeshovel_jar_path: Optional[str],
+        repositories_dir: str,
+        pool_size: int = 0,
+        jobs: int = 1,
+        cache_path: Optional[str] = CODESHOVEL_CACHE_PATH,
+        refresh_cache: bool = False,
+        resume: bool = True,
+        analysis_mode: str = DEFAULT_ANALYSIS_MODE,
+        min_file_commits: int = MIN_FILE_COMMITS,
+        extraction_workers: int = EXTRACTION_WORKERS,
+        extraction_index_path: Optional[str] = EXTRACTION_INDEX_PATH,
+        results_format: str = DEFAULT_RESULTS_FORMAT,
+        classification_cache_dir: Optional[str] = CLASSIFICATION_CACHE_DIR,
+        fix_keywords: Optional[Sequence[str]] = None,
+    ):
         """
         Inicializa o analisador
 
         Args:
-            codeshovel_jar_path: Caminho para o JAR do CodeShovel
+            codeshovel_jar_path: Caminho para o JAR do CodeShovel (None apenas
+                para reclassificar resultados gravados, sem executá-lo)
             repositories_dir: Diretório contendo os repositórios Java
+            pool_size: Número de workers persistentes do CodeShovel
+                (0 = uma JVM por método)
+            jobs: Número de métodos analisados simultaneamente
+            cache_path: Arquivo do cache de resultados do CodeShovel
+                (None desativa o cache)
+            refresh_cache: Ignora entradas existentes e regrava o cache
+            resume: Retoma checkpoints de execuções interrompidas
+            analysis_mode: Backend de histórico: "codeshovel" (um método por
+                vez), "bulk" (uma passada pelo histórico do repositório) ou
+                "blame" (um git blame por arquivo, aproximado)
+            min_file_commits: No modo codeshovel, métodos de arquivos com
+                menos commits que isso recebem o histórico trivial sem
+                executar o CodeShovel (0 desativa). Acima de 2 o resultado é
+                aproximado e vai para um diretório de resultados próprio
+            extraction_workers: Processos usados na extração de métodos
+                (0 = número de CPUs)
+            extraction_index_path: Arquivo do índice de métodos por blob
+                (None desativa o índice)
+            results_format: Armazenamento dos resultados: "json" (um arquivo
+                por repositório), "jsonl" (uma linha por método, gravada assim
+                que o método termina), "sqlite" (banco único, gravado por método),
+                "parquet" ou "arrow" (tabelas colunares por repositório)
+            classification_cache_dir: Diretório dos memos de classificação de
+                commits por repositório (None mantém só em memória)
+            fix_keywords: Palavras-chave de commits de fix (None usa
+                config.FIX_KEYWORDS)
         """
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Modo de análise desconhecido: {analysis_mode}")
+        if results_format not in RESULTS_FORMATS:
+            raise ValueError(f"Formato de resultados desconhecido: {results_format}")
+
+        self.analysis_mode = analysis_mode
+        self.min_file_commits = min_file_commits
+        self.extraction_workers = extraction_workers
         self.codeshovel_jar_path = codeshovel_jar_path
         self.repositories_dir = Path(repositories_dir)
         self.results_dir = Path("fix_analysis_results_ed")
-        self.results_dir.mkdir(exist_ok=True)
-
-        if not os.path.exists(codeshovel_jar_path):
+        if analysis_mode != "codeshovel":
+            # Resultados de outros backends não se misturam aos do CodeShovel
+            self.results_dir = self.results_dir / analysis_mode
+        elif min_file_commits > 2:
+            # Com mais de um commit por arquivo, o pré-filtro atribui todos os
+            # commits do arquivo a cada método: resultado aproximado, separado
+            # dos resultados exatos do CodeShovel
+            self.results_dir = (
+                self.results_dir / f"{FileHistoryPrefilter.ORIGIN}-{min_file_commits}"
+            )
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._histories: Dict[str, Dict[Tuple[str, str, int], Dict]] = {}
+        self._commit_tables: Dict[str, CommitTable] = {}
+        self.classification_cache_dir = classification_cache_dir
+        self.classifier = FixClassifier(fix_keywords)
+        self._commit_tables_lock = threading.Lock()
+        self._frame_cache: Optional[Tuple[List, int, pd.DataFrame]] = None
+        self.live_stats: Optional[OnlineStatistics] = None
+
+        self.results_format = results_format
+        self._writers: Dict[str, JsonlResultsWriter] = {}
+        self.results_store: Optional[ResultsStore] = None
+        if results_format == "sqlite":
+            self.results_store = ResultsStore(self.results_dir / RESULTS_DB_NAME)
+        elif results_format in columnar_results.COLUMNAR_EXTENSIONS:
+            columnar_results.require_pyarrow()
+
+        if codeshovel_jar_path is not None and not os.path.exists(codeshovel_jar_path):
             raise FileNotFoundError(
                 f"CodeShovel JAR não encontrado: {codeshovel_jar_path}"
             )
 
+        self.jobs = max(1, jobs)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.cache: Optional[CodeShovelCache] = None
+        if cache_path:
+            self.cache = CodeShovelCache(cache_path)
+        self.refresh_cache = refresh_cache
+        self.extraction_index: Optional[ExtractionIndex] = None
+        if extraction_index_path:
+            self.extraction_index = ExtractionIndex(extraction_index_path)
+        self._repo_states: Dict[str, Tuple[Optional[str], Dict[str, str]]] = {}
+        self._repo_states_lock = threading.Lock()
+
+        self.resume = resume
+        self._checkpoints: Dict[str, RepositoryCheckpoint] = {}
+        # Repositórios com métodos pendentes no checkpoint: os resultados não
+        # são publicados, e a próxima execução os retoma
+        self._incomplete_repositories: Set[str] = set()
+
+        self.pool: Optional[CodeShovelWorkerPool] = None
+        if pool_size > 0:
+            self.pool = CodeShovelWorkerPool(codeshovel_jar_path, pool_size)
+
+    def close(self):
+        """Libera o executor e os workers do CodeShovel, se houver"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        if self.extraction_index is not None:
+            self.extraction_index.close()
+            self.extraction_index = None
+        if self.results_store is not None:
+            self.results_store.close()
+            self.results_store = None
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        for commits in self._commit_tables.values():
+            commits.classifications.save()
+        self._commit_tables.clear()
+        for checkpoint in self._checkpoints.values():
+            checkpoint.close()
+        self._checkpoints.clear()
+
     def find_java_files(self, repo_path: Path) -> List[Path]:
         """Encontra todos os arquivos Java em um repositório"""
-        java_files = []
-        for java_file in repo_path.rglob("*.java"):
-            if not any(
-                part in str(java_file) for part in ["test", "Test", "target", "build"]
-            ):
-                java_files.append(java_file)
-
+        java_files = find_java_files(repo_path)
         java_files.sort(key=lambda f: str(f).lower())
         return java_files
 
@@ -90,55 +258,36 @@ class CodeShovelAnalyzer:
         Extrai informações básicas dos métodos de um arquivo Java
         Retorna: [(nome_metodo, linha_inicio, linha_fim)]
         """
-        methods = []
-        try:
-            with open(java_file, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-
-            in_method = False
-            method_start = 0
-            method_name = ""
-            brace_count = 0
-
-            for i, line in enumerate(lines, 1):
-                line_content = line.strip()
-
-                # Detectar início de método (padrão simplificado)
-                if re.match(
-                    r"^\s*(public|private|protected|static|\s) +[\w\<\>\[\]]+\s+(\w+) *\([^\)]*\) *\{?",
-                    line_content,
-                ):
-                    if in_method:
-                        methods.append((method_name, method_start, i - 1))
-
-                    method_name = re.search(r"(\w+) *\(", line_content).group(1)
-                    method_start = i
-                    in_method = True
-                    brace_count = 1 if line_content.endswith("{") else 0
-
-                elif in_method:
-                    if line_content.endswith("{"):
-                        brace_count += 1
-                    elif line_content.endswith("}"):
-                        brace_count -= 1
-                        if brace_count == 0:
-                            methods.append((method_name, method_start, i))
-                            in_method = False
-
-            if in_method:
-                methods.append((method_name, method_start, len(lines)))
-
-        except Exception as e:
-            logger.warning(f"Erro ao processar {java_file}: {e}")
+        return extract_methods_from_file(java_file) or []
+
+    def _get_repo_state(self, repo_path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Retorna (HEAD, {arquivo: blob}) do repositório, calculado uma única vez"""
+        with self._repo_states_lock:
+            if repo_path not in self._repo_states:
+                self._repo_states[repo_path] = (
+                    get_head_sha(repo_path),
+                    get_blob_shas(repo_path),
+                )
+            return self._repo_states[repo_path]
 
-        methods = sorted(methods, key=lambda x: (x[0], x[1]))
-        return methods
+    def _cache_key(
+        self, repo_path: str, file_path: str, method_name: str, start_line: int
+    ) -> Optional[str]:
+        """Chave do método no cache ou None se não for possível endereçá-lo"""
+        head_sha, blobs = self._get_repo_state(repo_path)
+        blob_sha = blobs.get(Path(file_path).as_posix())
+        if not head_sha or not blob_sha:
+            return None
+        return CodeShovelCache.make_key(
+            head_sha, Path(file_path).as_posix(), blob_sha, method_name, start_line
+        )
 
     def run_codeshovel(
         self, repo_path: str, file_path: str, method_name: str, start_line: int
     ) -> Optional[Dict]:
         """
-        Executa o CodeShovel para um método específico
+        Executa o CodeShovel para um método específico, consultando o cache
+        de resultados antes de iniciar o Java
 
         Args:
             repo_path: Caminho para o repositório
@@ -149,6 +298,75 @@ class CodeShovelAnalyzer:
         Returns:
             Dicionário com o resultado do CodeShovel ou None se falhar
         """
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(repo_path, file_path, method_name, start_line)
+
+        if cache_key is not None and not self.refresh_cache:
+            data = self.cache.get(cache_key)
+            if data is not None:
+                logger.debug(f"Cache do CodeShovel: {method_name} ({file_path}:{start_line})")
+                return data
+
+        data = self._execute_codeshovel(repo_path, file_path, method_name, start_line)
+
+        if data is not None and cache_key is not None:
+            self.cache.put(cache_key, data)
+
+        return data
+
+    def _get_history(
+        self,
+        repo_name: str,
+        repo_path: str,
+        file_path: str,
+        method_name: str,
+        start_line: int,
+    ) -> Optional[Dict]:
+        """Obtém o histórico do método pelo backend configurado"""
+        history = self._histories.get(repo_name, {}).get(
+            (file_path, method_name, start_line)
+        )
+
+        if history is None and self.analysis_mode == "codeshovel":
+            return self.run_codeshovel(repo_path, file_path, method_name, start_line)
+
+        return history
+
+    def _prepare_history(
+        self,
+        repo_name: str,
+        repo_path: Path,
+        pending: Dict[str, List[Tuple[str, int, int]]],
+    ):
+        """
+        Pré-calcula o histórico dos métodos pendentes para backends em lote e,
+        no modo codeshovel, resolve os métodos de arquivos com poucos commits
+
+        Args:
+            repo_name: Nome do repositório
+            repo_path: Caminho para o repositório
+            pending: {arquivo: [(nome, linha_inicio, linha_fim)]} ainda não concluídos
+        """
+        if self.analysis_mode in HISTORY_ENGINES and pending:
+            engine = HISTORY_ENGINES[self.analysis_mode](repo_path, repo_name)
+            self._histories[repo_name] = engine.analyze(pending)
+        elif self.analysis_mode == "codeshovel" and pending:
+            prefilter = FileHistoryPrefilter(repo_path, repo_name, self.min_file_commits)
+            self._histories[repo_name] = prefilter.analyze(pending)
+
+    def _execute_codeshovel(
+        self, repo_path: str, file_path: str, method_name: str, start_line: int
+    ) -> Optional[Dict]:
+        """Executa o CodeShovel (pool ou JVM avulsa) sem consultar o cache"""
+        if self.pool is not None:
+            return self.pool.run(repo_path, file_path, method_name, start_line)
+
+        # Diretório privado por execução: métodos homônimos na mesma linha de
+        # arquivos diferentes nunca disputam o mesmo arquivo de saída
+        output_dir = private_output_dir("codeshovel-")
+        output_file = output_dir / "result.json"
+
         try:
             cmd = [
                 "java",
@@ -163,7 +381,7 @@ class CodeShovelAnalyzer:
                 "-startline",
                 str(start_line),
                 "-outfile",
-                f"temp_{method_name}_{start_line}.json",
+                str(output_file),
             ]
 
             logger.info(f"Executando: {' '.join(cmd)}")
@@ -174,45 +392,32 @@ class CodeShovelAnalyzer:
                 capture_output=True,
                 text=True,
                 cwd=os.getcwd(),
-                timeout=300,  # 5 minutos timeout
+                timeout=CODESHOVEL_TIMEOUT,
             )
 
             if result.returncode == 0:
-                # Ler arquivo de saída
-                output_file = f"temp_{method_name}_{start_line}.json"
-                if os.path.exists(output_file):
-                    try:
-                        with open(output_file, "r", encoding="utf-8") as f:
-                            content = f.read().strip()
-
-                        if not content:
-                            logger.warning(f"Arquivo de saída vazio: {output_file}")
-                            os.remove(output_file)
-                            return None
-
-                        try:
-                            data = json.loads(content)
-                            logger.debug(
-                                f"CodeShovel retornou dados válidos para {method_name}"
-                            )
-                        except json.JSONDecodeError as e:
-                            logger.warning(
-                                f"Erro ao fazer parse do JSON para {method_name}: {e}"
-                            )
-                            logger.debug(f"Conteúdo do arquivo: {content[:200]}...")
-                            os.remove(output_file)
-                            return None
-
-                        os.remove(output_file)
-                        return data
-
-                    except Exception as e:
-                        logger.error(f"Erro ao ler arquivo de saída {output_file}: {e}")
-                        if os.path.exists(output_file):
-                            os.remove(output_file)
-                        return None
-                else:
+                try:
+                    content = output_file.read_bytes()
+                except FileNotFoundError:
                     logger.warning(f"Arquivo de saída não encontrado: {output_file}")
+                    return None
+
+                if not content.strip():
+                    logger.warning(f"Saída vazia do CodeShovel para {method_name}")
+                    return None
+
+                try:
+                    data = json.loads(content)
+                    logger.debug(
+                        f"CodeShovel retornou dados válidos para {method_name}"
+                    )
+                    return data
+                except json.JSONDecodeError as e:
+                    logger.warning(
+                        f"Erro ao fazer parse do JSON para {method_name}: {e}"
+                    )
+                    logger.debug(f"Conteúdo da saída: {content[:200]!r}...")
+                    return None
             else:
                 logger.warning(f"CodeShovel falhou para {method_name}: {result.stderr}")
 
@@ -220,15 +425,21 @@ class CodeShovelAnalyzer:
             logger.warning(f"Timeout ao executar CodeShovel para {method_name}")
         except Exception as e:
             logger.error(f"Erro ao executar CodeShovel: {e}")
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
 
         return None
 
-    def analyze_fix_commits(self, codeshovel_data) -> Tuple[int, List[Dict]]:
+    def analyze_fix_commits(
+        self, codeshovel_data, commits: Optional[CommitTable] = None
+    ) -> Tuple[int, List[Dict]]:
         """
         Analisa commits de fix nos dados do CodeShovel
 
         Args:
             codeshovel_data: Dados retornados pelo CodeShovel
+            commits: Tabela de commits do repositório; cada SHA é
+                classificado uma única vez e o resultado é reutilizado
 
         Returns:
             (total_commits, fix_commits)
@@ -265,24 +476,278 @@ class CodeShovelAnalyzer:
 
             total_commits += 1
 
-            commit_message = commit_data.get("commitMessage", "").lower()
-            if any(
-                keyword in commit_message
-                for keyword in ["fix", "bug", "issue", "problem", "error"]
-            ):
+            commit_message = commit_data.get("commitMessage") or ""
+            if commits is not None:
+                is_fix = commits.is_fix(commit_sha, commit_message)
+            else:
+                is_fix = self.classifier.is_fix(commit_message)
+
+            if is_fix:
                 fix_commits.append(commit_data)
 
         return total_commits, fix_commits
 
-    def analyze_repository(self, repo_name: str) -> List[FixAnalysis]:
+    def _commit_table(self, repo_name: str) -> CommitTable:
+        """Tabela de commits do repositório, compartilhada por todos os seus métodos"""
+        with self._commit_tables_lock:
+            if repo_name not in self._commit_tables:
+                self._commit_tables[repo_name] = CommitTable(
+                    ClassificationCache(
+                        repo_name, self.classifier, self.classification_cache_dir
+                    )
+                )
+            return self._commit_tables[repo_name]
+
+    def _analyze_method(
+        self,
+        repo_name: str,
+        repo_path: Path,
+        relative_path: Path,
+        method_name: str,
+        start_line: int,
+        end_line: int,
+        checkpoint: Optional[RepositoryCheckpoint] = None,
+    ) -> Optional[FixAnalysis]:
         """
-        Analisa um repositório completo
+        Analisa um único método com o CodeShovel e o marca como concluído
+        no checkpoint
 
-        Args:
-            repo_name: Nome do repositório
+        Métodos cuja execução do CodeShovel falhou (timeout, erro ou saída
+        inválida) não são marcados, para serem analisados de novo na retomada.
 
         Returns:
-            Lista de análises de fix para cada método
+            Análise de fix do método ou None se não houver histórico
+        """
+        analysis, complete = self._run_method_analysis(
+            repo_name, repo_path, relative_path, method_name, start_line, end_line
+        )
+
+        if checkpoint is not None and complete:
+            checkpoint.mark_method_complete(
+                str(relative_path),
+                method_name,
+                start_line,
+                end_line,
+                self._to_checkpoint_info(analysis),
+                self._checkpoint_commits(analysis),
+            )
+
+        return self._publish(repo_name, analysis)
+
+    def _publish(self, repo_name: str, analysis: Optional[FixAnalysis]) -> Optional[FixAnalysis]:
+        """
+        Grava a análise de um método concluído nos formatos incrementais
+
+        No formato jsonl a linha gravada já contém os detalhes dos commits, e a
+        análise mantida em memória fica apenas com os valores usados nos
+        relatórios.
+        """
+        if analysis is None:
+            return None
+
+        if self.live_stats is not None:
+            self.live_stats.add(analysis)
+
+        if self.results_store is not None:
+            self.results_store.put_analysis(analysis)
+
+        writer = self._writers.get(repo_name)
+        if writer is not None:
+            writer.append(self._serialize_analysis(analysis))
+            return self._slim(analysis)
+
+        return analysis
+
+    @staticmethod
+    def _slim(analysis: FixAnalysis) -> FixAnalysis:
+        """Cópia da análise sem os dados do CodeShovel e as listas de commits"""
+        info = analysis.method_info
+        return FixAnalysis(
+            method_info=MethodInfo(
+                name=info.name,
+                file_path=info.file_path,
+                start_line=info.start_line,
+                end_line=info.end_line,
+                size_lines=info.size_lines,
+                repository=info.repository,
+                commit_count=info.commit_count,
+                fix_commit_count=info.fix_commit_count,
+                fix_ratio=info.fix_ratio,
+                codeshovel_data=None,
+            ),
+            fix_commits=[],
+            total_changes=[],
+        )
+
+    @staticmethod
+    def _to_checkpoint_info(
+        analysis: Optional[FixAnalysis],
+    ) -> Optional[CodeShovelMethodInfo]:
+        """
+        Converte uma análise para o formato de models.CodeShovelMethodInfo:
+        contagens e arestas (SHA, tipo) para os commits do método
+        """
+        if analysis is None:
+            return None
+        return CodeShovelMethodInfo(
+            commit_count=analysis.method_info.commit_count,
+            fix_commit_count=analysis.method_info.fix_commit_count,
+            fix_ratio=analysis.method_info.fix_ratio,
+            commits=[
+                list(edge) for edge in CommitTable.edges(analysis.method_info.codeshovel_data)
+            ],
+        )
+
+    @staticmethod
+    def _checkpoint_commits(analysis: Optional[FixAnalysis]) -> Dict[str, Dict]:
+        """Metadados dos commits da análise, por SHA, para o checkpoint"""
+        if analysis is None:
+            return {}
+        details = (analysis.method_info.codeshovel_data or {}).get("changeHistoryDetails") or {}
+        return {
+            sha: {field: data.get(field) for field in COMMIT_FIELDS}
+            for sha, data in details.items()
+            if isinstance(data, dict)
+        }
+
+    def _from_checkpoint(
+        self,
+        repo_name: str,
+        file_path: str,
+        method: Method,
+        checkpoint: RepositoryCheckpoint,
+    ) -> Optional[FixAnalysis]:
+        """
+        Reconstrói a análise de um método concluído em execução anterior, com
+        os metadados dos commits registrados no checkpoint
+
+        Os commits são classificados com as palavras-chave atuais, que podem
+        ser outras que as da execução anterior.
+        """
+        info = method.codeshovel_analysis
+        if info is None:
+            return None
+
+        recorded = checkpoint.commits
+        codeshovel_data = self._commit_table(repo_name).normalize(
+            {
+                "changeHistoryDetails": {
+                    sha: dict(recorded.get(sha, {}), type=change_type, commitName=sha)
+                    for sha, change_type in info.commits
+                }
+            }
+        )
+        total_commits, fix_commits = self.analyze_fix_commits(
+            codeshovel_data, self._commit_table(repo_name)
+        )
+
+        return FixAnalysis(
+            method_info=MethodInfo(
+                name=method.name,
+                file_path=file_path,
+                start_line=method.method_info.start_line,
+                end_line=method.method_info.end_line,
+                size_lines=method.method_info.size_lines,
+                repository=repo_name,
+                commit_count=total_commits,
+                fix_commit_count=len(fix_commits),
+                fix_ratio=len(fix_commits) / total_commits if total_commits else 0.0,
+                codeshovel_data=codeshovel_data,
+            ),
+            fix_commits=fix_commits,
+            total_changes=list(codeshovel_data["changeHistoryDetails"].values()),
+        )
+
+    def _run_method_analysis(
+        self,
+        repo_name: str,
+        repo_path: Path,
+        relative_path: Path,
+        method_name: str,
+        start_line: int,
+        end_line: int,
+    ) -> Tuple[Optional[FixAnalysis], bool]:
+        """
+        Executa o CodeShovel para o método e classifica seus commits
+
+        Returns:
+            (análise ou None, se o resultado é definitivo); falhas do
+            CodeShovel ou do processamento da saída não são definitivas
+        """
+        size_lines = end_line - start_line + 1
+
+        codeshovel_data = self._get_history(
+            repo_name, str(repo_path), str(relative_path), method_name, start_line
+        )
+
+        if not codeshovel_data:
+            return None, False
+
+        try:
+            # Metadados de commit compartilhados com os demais métodos do repositório
+            commits = self._commit_table(repo_name)
+            codeshovel_data = commits.normalize(codeshovel_data)
+            total_commits, fix_commits = self.analyze_fix_commits(codeshovel_data, commits)
+
+            if total_commits == 0:
+                logger.info(
+                    f"Método {method_name} ({size_lines} linhas): sem commits de fix"
+                )
+                return None, True
+
+            method_info = MethodInfo(
+                name=method_name,
+                file_path=str(relative_path),
+                start_line=start_line,
+                end_line=end_line,
+                size_lines=size_lines,
+                repository=repo_name,
+                commit_count=total_commits,
+                fix_commit_count=len(fix_commits),
+                fix_ratio=len(fix_commits) / total_commits,
+                codeshovel_data=codeshovel_data,
+            )
+
+            all_changes = []
+            if (
+                isinstance(codeshovel_data, dict)
+                and "changeHistoryDetails" in codeshovel_data
+            ):
+                all_changes = list(codeshovel_data["changeHistoryDetails"].values())
+
+            logger.info(
+                f"Método {method_name} ({size_lines} linhas): "
+                f"{len(fix_commits)}/{total_commits} commits de fix"
+            )
+
+            return (
+                FixAnalysis(
+                    method_info=method_info,
+                    fix_commits=fix_commits,
+                    total_changes=all_changes,
+                ),
+                True,
+            )
+        except Exception as e:
+            logger.error(
+                f"Erro ao processar dados do CodeShovel para {method_name}: {e}"
+            )
+            return None, False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Retorna o executor compartilhado pelas análises de métodos"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.jobs, thread_name_prefix="codeshovel-job"
+            )
+        return self._executor
+
+    def _submit_repository(self, repo_name: str) -> List[Future]:
+        """
+        Extrai os métodos de um repositório e agenda a análise de cada um
+
+        Returns:
+            Futures na ordem determinística de arquivos e métodos
         """
         repo_path = self.repositories_dir / repo_name
 
@@ -295,80 +760,163 @@ class CodeShovelAnalyzer:
         java_files = self.find_java_files(repo_path)
         logger.info(f"Encontrados {len(java_files)} arquivos Java")
 
-        analyses = []
+        checkpoint = RepositoryCheckpoint(self.results_dir, repo_name, resume=self.resume)
+        self._checkpoints[repo_name] = checkpoint
+        self._incomplete_repositories.discard(repo_name)
+        # Linhas de métodos registradas em outro HEAD não valem mais
+        checkpoint.update_head(
+            repo_path,
+            self._get_repo_state(str(repo_path))[0],
+            self.extraction_index,
+            self.extraction_workers,
+        )
 
-        for java_file in java_files:
+        if self.results_format == "jsonl":
+            # O arquivo parcial é refeito: métodos retomados do checkpoint são
+            # regravados antes dos novos
+            self._writers[repo_name] = JsonlResultsWriter(
+                self.results_dir / f"{repo_name}_fix_analysis.jsonl"
+            )
+
+        # Arquivos ainda sem checkpoint são extraídos em paralelo e registrados
+        # à medida que os resultados chegam
+        missing = [
+            java_file
+            for java_file in java_files
+            if checkpoint.get_file(str(java_file.relative_to(repo_path))) is None
+        ]
+        for java_file, methods in extract_methods_indexed(
+            repo_path, missing, self.extraction_index, self.extraction_workers
+        ):
+            if methods is None:
+                # Falha de leitura: o arquivo é extraído de novo na próxima execução
+                continue
             try:
-                methods = self.extract_methods_from_file(java_file)
+                checkpoint.register_file(str(java_file.relative_to(repo_path)), methods)
+            except Exception as e:
+                logger.error(f"Erro ao analisar {java_file}: {e}")
 
-                for method_name, start_line, end_line in methods:
-                    size_lines = end_line - start_line + 1
+        entries = []
+        for java_file in java_files:
+            relative_path = java_file.relative_to(repo_path)
+            file_state = checkpoint.get_file(str(relative_path))
+            if file_state is not None:
+                entries.append((relative_path, file_state))
+
+        pending = {}
+        for relative_path, file_state in entries:
+            methods = [
+                (m.name, m.method_info.start_line, m.method_info.end_line)
+                for m in file_state.methods
+                if not m.complete
+            ]
+            if methods:
+                pending[str(relative_path)] = methods
+        self._prepare_history(repo_name, repo_path, pending)
+
+        executor = self._get_executor()
+        futures = []
+        resumed = 0
+
+        for relative_path, file_state in entries:
+            for method in file_state.methods:
+                if method.complete:
+                    analysis = self._publish(
+                        repo_name,
+                        self._from_checkpoint(
+                            repo_name, str(relative_path), method, checkpoint
+                        ),
+                    )
+                    future = Future()
+                    future.set_result(analysis)
+                    futures.append(future)
+                    resumed += 1
+                    continue
 
-                    relative_path = java_file.relative_to(repo_path)
-                    codeshovel_data = self.run_codeshovel(
-                        str(repo_path), str(relative_path), method_name, start_line
+                futures.append(
+                    executor.submit(
+                        self._analyze_method,
+                        repo_name,
+                        repo_path,
+                        relative_path,
+                        method.name,
+                        method.method_info.start_line,
+                        method.method_info.end_line,
+                        checkpoint,
                     )
+                )
+
+        if resumed:
+            logger.info(f"Retomando {repo_name}: {resumed} métodos já concluídos")
 
-                    if codeshovel_data:
-                        try:
-                            total_commits, fix_commits = self.analyze_fix_commits(
-                                codeshovel_data
-                            )
-
-                            if total_commits > 0:
-                                method_info = MethodInfo(
-                                    name=method_name,
-                                    file_path=str(relative_path),
-                                    start_line=start_line,
-                                    end_line=end_line,
-                                    size_lines=size_lines,
-                                    repository=repo_name,
-                                    commit_count=total_commits,
-                                    fix_commit_count=len(fix_commits),
-                                    fix_ratio=len(fix_commits) / total_commits,
-                                    codeshovel_data=codeshovel_data,
-                                )
-
-                                all_changes = []
-                                if (
-                                    isinstance(codeshovel_data, dict)
-                                    and "changeHistoryDetails" in codeshovel_data
-                                ):
-                                    all_changes = list(
-                                        codeshovel_data["changeHistoryDetails"].values()
-                                    )
-
-                                analysis = FixAnalysis(
-                                    method_info=method_info,
-                                    fix_commits=fix_commits,
-                                    total_changes=all_changes,
-                                )
-
-                                analyses.append(analysis)
-
-                                logger.info(
-                                    f"Método {method_name} ({size_lines} linhas): "
-                                    f"{len(fix_commits)}/{total_commits} commits de fix"
-                                )
-                            else:
-                                logger.info(
-                                    f"Método {method_name} ({size_lines} linhas): sem commits de fix"
-                                )
-                        except Exception as e:
-                            logger.error(
-                                f"Erro ao processar dados do CodeShovel para {method_name}: {e}"
-                            )
-                            continue
+        return futures
+
+    def _finish_repository(self, repo_name: str) -> bool:
+        """
+        Consolida o checkpoint do repositório após coletar os resultados e
+        grava a tabela de commits antes de descartá-la
+
+        Returns:
+            Se todos os métodos do repositório foram concluídos; caso
+            contrário save_results() não publica os resultados
+        """
+        self._histories.pop(repo_name, None)
+        complete = True
+        checkpoint = self._checkpoints.pop(repo_name, None)
+        if checkpoint is not None:
+            checkpoint.finish()
+            checkpoint.close()
+            complete = checkpoint.complete
+        if not complete:
+            self._incomplete_repositories.add(repo_name)
+
+        commits = self._commit_tables.pop(repo_name, None)
+        if commits is not None:
+            # SQLite e formatos colunares gravam a própria tabela de commits
+            # (uma linha por SHA) junto com os métodos, em save_results
+            if (
+                complete
+                and self.results_store is None
+                and self.results_format not in columnar_results.COLUMNAR_EXTENSIONS
+            ):
+                self._save_commit_table(repo_name, commits)
+            commits.classifications.save()
+        return complete
 
+    def _collect(self, futures: List[Future]) -> List[FixAnalysis]:
+        """Coleta os resultados na mesma ordem em que foram agendados"""
+        analyses = []
+        for future in futures:
+            try:
+                analysis = future.result()
             except Exception as e:
-                logger.error(f"Erro ao analisar {java_file}: {e}")
+                logger.error(f"Erro ao analisar método: {e}")
                 continue
 
+            if analysis is not None:
+                analyses.append(analysis)
+
+        return analyses
+
+    def analyze_repository(self, repo_name: str) -> List[FixAnalysis]:
+        """
+        Analisa um repositório completo
+
+        Args:
+            repo_name: Nome do repositório
+
+        Returns:
+            Lista de análises de fix para cada método
+        """
+        analyses = self._collect(self._submit_repository(repo_name))
+        self._finish_repository(repo_name)
         return analyses
 
     def analyze_all_repositories(self) -> List[FixAnalysis]:
         """Analisa todos os repositórios disponíveis"""
         all_analyses = []
+        # Estatísticas da execução, acompanháveis durante a análise
+        self.live_stats = OnlineStatistics(self.results_dir / LIVE_STATS_FILE)
 
         repos = [
             d
@@ -380,251 +928,268 @@ class CodeShovelAnalyzer:
 
         logger.info(f"Encontrados {len(repos)} repositórios para análise")
 
+        # Cada repositório vira uma função que agenda (ou carrega) suas
+        # análises; só é chamada perto da coleta, para que os históricos
+        # pré-calculados não se acumulem em memória
+        pending: List[Tuple[Path, Callable[[], List[Future]]]] = []
+        # Repositórios reconstruídos de resultados salvos não são regravados
+        loaded = set()
         for repo in repos:
             try:
+                if RepositoryCheckpoint.is_pending(self.results_dir, repo.name):
+                    # Execução anterior interrompida ou com métodos que falharam:
+                    # resultados já gravados não são reaproveitados
+                    pending.append((repo, partial(self._submit_repository, repo.name)))
+                    continue
+
+                if self.results_store is not None:
+                    if self.results_store.is_complete(repo.name):
+                        saved = self.results_store.iter_methods(repo.name)
+                        pending.append((repo, partial(self._from_saved, repo.name, saved)))
+                        loaded.add(repo.name)
+                    else:
+                        pending.append((repo, partial(self._submit_repository, repo.name)))
+                    continue
+
+                if self.results_format == "jsonl":
+                    file_path = self.results_dir / f"{repo.name}_fix_analysis.jsonl"
+                    if file_path.is_file():
+                        pending.append((repo, partial(self._from_records, iter_jsonl(file_path))))
+                        loaded.add(repo.name)
+                    else:
+                        pending.append((repo, partial(self._submit_repository, repo.name)))
+                    continue
+
+                if self.results_format in columnar_results.COLUMNAR_EXTENSIONS:
+                    if columnar_results.has_repository(
+                        self.results_dir, repo.name, self.results_format
+                    ):
+                        saved = columnar_results.iter_methods(
+                            self.results_dir, repo.name, self.results_format
+                        )
+                        pending.append((repo, partial(self._from_saved, repo.name, saved)))
+                        loaded.add(repo.name)
+                    else:
+                        pending.append((repo, partial(self._submit_repository, repo.name)))
+                    continue
+
                 file_path = Path(self.results_dir / f"{repo.name}_fix_analysis.json")
 
                 if file_path.is_file():
-                    with file_path.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        all_analyses.extend(data)
+                    pending.append(
+                        (repo, partial(self._from_records, iter_json_array(file_path)))
+                    )
+                    loaded.add(repo.name)
                     continue
 
-                analyses = self.analyze_repository(repo.name)
+                pending.append((repo, partial(self._submit_repository, repo.name)))
+
+            except Exception as e:
+                logger.error(f"Erro ao analisar repositório {repo.name}: {e}")
+                continue
+
+        def start(index: int) -> Optional[List[Future]]:
+            """Agenda o repositório da posição index (None se falhar)"""
+            repo, submit = pending[index]
+            try:
+                return submit()
+            except Exception as e:
+                logger.error(f"Erro ao analisar repositório {repo.name}: {e}")
+                return None
+
+        # O repositório seguinte é extraído e agendado enquanto o atual é
+        # coletado, de modo que o fim de um se sobrepõe ao início do próximo,
+        # mas no máximo dois repositórios estão em memória ao mesmo tempo; os
+        # resultados são coletados em ordem.
+        next_futures = start(0) if pending else None
+        for index, (repo, _) in enumerate(pending):
+            futures = next_futures
+            next_futures = start(index + 1) if index + 1 < len(pending) else None
+            if futures is None:
+                continue
+
+            try:
+                analyses = self._collect(futures)
                 all_analyses.extend(analyses)
 
+                if repo.name in loaded:
+                    for analysis in analyses:
+                        self.live_stats.add(analysis)
+                    continue
+
+                self._finish_repository(repo.name)
                 self.save_results(repo.name, analyses)
 
             except Exception as e:
                 logger.error(f"Erro ao analisar repositório {repo.name}: {e}")
                 continue
+            finally:
+                self.live_stats.save()
 
         return all_analyses
 
+    def _from_saved(
+        self, repo_name: str, saved: Iterable[Tuple[Dict, List[Dict], Set[str]]]
+    ) -> List[Future]:
+        """
+        Reconstrói as análises de um repositório concluído a partir dos
+        resultados gravados (banco SQLite ou tabelas colunares)
+        """
+        futures = []
+        for method, changes, fix_shas in saved:
+            analysis = FixAnalysis(
+                method_info=MethodInfo(
+                    name=method["name"],
+                    file_path=method["file_path"],
+                    start_line=method["start_line"],
+                    end_line=method["end_line"],
+                    size_lines=method["size_lines"],
+                    repository=repo_name,
+                    commit_count=method["commit_count"],
+                    fix_commit_count=method["fix_commit_count"],
+                    fix_ratio=method["fix_ratio"],
+                    codeshovel_data={
+                        "changeHistoryDetails": {c["commitName"]: c for c in changes}
+                    },
+                ),
+                fix_commits=[c for c in changes if c["commitName"] in fix_shas],
+                total_changes=changes,
+            )
+            future = Future()
+            future.set_result(analysis)
+            futures.append(future)
+
+        logger.info(f"{repo_name}: {len(futures)} métodos carregados dos resultados salvos")
+        return futures
+
+    def _from_records(self, records: Iterable[Dict]) -> List[Future]:
+        """Reconstrói as análises (sem detalhes de commits) a partir de registros salvos"""
+        futures = []
+        for record in records:
+            info = record["method_info"]
+            future = Future()
+            future.set_result(
+                FixAnalysis(
+                    method_info=MethodInfo(
+                        name=info["name"],
+                        file_path=info["file_path"],
+                        start_line=info["start_line"],
+                        end_line=info["end_line"],
+                        size_lines=info["size_lines"],
+                        repository=info["repository"],
+                        commit_count=info["commit_count"],
+                        fix_commit_count=record["fix_commit_count"],
+                        fix_ratio=info["fix_ratio"],
+                        codeshovel_data=None,
+                    ),
+                    fix_commits=[],
+                    total_changes=[],
+                )
+            )
+            futures.append(future)
+        return futures
+
+    @staticmethod
+    def _serialize_analysis(analysis: FixAnalysis) -> Dict:
+        """Registro de um método no formato dos arquivos de resultados"""
+        return {
+            "method_info": {
+                "name": analysis.method_info.name,
+                "file_path": analysis.method_info.file_path,
+                "start_line": analysis.method_info.start_line,
+                "end_line": analysis.method_info.end_line,
+                "size_lines": analysis.method_info.size_lines,
+                "repository": analysis.method_info.repository,
+                "commit_count": analysis.method_info.commit_count,
+                "fix_ratio": analysis.method_info.fix_ratio,
+            },
+            # Metadados dos commits ficam em <repo>_commits.json
+            "commits": CommitTable.edges(analysis.method_info.codeshovel_data),
+            "fix_commit_count": analysis.method_info.fix_commit_count,
+            "total_changes_count": len(analysis.total_changes),
+        }
+
     def save_results(self, repo_name: str, analyses: List[FixAnalysis]):
         """Salva resultados da análise"""
+        writer = self._writers.pop(repo_name, None)
+        if repo_name in self._incomplete_repositories:
+            # Os métodos pendentes são retomados do checkpoint na próxima execução
+            if writer is not None:
+                writer.close()
+            logger.warning(
+                f"{repo_name}: métodos não concluídos no checkpoint; "
+                "resultados não publicados"
+            )
+            return
+
+        if writer is not None:
+            # Os métodos já foram gravados à medida que terminaram
+            writer.finish()
+            logger.info(f"Resultados salvos em: {writer.path}")
+            return
+
+        if self.results_store is not None:
+            # Os métodos já foram gravados à medida que terminaram
+            self.results_store.mark_complete(repo_name)
+            logger.info(f"Resultados salvos em: {self.results_store.db_path}")
+            return
+
+        if self.results_format in columnar_results.COLUMNAR_EXTENSIONS:
+            columnar_results.write_repository(
+                self.results_dir, repo_name, analyses, self.results_format
+            )
+            logger.info(
+                "Resultados salvos em: "
+                f"{columnar_results.results_path(self.results_dir, repo_name, 'methods', self.results_format)}"
+            )
+            return
+
         results_file = self.results_dir / f"{repo_name}_fix_analysis.json"
 
-        serializable_analyses = []
-        for analysis in analyses:
-            serializable_analysis = {
-                "method_info": {
-                    "name": analysis.method_info.name,
-                    "file_path": analysis.method_info.file_path,
-                    "start_line": analysis.method_info.start_line,
-                    "end_line": analysis.method_info.end_line,
-                    "size_lines": analysis.method_info.size_lines,
-                    "repository": analysis.method_info.repository,
-                    "commit_count": analysis.method_info.commit_count,
-                    "fix_ratio": analysis.method_info.fix_ratio,
-                    "codeshovel_data": analysis.method_info.codeshovel_data,
-                },
-                "fix_commit_count": len(analysis.fix_commits),
-                "total_changes_count": len(analysis.total_changes),
-            }
-            serializable_analyses.append(serializable_analysis)
+        serializable_analyses = [self._serialize_analysis(a) for a in analyses]
 
         with open(results_file, "w", encoding="utf-8") as f:
             json.dump(serializable_analyses, f, indent=2, ensure_ascii=False)
 
         logger.info(f"Resultados salvos em: {results_file}")
 
+    def _save_commit_table(self, repo_name: str, commits: CommitTable):
+        """Grava a tabela de commits referenciada pelos registros dos métodos"""
+        commits.save(self.results_dir / f"{repo_name}_commits.json")
+        logger.info(f"{repo_name}: {len(commits)} commits distintos")
+
+    def analysis_frame(self, analyses: List[FixAnalysis]) -> pd.DataFrame:
+        """
+        DataFrame de análise (com as colunas derivadas) da lista de análises
+
+        É construído uma única vez por lista e reutilizado pelas estatísticas,
+        visualizações e relatório.
+        """
+        cached = self._frame_cache
+        if cached is None or cached[0] is not analyses or cached[1] != len(analyses):
+            cached = (analyses, len(analyses), frame_from_analyses(analyses))
+            self._frame_cache = cached
+        return cached[2]
+
     def generate_statistics(self, analyses: List[FixAnalysis]) -> Dict:
         """Gera estatísticas gerais da análise"""
         if not analyses:
             return {}
-
-        data = []
-        for analysis in analyses:
-            data.append(
-                {
-                    "method_name": analysis.method_info.name,
-                    "repository": analysis.method_info.repository,
-                    "size_lines": analysis.method_info.size_lines,
-                    "commit_count": analysis.method_info.commit_count,
-                    "fix_commit_count": analysis.method_info.fix_commit_count,
-                    "fix_ratio": analysis.method_info.fix_ratio,
-                }
-            )
-
-        df = pd.DataFrame(data)
-
-        stats = {
-            "total_methods": len(df),
-            "total_repositories": df["repository"].nunique(),
-            "avg_method_size": df["size_lines"].mean(),
-            "median_method_size": df["size_lines"].median(),
-            "avg_fix_ratio": df["fix_ratio"].mean(),
-            "methods_with_fixes": len(df[df["fix_commit_count"] > 0]),
-            "size_categories": {
-                "small": len(df[df["size_lines"] <= 10]),
-                "medium": len(df[(df["size_lines"] > 10) & (df["size_lines"] <= 50)]),
-                "large": len(df[df["size_lines"] > 50]),
-            },
-        }
-
-        # Análise por categoria de tamanho
-        for category, mask in [
-            ("small", df["size_lines"] <= 10),
-            ("medium", (df["size_lines"] > 10) & (df["size_lines"] <= 50)),
-            ("large", df["size_lines"] > 50),
-        ]:
-            if mask.sum() > 0:
-                category_df = df[mask]
-                stats[f"{category}_avg_fix_ratio"] = category_df["fix_ratio"].mean()
-                stats[f"{category}_methods_count"] = len(category_df)
-
-        return stats
+        return self.generate_statistics_from_df(self.analysis_frame(analyses))
 
     def create_visualizations(self, analyses: List[FixAnalysis]):
         """Cria visualizações dos resultados"""
         if not analyses:
             logger.warning("Nenhuma análise para visualizar")
             return
-
-        # Converter para DataFrame
-        data = []
-        for analysis in analyses:
-            data.append(
-                {
-                    "method_name": analysis.method_info.name,
-                    "repository": analysis.method_info.repository,
-                    "size_lines": analysis.method_info.size_lines,
-                    "commit_count": analysis.method_info.commit_count,
-                    "fix_commit_count": analysis.method_info.fix_commit_count,
-                    "fix_ratio": analysis.method_info.fix_ratio,
-                }
-            )
-
-        df = pd.DataFrame(data)
-
-        # Configurar estilo
-        plt.style.use("seaborn-v0_8")
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-        fig.suptitle(
-            "Análise de Relação entre Tamanho de Métodos e Commits de Fix", fontsize=16
-        )
-
-        axes[0, 0].scatter(df["size_lines"], df["fix_ratio"], alpha=0.6)
-        axes[0, 0].set_xlabel("Tamanho do Método (linhas)")
-        axes[0, 0].set_ylabel("Proporção de Commits de Fix")
-        axes[0, 0].set_title("Tamanho vs Fix Ratio")
-        axes[0, 0].grid(True, alpha=0.3)
-
-        size_categories = pd.cut(
-            df["size_lines"],
-            bins=[0, 10, 50, float("inf")],
-            labels=["Pequeno (≤10)", "Médio (11-50)", "Grande (>50)"],
-        )
-        df["size_category"] = size_categories
-
-        df.boxplot(column="fix_ratio", by="size_category", ax=axes[0, 1])
-        axes[0, 1].set_title("Fix Ratio por Categoria de Tamanho")
-        axes[0, 1].set_xlabel("Categoria de Tamanho")
-        axes[0, 1].set_ylabel("Fix Ratio")
-
-        axes[1, 0].hist(df["size_lines"], bins=30, alpha=0.7, edgecolor="black")
-        axes[1, 0].set_xlabel("Tamanho do Método (linhas)")
-        axes[1, 0].set_ylabel("Frequência")
-        axes[1, 0].set_title("Distribuição de Tamanhos de Métodos")
-        axes[1, 0].grid(True, alpha=0.3)
-
-        repo_stats = (
-            df.groupby("repository")["fix_ratio"].mean().sort_values(ascending=False)
-        )
-        repo_stats.plot(kind="bar", ax=axes[1, 1])
-        axes[1, 1].set_title("Fix Ratio Médio por Repositório")
-        axes[1, 1].set_xlabel("Repositório")
-        axes[1, 1].set_ylabel("Fix Ratio Médio")
-        axes[1, 1].tick_params(axis="x", rotation=45)
-
-        plt.tight_layout()
-
-        output_file = self.results_dir / "fix_analysis_visualization.png"
-        plt.savefig(output_file, dpi=300, bbox_inches="tight")
-        logger.info(f"Visualização salva em: {output_file}")
-
-        plt.show()
+        self.create_visualizations_from_df(self.analysis_frame(analyses))
 
     def generate_report(self, analyses: List[FixAnalysis]):
         """Gera relatório completo da análise"""
         if not analyses:
             logger.warning("Nenhuma análise para relatório")
             return
-
-        # Gerar estatísticas
-        stats = self.generate_statistics(analyses)
-
-        # Criar relatório
-        report = f"""
-        # Relatório de Análise de Fix vs Tamanho de Métodos
-
-        ## Resumo Executivo
-        - **Total de métodos analisados**: {stats.get("total_methods", 0)}
-        - **Total de repositórios**: {stats.get("total_repositories", 0)}
-        - **Métodos com commits de fix**: {stats.get("methods_with_fixes", 0)}
-        - **Tamanho médio dos métodos**: {stats.get("avg_method_size", 0):.1f} linhas
-        - **Proporção média de fix**: {stats.get("avg_fix_ratio", 0):.2%}
-
-        ## Análise por Categoria de Tamanho
-
-        ### Métodos Pequenos (≤10 linhas)
-        - **Quantidade**: {stats.get("size_categories", {}).get("small", 0)}
-        - **Fix ratio médio**: {stats.get("small_avg_fix_ratio", 0):.2%}
-
-        ### Métodos Médios (11-50 linhas)
-        - **Quantidade**: {stats.get("size_categories", {}).get("medium", 0)}
-        - **Fix ratio médio**: {stats.get("medium_avg_fix_ratio", 0):.2%}
-
-        ### Métodos Grandes (>50 linhas)
-        - **Quantidade**: {stats.get("size_categories", {}).get("large", 0)}
-        - **Fix ratio médio**: {stats.get("large_avg_fix_ratio", 0):.2%}
-
-        ## Top 10 Métodos com Maior Fix Ratio
-        """
-
-        data = []
-        for analysis in analyses:
-            data.append(
-                {
-                    "method_name": analysis.method_info.name,
-                    "repository": analysis.method_info.repository,
-                    "size_lines": analysis.method_info.size_lines,
-                    "fix_ratio": analysis.method_info.fix_ratio,
-                    "fix_commit_count": analysis.method_info.fix_commit_count,
-                }
-            )
-
-        df = pd.DataFrame(data)
-        top_fix_methods = df.nlargest(10, "fix_ratio")
-
-        for _, row in top_fix_methods.iterrows():
-            report += f"- **{row['method_name']}** ({row['repository']}): {row['fix_ratio']:.2%} ({row['fix_commit_count']} fixes, {row['size_lines']} linhas)\n"
-
-        report += f"""
-        ## Conclusões
-        Esta análise revela a relação entre o tamanho dos métodos e a frequência de commits de fix.
-        Os resultados podem ajudar a entender se métodos maiores tendem a ter mais bugs ou se
-        métodos menores são mais propensos a mudanças.
-
-        ## Metodologia
-        - Utilizou-se o CodeShovel para análise de histórico de métodos
-        - Commits de fix foram identificados por palavras-chave: fix, bug, issue, problem, error
-        - Métodos foram categorizados por tamanho: pequeno (≤10), médio (11-50), grande (>50)
-        - Análise focou em repositórios Java de código aberto
-
-        ---
-        *Relatório gerado automaticamente pelo CodeShovel Fix Analysis Tool*
-        """
-
-        # Salvar relatório
-        report_file = self.results_dir / "fix_analysis_report.md"
-        with open(report_file, "w", encoding="utf-8") as f:
-            f.write(report)
-
-        logger.info(f"Relatório salvo em: {report_file}")
-
-        return report
+        return self.generate_report_from_df(self.analysis_frame(analyses))
 
     def create_visualizations_from_df(self, df: pd.DataFrame):
         """Cria visualizações dos resultados"""
@@ -632,6 +1197,8 @@ class CodeShovelAnalyzer:
             logger.warning("DataFrame vazio")
             return
 
+        add_derived_columns(df)
+
         # Configurar estilo
         plt.style.use("seaborn-v0_8")
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
@@ -645,14 +1212,15 @@ class CodeShovelAnalyzer:
         axes[0, 0].set_title("Tamanho vs Fix Ratio")
         axes[0, 0].grid(True, alpha=0.3)
 
-        size_categories = pd.cut(
-            df["size_lines"],
-            bins=[0, 10, 50, float("inf")],
-            labels=["Pequeno (≤10)", "Médio (11-50)", "Grande (>50)"],
+        by_size = pd.DataFrame(
+            {
+                "fix_ratio": df["fix_ratio"],
+                "size_category": df["size_category"].cat.rename_categories(
+                    SIZE_CATEGORY_LABELS
+                ),
+            }
         )
-        df["size_category"] = size_categories
-
-        df.boxplot(column="fix_ratio", by="size_category", ax=axes[0, 1])
+        by_size.boxplot(column="fix_ratio", by="size_category", ax=axes[0, 1])
         axes[0, 1].set_title("Fix Ratio por Categoria de Tamanho")
         axes[0, 1].set_xlabel("Categoria de Tamanho")
         axes[0, 1].set_ylabel("Fix Ratio")
@@ -663,10 +1231,7 @@ class CodeShovelAnalyzer:
         axes[1, 0].set_title("Distribuição de Tamanhos de Métodos")
         axes[1, 0].grid(True, alpha=0.3)
 
-        repo_stats = (
-            df.groupby("repository")["fix_ratio"].mean().sort_values(ascending=False)
-        )
-        repo_stats.plot(kind="bar", ax=axes[1, 1])
+        repository_fix_ratios(df).plot(kind="bar", ax=axes[1, 1])
         axes[1, 1].set_title("Fix Ratio Médio por Repositório")
         axes[1, 1].set_xlabel("Repositório")
         axes[1, 1].set_ylabel("Fix Ratio Médio")
@@ -686,41 +1251,48 @@ class CodeShovelAnalyzer:
             logger.warning("DataFrame vazio")
             return {}
 
+        add_derived_columns(df)
+
+        # Todas as categorias de config.METHOD_SIZE_CATEGORIES em um groupby
+        by_size = size_category_stats(df)
+
         stats = {
             "total_methods": len(df),
             "total_repositories": df["repository"].nunique(),
             "avg_method_size": df["size_lines"].mean(),
             "median_method_size": df["size_lines"].median(),
             "avg_fix_ratio": df["fix_ratio"].mean(),
-            "methods_with_fixes": len(df[df["fix_commit_count"] > 0]),
+            "methods_with_fixes": int(df["has_fix"].sum()),
             "size_categories": {
-                "small": len(df[df["size_lines"] <= 10]),
-                "medium": len(df[(df["size_lines"] > 10) & (df["size_lines"] <= 50)]),
-                "large": len(df[df["size_lines"] > 50]),
+                category: int(count) for category, count in by_size["methods_count"].items()
             },
         }
 
         # Análise por categoria de tamanho
-        for category, mask in [
-            ("small", df["size_lines"] <= 10),
-            ("medium", (df["size_lines"] > 10) & (df["size_lines"] <= 50)),
-            ("large", df["size_lines"] > 50),
-        ]:
-            if mask.sum() > 0:
-                category_df = df[mask]
-                stats[f"{category}_avg_fix_ratio"] = category_df["fix_ratio"].mean()
-                stats[f"{category}_methods_count"] = len(category_df)
+        for category, row in by_size[by_size["methods_count"] > 0].iterrows():
+            stats[f"{category}_avg_fix_ratio"] = row["avg_fix_ratio"]
+            stats[f"{category}_median_fix_ratio"] = row["median_fix_ratio"]
+            stats[f"{category}_median_size"] = row["median_size"]
+            stats[f"{category}_methods_count"] = int(row["methods_count"])
+            stats[f"{category}_methods_with_fixes"] = int(row["methods_with_fixes"])
 
         return stats
 
-    def generate_report_from_df(self, df: pd.DataFrame):
-        """Gera relatório completo da análise"""
+    def generate_report_from_df(self, df: pd.DataFrame, stats: Optional[Dict] = None):
+        """
+        Gera relatório completo da análise
+
+        Args:
+            df: DataFrame de análise
+            stats: Estatísticas já calculadas para o mesmo DataFrame (None
+                calcula)
+        """
         if df.empty:
             logger.warning("DataFrame vazio")
             return
 
-        # Gerar estatísticas
-        stats = self.generate_statistics_from_df(df)
+        if stats is None:
+            stats = self.generate_statistics_from_df(df)
 
         # Criar relatório
         report = f"""
@@ -734,19 +1306,18 @@ class CodeShovelAnalyzer:
         - **Proporção média de fix**: {stats.get("avg_fix_ratio", 0):.2%}
 
         ## Análise por Categoria de Tamanho
+        """
 
-        ### Métodos Pequenos (≤10 linhas)
-        - **Quantidade**: {stats.get("size_categories", {}).get("small", 0)}
-        - **Fix ratio médio**: {stats.get("small_avg_fix_ratio", 0):.2%}
-
-        ### Métodos Médios (11-50 linhas)
-        - **Quantidade**: {stats.get("size_categories", {}).get("medium", 0)}
-        - **Fix ratio médio**: {stats.get("medium_avg_fix_ratio", 0):.2%}
-
-        ### Métodos Grandes (>50 linhas)
-        - **Quantidade**: {stats.get("size_categories", {}).get("large", 0)}
-        - **Fix ratio médio**: {stats.get("large_avg_fix_ratio", 0):.2%}
+        for category in SIZE_CATEGORY_NAMES:
+            title = SIZE_CATEGORY_TITLES.get(category, category)
+            report += f"""
+        ### {title}: {SIZE_CATEGORY_RANGES[category]} linhas
+        - **Quantidade**: {stats.get("size_categories", {}).get(category, 0)}
+        - **Fix ratio médio**: {stats.get(f"{category}_avg_fix_ratio", 0):.2%}
+        - **Fix ratio mediano**: {stats.get(f"{category}_median_fix_ratio", 0):.2%}
+        """
 
+        report += """
         ## Top 10 Métodos com Maior Fix Ratio
         """
 
@@ -763,8 +1334,8 @@ class CodeShovelAnalyzer:
 
         ## Metodologia
         - Utilizou-se o CodeShovel para análise de histórico de métodos
-        - Commits de fix foram identificados por palavras-chave: fix, bug, issue, problem, error
-        - Métodos foram categorizados por tamanho: pequeno (≤10), médio (11-50), grande (>50)
+        - Commits de fix foram identificados por palavras-chave: {", ".join(self.classifier.keywords)}
+        - Métodos foram categorizados por tamanho: {", ".join(label.lower() for label in SIZE_CATEGORY_LABELS.values())}
         - Análise focou em repositórios Java de código aberto
 
         ---
@@ -780,50 +1351,100 @@ class CodeShovelAnalyzer:
 
         return report
 
-    def load_results(self) -> List[Dict]:
-        all_results = []
-        for file in self.results_dir.glob("*_fix_analysis.json"):
-            try:
-                with open(file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    all_results.extend(data)
-                logger.info(f"Carregado: {file}")
-            except Exception as e:
-                logger.warning(f"Erro ao carregar {file}: {e}")
-        return all_results
+    def generate_outputs_from_df(self, df: pd.DataFrame) -> Dict:
+        """
+        Gera estatísticas, visualizações e relatório a partir do mesmo
+        DataFrame de análise
+
+        Returns:
+            Estatísticas
+        """
+        add_derived_columns(df)
+        stats = self.generate_statistics_from_df(df)
+        logger.info(f"Estatísticas: {stats}")
+        self.create_visualizations_from_df(df)
+        self.generate_report_from_df(df, stats)
+        return stats
 
     def generate_from_saved_results(self):
-        analyses = self.load_results()
+        if self.results_store is not None:
+            df = self.results_store.load_frame()
+        elif self.results_format in columnar_results.COLUMNAR_EXTENSIONS:
+            df = columnar_results.load_methods_frame(self.results_dir, self.results_format)
+        else:
+            # Registros lidos um a um, mantendo apenas as colunas do relatório
+            pattern = (
+                "*_fix_analysis.jsonl"
+                if self.results_format == "jsonl"
+                else "*_fix_analysis.json"
+            )
+            df = pd.DataFrame.from_records(
+                iter_projected_results(self.results_dir, pattern),
+                columns=REPORT_COLUMNS,
+            )
 
-        if not analyses:
+        if df.empty:
             logger.warning("Nenhum resultado encontrado na pasta")
             return
 
-        df = pd.DataFrame(
-            [
-                {
-                    "method_name": item["method_info"]["name"],
-                    "repository": item["method_info"]["repository"],
-                    "size_lines": item["method_info"]["size_lines"],
-                    "commit_count": item["method_info"]["commit_count"],
-                    "fix_commit_count": item["fix_commit_count"],
-                    "fix_ratio": item["method_info"]["fix_ratio"],
-                }
-                for item in analyses
-            ]
-        )
+        self.generate_outputs_from_df(df)
 
-        self.create_visualizations_from_df(df)
-        self.generate_report_from_df(df)
-        stats = self.generate_statistics_from_df(df)
-        logger.info(f"Estatísticas: {stats}")
+    def reclassify_saved_results(self):
+        """
+        Reclassifica os resultados gravados com o classificador atual e
+        regenera estatísticas, visualizações e relatório, sem minerar o
+        histórico de novo
+        """
+        logger.info(f"Reclassificando com as palavras-chave: {', '.join(self.classifier.keywords)}")
+
+        if self.results_store is not None:
+            fix_commits = self.results_store.reclassify(self.classifier)
+            logger.info(f"{fix_commits} commits de fix em {self.results_store.db_path}")
+            df = self.results_store.load_frame()
+        elif self.results_format in columnar_results.COLUMNAR_EXTENSIONS:
+            extension = columnar_results.COLUMNAR_EXTENSIONS[self.results_format]
+            suffix = f"_methods.{extension}"
+            for path in sorted(self.results_dir.glob(f"*{suffix}")):
+                repo_name = path.name[: -len(suffix)]
+                count = columnar_results.reclassify_repository(
+                    self.results_dir, repo_name, self.results_format, self.classifier
+                )
+                logger.info(f"Reclassificado: {path} ({count} métodos)")
+            df = columnar_results.load_methods_frame(self.results_dir, self.results_format)
+        else:
+            # Uma passada por arquivo: reclassifica, regrava e projeta as colunas
+            pattern = (
+                "*_fix_analysis.jsonl"
+                if self.results_format == "jsonl"
+                else "*_fix_analysis.json"
+            )
+            df = pd.DataFrame.from_records(
+                iter_reclassified_results(self.results_dir, self.classifier, pattern),
+                columns=REPORT_COLUMNS,
+            )
+
+        if df.empty:
+            logger.warning("Nenhum resultado encontrado na pasta")
+            return
+
+        self.generate_outputs_from_df(df)
 
 
 def main():
     """Função principal"""
     parser = argparse.ArgumentParser(description="CodeShovel Fix Analysis Tool")
     parser.add_argument(
-        "--codeshovel-jar", required=True, help="Caminho para o JAR do CodeShovel"
+        "command",
+        nargs="?",
+        choices=["analyze", "reclassify"],
+        default="analyze",
+        help="analyze (padrão) minera o histórico e analisa os métodos; reclassify "
+        "reclassifica os resultados gravados com as palavras-chave atuais, sem "
+        "executar o CodeShovel",
+    )
+    parser.add_argument(
+        "--codeshovel-jar",
+        help="Caminho para o JAR do CodeShovel (obrigatório, exceto em reclassify)",
     )
     parser.add_argument(
         "--repositories-dir",
@@ -842,11 +1463,111 @@ def main():
         default=50,
         help="Limite de métodos por repositório (padrão: 50)",
     )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=CODESHOVEL_POOL_SIZE,
+        help="Número de workers persistentes do CodeShovel (padrão: 0, uma JVM por método)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="Número de métodos analisados em paralelo (padrão: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Não usa o cache de resultados do CodeShovel, o índice de extração "
+        "nem o memo de classificação de commits",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignora o cache existente e minera o histórico novamente",
+    )
+    parser.add_argument(
+        "--analysis-mode",
+        choices=ANALYSIS_MODES,
+        default=DEFAULT_ANALYSIS_MODE,
+        help="Backend de histórico: codeshovel (padrão), bulk (uma passada por repositório) "
+        "ou blame (um git blame por arquivo, aproximado)",
+    )
+    parser.add_argument(
+        "--min-file-commits",
+        type=int,
+        default=MIN_FILE_COMMITS,
+        help="Métodos de arquivos com menos commits que isso não passam pelo "
+        "CodeShovel (padrão: 2, só arquivos de um commit; 0 desativa)",
+    )
+    parser.add_argument(
+        "--extraction-workers",
+        type=int,
+        default=EXTRACTION_WORKERS,
+        help="Processos usados na extração de métodos (padrão: 0, número de CPUs)",
+    )
+    parser.add_argument(
+        "--results-format",
+        choices=RESULTS_FORMATS,
+        default=DEFAULT_RESULTS_FORMAT,
+        help="Armazenamento dos resultados: json (um arquivo por repositório, padrão), "
+        "jsonl (uma linha por método, gravada assim que o método termina), "
+        "sqlite (banco único com índices, gravado à medida que os métodos terminam), "
+        "parquet ou arrow (tabelas colunares de métodos e commits, requer pyarrow)",
+    )
+    parser.add_argument(
+        "--fix-keywords",
+        help="Palavras-chave de commits de fix separadas por vírgula "
+        "(padrão: FIX_KEYWORDS do config.py)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Descarta checkpoints de execuções interrompidas e recomeça do zero",
+    )
 
     args = parser.parse_args()
+    if args.command == "analyze" and not args.codeshovel_jar:
+        parser.error("o argumento --codeshovel-jar é obrigatório")
+
+    fix_keywords = None
+    if args.fix_keywords:
+        fix_keywords = [k for k in args.fix_keywords.split(",") if k.strip()]
 
+    analyzer = None
     try:
-        analyzer = CodeShovelAnalyzer(args.codeshovel_jar, args.repositories_dir)
+        if args.command == "reclassify":
+            # Só os resultados gravados são lidos: sem caches nem CodeShovel
+            analyzer = CodeShovelAnalyzer(
+                None,
+                args.repositories_dir,
+                cache_path=None,
+                analysis_mode=args.analysis_mode,
+                min_file_commits=args.min_file_commits,
+                extraction_index_path=None,
+                results_format=args.results_format,
+                classification_cache_dir=None,
+                fix_keywords=fix_keywords,
+            )
+            analyzer.reclassify_saved_results()
+            return
+
+        analyzer = CodeShovelAnalyzer(
+            args.codeshovel_jar,
+            args.repositories_dir,
+            pool_size=args.pool_size,
+            jobs=args.jobs,
+            cache_path=None if args.no_cache else CODESHOVEL_CACHE_PATH,
+            refresh_cache=args.refresh,
+            resume=not args.no_resume,
+            analysis_mode=args.analysis_mode,
+            min_file_commits=args.min_file_commits,
+            extraction_workers=args.extraction_workers,
+            extraction_index_path=None if args.no_cache else EXTRACTION_INDEX_PATH,
+            results_format=args.results_format,
+            classification_cache_dir=None if args.no_cache else CLASSIFICATION_CACHE_DIR,
+            fix_keywords=fix_keywords,
+        )
 
         logger.info("Iniciando análise de repositórios...")
 
@@ -855,12 +1576,8 @@ def main():
         if analyses:
             logger.info(f"Análise concluída! {len(analyses)} métodos analisados.")
 
-            stats = analyzer.generate_statistics(analyses)
-            logger.info(f"Estatísticas: {stats}")
-
-            analyzer.create_visualizations(analyses)
-
-            analyzer.generate_report(analyses)
+            # Um único DataFrame para estatísticas, visualizações e relatório
+            analyzer.generate_outputs_from_df(analyzer.analysis_frame(analyses))
 
             logger.info(
                 "Análise completa! Verifique os arquivos na pasta 'fix_analysis_results'"
@@ -873,6 +1590,9 @@ def main():
     except Exception as e:
         logger.error(f"Erro durante a execução: {e}")
         raise
+    finally:
+        if analyzer is not None:
+            analyzer.close()
 
 
 if __name__ == "__main__":
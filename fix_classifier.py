@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Classificação de mensagens de commit como fix
+
+As palavras-chave (config.FIX_KEYWORDS por padrão) são compiladas uma única
+vez em uma expressão regular com alternância, sem diferenciar maiúsculas de
+minúsculas. Cada palavra-chave precisa começar uma palavra da mensagem:
+"fixed", "bugs" e "errors" contam, mas "prefix" e "debugger" só contam se
+"debug" estiver entre as palavras-chave.
+
+Além da classificação de uma mensagem, há uma API em lote que classifica um
+array ou Series inteiro de mensagens de uma vez (usada na reclassificação de
+resultados gravados, sem reexecutar o CodeShovel).
+"""
+
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config import get_fix_keywords
+
+# (é fix, palavras-chave encontradas na mensagem)
+Classification = Tuple[bool, List[str]]
+
+
+class FixClassifier:
+    """Palavras-chave de fix compiladas em uma única expressão regular"""
+
+    def __init__(self, keywords: Optional[Sequence[str]] = None):
+        """
+        Args:
+            keywords: Palavras-chave de fix (None usa config.FIX_KEYWORDS)
+        """
+        if keywords is None:
+            keywords = get_fix_keywords()
+        self.keywords = sorted({k.strip().lower() for k in keywords if k.strip()})
+        if not self.keywords:
+            raise ValueError("Nenhuma palavra-chave de fix configurada")
+
+        # Mais longas primeiro: "bugfix" vence "bug" na mesma posição
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(k) for k in alternatives) + ")",
+            re.IGNORECASE,
+        )
+
+    def is_fix(self, message: Optional[str]) -> bool:
+        """Indica se a mensagem contém alguma palavra-chave de fix"""
+        return bool(message) and self.pattern.search(message) is not None
+
+    def classify(self, message: Optional[str]) -> Classification:
+        """(é fix, palavras-chave encontradas em ordem alfabética)"""
+        if not message:
+            return False, []
+        matched = sorted({m.group(0).lower() for m in self.pattern.finditer(message)})
+        return bool(matched), matched
+
+    def is_fix_many(self, messages: Iterable[Optional[str]]) -> pd.Series:
+        """
+        Classifica um lote de mensagens de uma vez
+
+        Args:
+            messages: Array, lista ou Series de mensagens (None conta como
+                não fix)
+
+        Returns:
+            Series booleana (com o mesmo índice, se a entrada for uma Series)
+        """
+        if not isinstance(messages, pd.Series):
+            messages = pd.Series(list(messages), dtype=object)
+        return messages.str.contains(self.pattern, na=False).astype(bool)
+
+    def classify_many(self, messages: Iterable[Optional[str]]) -> pd.DataFrame:
+        """
+        Classifica um lote de mensagens com as palavras-chave encontradas
+
+        Returns:
+            DataFrame com as colunas is_fix e fix_keywords
+        """
+        if not isinstance(messages, pd.Series):
+            messages = pd.Series(list(messages), dtype=object)
+        matches = messages.str.findall(self.pattern)
+        fix_keywords = matches.map(
+            lambda found: sorted({k.lower() for k in found})
+            if isinstance(found, list)
+            else []
+        )
+        return pd.DataFrame(
+            {"is_fix": fix_keywords.map(bool), "fix_keywords": fix_keywords},
+            index=messages.index,
+        )
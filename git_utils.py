@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Funções auxiliares para consultar repositórios Git via linha de comando
+"""
+
+import logging
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def run_git(repo_path: Union[str, Path], args: List[str]) -> str:
+    """
+    Executa um comando git no repositório e retorna a saída padrão
+
+    Args:
+        repo_path: Caminho para o repositório
+        args: Argumentos do git (sem o próprio "git")
+
+    Returns:
+        Saída padrão do comando
+
+    Raises:
+        subprocess.CalledProcessError: Se o git terminar com erro
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo_path)] + args,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        check=True,
+    )
+    return result.stdout
+
+
+def get_head_sha(repo_path: Union[str, Path]) -> Optional[str]:
+    """Retorna o SHA do HEAD do repositório ou None se não for um repositório"""
+    try:
+        return run_git(repo_path, ["rev-parse", "HEAD"]).strip()
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.warning(f"Não foi possível obter o HEAD de {repo_path}: {e}")
+        return None
+
+
+def get_blob_shas(repo_path: Union[str, Path], revision: str = "HEAD") -> Dict[str, str]:
+    """
+    Mapeia cada arquivo da revisão para o SHA do seu blob
+
+    Args:
+        repo_path: Caminho para o repositório
+        revision: Revisão a ser listada (padrão: HEAD)
+
+    Returns:
+        {caminho_relativo: blob_sha}
+    """
+    try:
+        output = run_git(repo_path, ["ls-tree", "-r", "-z", revision])
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.warning(f"Não foi possível listar os blobs de {repo_path}: {e}")
+        return {}
+
+    blobs = {}
+    for entry in output.split("\0"):
+        if not entry:
+            continue
+        # Formato: "<modo> <tipo> <sha>\t<caminho>"
+        meta, _, path = entry.partition("\t")
+        parts = meta.split()
+        if len(parts) == 3 and parts[1] == "blob":
+            blobs[path] = parts[2]
+    return blobs
+
+
+def get_index_blob_shas(repo_path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Mapeia cada arquivo do índice (`git ls-files -s`) para o SHA do seu blob
+
+    Arquivos com alterações ainda não adicionadas ao índice ficam de fora, já
+    que o conteúdo no disco não corresponde ao blob registrado.
+
+    Returns:
+        {caminho_relativo: blob_sha}
+    """
+    try:
+        staged = run_git(repo_path, ["ls-files", "-s", "-z"])
+        modified = run_git(repo_path, ["ls-files", "-m", "-z"])
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.warning(f"Não foi possível listar o índice de {repo_path}: {e}")
+        return {}
+
+    dirty = set(modified.split("\0"))
+    blobs = {}
+    for entry in staged.split("\0"):
+        if not entry:
+            continue
+        # Formato: "<modo> <sha> <estágio>\t<caminho>"
+        meta, _, path = entry.partition("\t")
+        parts = meta.split()
+        if len(parts) == 3 and parts[2] == "0" and path not in dirty:
+            blobs[path] = parts[1]
+    return blobs
@@ -0,0 +1,664 @@
+#!/usr/bin/env python3
+"""
+Motor de histórico em lote
+
+Alternativa ao CodeShovel que percorre o histórico do repositório uma única
+vez (git log -p -U0, do HEAD para trás, seguindo o primeiro pai) e acompanha
+o intervalo de linhas de todos os métodos ao mesmo tempo através dos hunks de
+cada diff. Cada commit cujo hunk intersecta o intervalo de um método é
+atribuído a ele; o commit em que a linha de início (assinatura) do método
+aparece como adicionada, sem linha antiga correspondente no hunk, é o de
+introdução. Com -U0 o git pode deslizar linhas iguais vizinhas (como o `}`
+do método anterior) para dentro do hunk, de modo que exigir que todas as
+linhas do método sejam adicionadas atribuiria métodos novos ao histórico do
+vizinho.
+
+A saída usa o mesmo formato de `changeHistoryDetails` do CodeShovel, então
+analyze_fix_commits a consome sem alterações. Limitações conhecidas: métodos
+movidos entre arquivos são considerados introduzidos no destino, e mudanças
+feitas apenas em ramos mesclados aparecem no commit de merge.
+
+BlameHistoryEngine é uma aproximação ainda mais barata: um único `git blame`
+por arquivo atribui a cada método os commits que escreveram suas linhas
+atuais. Alterações cujas linhas foram depois sobrescritas não aparecem.
+"""
+
+import logging
+import re
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from git_utils import run_git
+
+logger = logging.getLogger(__name__)
+
+# (início antigo, qtd. antiga, início novo, qtd. nova)
+Hunk = Tuple[int, int, int, int]
+
+# (arquivo, método, linha de início no HEAD)
+MethodKey = Tuple[str, str, int]
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+COMMIT_START = "\x1e"
+COMMIT_FIELD = "\x1f"
+COMMIT_END = "\x1d"
+LOG_FORMAT = "%x1e%H%x1f%an%x1f%aI%x1f%B%x1d"
+
+
+def parse_hunk_header(line: str) -> Optional[Hunk]:
+    """Converte '@@ -a,b +c,d @@' em (a, b, c, d)"""
+    match = HUNK_HEADER.match(line)
+    if not match:
+        return None
+    a, b, c, d = match.groups()
+    return (
+        int(a),
+        1 if b is None else int(b),
+        int(c),
+        1 if d is None else int(d),
+    )
+
+
+def hunks_touch_range(hunks: List[Hunk], start: int, end: int) -> bool:
+    """Indica se algum hunk altera linhas do intervalo [start, end] (lado novo)"""
+    for _, _, c, d in hunks:
+        if d > 0:
+            if c <= end and c + d - 1 >= start:
+                return True
+        elif start <= c < end:
+            # Remoção pura entre as linhas c e c + 1, ambas dentro do método
+            return True
+    return False
+
+
+def start_line_added(hunks: List[Hunk], start: int) -> bool:
+    """
+    Indica se a linha start (lado novo) foi adicionada sem correspondente antigo
+
+    Em um hunk -a,b +c,d, as d linhas novas substituem as b antigas; a k-ésima
+    linha nova com k >= b não corresponde a nenhuma linha antiga (adição
+    pura). Uma assinatura alterada (k < b) continua sendo o mesmo método.
+    """
+    for a, b, c, d in hunks:
+        if d > 0 and c <= start <= c + d - 1:
+            return start - c >= b
+    return False
+
+
+def map_range_to_old(hunks: List[Hunk], start: int, end: int) -> Optional[Tuple[int, int]]:
+    """
+    Converte o intervalo [start, end] do lado novo do diff para o lado antigo
+
+    Returns:
+        (início, fim) no arquivo antigo ou None se todas as linhas do
+        intervalo foram adicionadas pelo diff
+    """
+    old_start = _map_line(hunks, start, is_start=True)
+    old_end = _map_line(hunks, end, is_start=False)
+    if old_start > old_end:
+        return None
+    return old_start, old_end
+
+
+def _map_line(hunks: List[Hunk], line: int, is_start: bool) -> int:
+    """Mapeia uma linha do lado novo para o lado antigo do diff"""
+    delta = 0
+    for a, b, c, d in hunks:
+        if d > 0 and c <= line <= c + d - 1:
+            # Linha adicionada/alterada: encosta na região antiga do hunk
+            if b > 0:
+                return a if is_start else a + b - 1
+            return a + 1 if is_start else a
+        if (d > 0 and c + d - 1 < line) or (d == 0 and c < line):
+            delta += d - b
+        else:
+            break
+    return line - delta
+
+
+@dataclass
+class _TrackedMethod:
+    """Método acompanhado durante a caminhada pelo histórico"""
+
+    key: MethodKey
+    start: int
+    end: int
+    commits: List[Tuple[str, str, str]] = field(default_factory=list)
+
+
+@dataclass
+class _FileDiff:
+    """Diff de um arquivo dentro de um commit"""
+
+    old_path: Optional[str]
+    new_path: Optional[str]
+    hunks: List[Hunk] = field(default_factory=list)
+
+
+class BulkHistoryEngine:
+    """Calcula o histórico de todos os métodos de um repositório em uma passada"""
+
+    ORIGIN = "bulk-history"
+
+    def __init__(self, repo_path: Path, repo_name: Optional[str] = None):
+        """
+        Args:
+            repo_path: Caminho para o repositório
+            repo_name: Nome do repositório (padrão: nome do diretório)
+        """
+        self.repo_path = Path(repo_path)
+        self.repo_name = repo_name or self.repo_path.name
+        # Metadados guardados uma vez por commit: {sha: (autor, data, mensagem)}
+        self._commits: Dict[str, Tuple[str, str, str]] = {}
+
+    def analyze(
+        self, methods: Dict[str, Iterable[Tuple[str, int, int]]]
+    ) -> Dict[MethodKey, Dict]:
+        """
+        Percorre o histórico uma vez e monta o resultado de cada método
+
+        Args:
+            methods: {arquivo: [(nome, linha_inicio, linha_fim)]} no HEAD
+
+        Returns:
+            {(arquivo, nome, linha_inicio): dados no formato do CodeShovel}
+        """
+        tracking: Dict[str, List[_TrackedMethod]] = {}
+        finished: List[_TrackedMethod] = []
+
+        for file_path, file_methods in methods.items():
+            path = Path(file_path).as_posix()
+            tracking[path] = [
+                _TrackedMethod(key=(file_path, name, start), start=start, end=end)
+                for name, start, end in file_methods
+            ]
+
+        commit_count = 0
+        for sha, author, date, message, diffs in self._walk():
+            commit_count += 1
+            commit = (sha, author, date, message)
+
+            for diff in diffs:
+                if diff.new_path is None or diff.new_path not in tracking:
+                    continue
+
+                tracked = tracking.pop(diff.new_path)
+                survivors = self._apply_diff(commit, diff, tracked, finished)
+
+                if survivors and diff.old_path is not None:
+                    tracking.setdefault(diff.old_path, []).extend(survivors)
+
+            if not tracking:
+                break
+
+        # Métodos que chegaram ao início do histórico sem introdução explícita
+        for tracked in tracking.values():
+            finished.extend(tracked)
+
+        logger.info(
+            f"Histórico em lote de {self.repo_name}: {commit_count} commits percorridos, "
+            f"{len(finished)} métodos"
+        )
+
+        return {method.key: self._to_codeshovel(method) for method in finished}
+
+    @staticmethod
+    def _apply_diff(
+        commit: Tuple[str, str, str, str],
+        diff: _FileDiff,
+        tracked: List[_TrackedMethod],
+        finished: List[_TrackedMethod],
+    ) -> List[_TrackedMethod]:
+        """Atribui o commit aos métodos tocados e os leva para o lado antigo"""
+        sha, author, date, message = commit
+        path = diff.new_path
+        survivors = []
+
+        for method in tracked:
+            if diff.old_path is None:
+                method.commits.append(("Yintroduced", path, sha))
+                finished.append(method)
+                continue
+
+            if not hunks_touch_range(diff.hunks, method.start, method.end):
+                method.start, method.end = map_range_to_old(
+                    diff.hunks, method.start, method.end
+                )
+                survivors.append(method)
+                continue
+
+            old_range = map_range_to_old(diff.hunks, method.start, method.end)
+            if old_range is None or start_line_added(diff.hunks, method.start):
+                method.commits.append(("Yintroduced", path, sha))
+                finished.append(method)
+            else:
+                method.commits.append(("Ybodychange", path, sha))
+                method.start, method.end = old_range
+                survivors.append(method)
+
+        return survivors
+
+    def _walk(self):
+        """Gera (sha, autor, data, mensagem, diffs) do HEAD para trás"""
+        cmd = [
+            "git",
+            "-C",
+            str(self.repo_path),
+            "-c",
+            "core.quotePath=false",
+            "log",
+            "--first-parent",
+            "-m",
+            "-M",
+            "-p",
+            "-U0",
+            "--no-color",
+            "--no-ext-diff",
+            f"--format={LOG_FORMAT}",
+            "HEAD",
+            "--",
+            "*.java",
+        ]
+        logger.info(f"Executando: {' '.join(cmd)}")
+
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+
+        try:
+            yield from self._parse_log(process.stdout)
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+    def _parse_log(self, lines):
+        """Interpreta a saída de git log -p -U0 gerada em _walk"""
+        header: Optional[str] = None
+        commit = None
+        diffs: List[_FileDiff] = []
+        current: Optional[_FileDiff] = None
+        removed_left = added_left = 0
+
+        for line in lines:
+            if header is not None:
+                header += line
+                if COMMIT_END in header:
+                    commit = self._parse_header(header)
+                    header = None
+                continue
+
+            if removed_left or added_left:
+                if line.startswith("-"):
+                    removed_left -= 1
+                    continue
+                if line.startswith("+"):
+                    added_left -= 1
+                    continue
+                if line.startswith("\\"):
+                    continue
+                removed_left = added_left = 0
+
+            if line.startswith(COMMIT_START):
+                if commit is not None:
+                    yield commit + (diffs,)
+                header = line[1:]
+                commit = None
+                diffs = []
+                current = None
+                if COMMIT_END in header:
+                    commit = self._parse_header(header)
+                    header = None
+                continue
+
+            if line.startswith("diff --git "):
+                current = _FileDiff(old_path=None, new_path=None)
+                diffs.append(current)
+                # Caminhos padrão para diffs sem linhas ---/+++ (ex.: renomeação pura)
+                parts = line.rstrip("\n")[len("diff --git a/"):].split(" b/", 1)
+                if len(parts) == 2:
+                    current.old_path, current.new_path = parts
+                continue
+
+            if current is None:
+                continue
+
+            if line.startswith("rename from "):
+                current.old_path = line[len("rename from "):].rstrip("\n")
+            elif line.startswith("rename to "):
+                current.new_path = line[len("rename to "):].rstrip("\n")
+            elif line.startswith("new file mode"):
+                current.old_path = None
+            elif line.startswith("deleted file mode"):
+                current.new_path = None
+            elif line.startswith("--- "):
+                path = line[4:].rstrip("\n").rstrip("\t")
+                current.old_path = None if path == "/dev/null" else path[2:]
+            elif line.startswith("+++ "):
+                path = line[4:].rstrip("\n").rstrip("\t")
+                current.new_path = None if path == "/dev/null" else path[2:]
+            elif line.startswith("@@"):
+                hunk = parse_hunk_header(line)
+                if hunk is not None:
+                    current.hunks.append(hunk)
+                    removed_left, added_left = hunk[1], hunk[3]
+
+        if commit is not None:
+            yield commit + (diffs,)
+
+    def _parse_header(self, header: str) -> Tuple[str, str, str, str]:
+        """Extrai (sha, autor, data, mensagem) do cabeçalho de um commit"""
+        sha, author, date, message = header.split(COMMIT_END)[0].split(COMMIT_FIELD, 3)
+        commit = (sha.strip(), author, date, message.strip())
+        self._commits[commit[0]] = commit[1:]
+        return commit
+
+    def _to_codeshovel(self, method: _TrackedMethod) -> Dict:
+        """Monta o resultado de um método no formato JSON do CodeShovel"""
+        file_path, name, start_line = method.key
+        details = {}
+        for change_type, path, sha in method.commits:
+            author, date, message = self._commits.get(sha, ("", "", ""))
+            details[sha] = {
+                "type": change_type,
+                "commitMessage": message,
+                "commitDate": date,
+                "commitName": sha,
+                "commitAuthor": author,
+                "path": path,
+                "functionName": name,
+            }
+
+        return {
+            "origin": self.ORIGIN,
+            "repositoryName": self.repo_name,
+            "sourceFilePath": Path(file_path).as_posix(),
+            "functionName": name,
+            "functionStartLine": start_line,
+            "changeHistory": [sha for _, _, sha in method.commits],
+            "changeHistoryShort": {sha: change_type for change_type, _, sha in method.commits},
+            "changeHistoryDetails": details,
+        }
+
+
+# Cabeçalho de linha do `git blame --porcelain`: "<sha> <linha_orig> <linha_final> [<qtd>]"
+BLAME_HEADER = re.compile(r"^([0-9a-f]{40}) \d+ (\d+)")
+
+UNCOMMITTED_SHA = "0" * 40
+
+
+class BlameHistoryEngine(BulkHistoryEngine):
+    """Aproxima o histórico dos métodos com um `git blame` por arquivo"""
+
+    ORIGIN = "git-blame"
+
+    def analyze(
+        self, methods: Dict[str, Iterable[Tuple[str, int, int]]]
+    ) -> Dict[MethodKey, Dict]:
+        """
+        Executa o blame de cada arquivo e atribui os commits aos métodos
+
+        Args:
+            methods: {arquivo: [(nome, linha_inicio, linha_fim)]} no HEAD
+
+        Returns:
+            {(arquivo, nome, linha_inicio): dados no formato do CodeShovel}
+        """
+        tracked: List[Tuple[MethodKey, List[str]]] = []
+
+        for file_path, file_methods in methods.items():
+            line_shas = self._blame(Path(file_path).as_posix())
+            if line_shas is None:
+                continue
+
+            for name, start, end in file_methods:
+                shas = {
+                    line_shas[line]
+                    for line in range(start, end + 1)
+                    if line_shas.get(line, UNCOMMITTED_SHA) != UNCOMMITTED_SHA
+                }
+                tracked.append(((file_path, name, start), list(shas)))
+
+        self._load_commits({sha for _, shas in tracked for sha in shas})
+
+        results = {}
+        for key, shas in tracked:
+            # Mais recente primeiro, como no changeHistory do CodeShovel; o
+            # commit mais antigo entre as linhas atuais é tratado como introdução
+            shas.sort(key=self._commit_time, reverse=True)
+            path = Path(key[0]).as_posix()
+            method = _TrackedMethod(key=key, start=key[2], end=key[2])
+            method.commits = [
+                ("Yintroduced" if i == len(shas) - 1 else "Ybodychange", path, sha)
+                for i, sha in enumerate(shas)
+            ]
+            results[key] = self._to_codeshovel(method)
+
+        logger.info(
+            f"Blame de {self.repo_name}: {len(methods)} arquivos, "
+            f"{len(self._commits)} commits, {len(results)} métodos"
+        )
+
+        return results
+
+    def _commit_time(self, sha: str) -> float:
+        """Data do commit como timestamp (0 se desconhecida)"""
+        date = self._commits.get(sha, ("", "", ""))[1]
+        try:
+            return datetime.fromisoformat(date).timestamp()
+        except ValueError:
+            return 0.0
+
+    def _blame(self, file_path: str) -> Optional[Dict[int, str]]:
+        """Retorna {linha: sha} do arquivo no HEAD ou None em caso de erro"""
+        try:
+            output = run_git(
+                self.repo_path, ["blame", "--porcelain", "HEAD", "--", file_path]
+            )
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f"Erro ao executar git blame em {file_path}: {e}")
+            return None
+
+        line_shas = {}
+        for line in output.splitlines():
+            match = BLAME_HEADER.match(line)
+            if match:
+                line_shas[int(match.group(2))] = match.group(1)
+        return line_shas
+
+    def _load_commits(self, shas: Set[str]):
+        """Lê autor, data e mensagem completa dos commits em uma única chamada"""
+        if not shas:
+            return
+
+        process = subprocess.run(
+            [
+                "git",
+                "-C",
+                str(self.repo_path),
+                "log",
+                "--no-walk=unsorted",
+                "--stdin",
+                f"--format={LOG_FORMAT}",
+            ],
+            input="\n".join(sorted(shas)) + "\n",
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+        if process.returncode != 0:
+            logger.warning(f"Erro ao ler commits de {self.repo_name}: {process.stderr.strip()}")
+            return
+
+        for _ in self._parse_log(process.stdout.splitlines(keepends=True)):
+            pass
+
+
+class FileHistoryPrefilter(BulkHistoryEngine):
+    """
+    Resolve sem o CodeShovel os métodos de arquivos com poucos commits
+
+    Uma única passada de `git log -M --name-status` conta os commits de cada
+    arquivo do HEAD, seguindo renomeações. Em um arquivo com um único commit,
+    esse commit é necessariamente a introdução de todos os seus métodos, e o
+    resultado é montado diretamente. Com um mínimo maior que 2, os commits do
+    arquivo são atribuídos a todos os seus métodos (aproximação), e o
+    analisador grava esses resultados em um diretório próprio.
+    """
+
+    ORIGIN = "file-history"
+
+    def __init__(
+        self, repo_path: Path, repo_name: Optional[str] = None, min_commits: int = 2
+    ):
+        """
+        Args:
+            repo_path: Caminho para o repositório
+            repo_name: Nome do repositório (padrão: nome do diretório)
+            min_commits: Arquivos com menos commits que isso são resolvidos aqui
+        """
+        super().__init__(repo_path, repo_name)
+        self.min_commits = min_commits
+
+    def analyze(
+        self, methods: Dict[str, Iterable[Tuple[str, int, int]]]
+    ) -> Dict[MethodKey, Dict]:
+        """
+        Monta o histórico trivial dos métodos cujos arquivos estão abaixo do mínimo
+
+        Args:
+            methods: {arquivo: [(nome, linha_inicio, linha_fim)]} no HEAD
+
+        Returns:
+            {(arquivo, nome, linha_inicio): dados no formato do CodeShovel} apenas
+            para os métodos resolvidos; os demais seguem para o CodeShovel
+        """
+        if self.min_commits < 2 or not methods:
+            return {}
+
+        file_commits = self._file_commits({Path(f).as_posix() for f in methods})
+
+        results = {}
+        for file_path, file_methods in methods.items():
+            path = Path(file_path).as_posix()
+            shas = file_commits.get(path)
+            if not shas or len(shas) >= self.min_commits:
+                continue
+
+            for name, start, end in file_methods:
+                method = _TrackedMethod(key=(file_path, name, start), start=start, end=end)
+                method.commits = [
+                    ("Yintroduced" if i == len(shas) - 1 else "Ybodychange", path, sha)
+                    for i, sha in enumerate(shas)
+                ]
+                results[method.key] = self._to_codeshovel(method)
+
+        logger.info(
+            f"Pré-filtro de {self.repo_name}: {len(results)} métodos resolvidos "
+            f"sem o CodeShovel (arquivos com menos de {self.min_commits} commits)"
+        )
+
+        return results
+
+    def _file_commits(self, paths: Set[str]) -> Dict[str, List[str]]:
+        """
+        Percorre o histórico uma vez e coleta os commits de cada arquivo
+
+        Returns:
+            {arquivo no HEAD: shas do mais recente para o mais antigo}, com no
+            máximo min_commits entradas por arquivo (o suficiente para decidir)
+        """
+        cmd = [
+            "git",
+            "-C",
+            str(self.repo_path),
+            "-c",
+            "core.quotePath=false",
+            "log",
+            "-M",
+            "--name-status",
+            "--no-color",
+            f"--format={LOG_FORMAT}",
+            "HEAD",
+            "--",
+            "*.java",
+        ]
+        logger.info(f"Executando: {' '.join(cmd)}")
+
+        # Caminho do arquivo no commit atual da caminhada -> caminho no HEAD
+        aliases = {path: path for path in paths}
+        file_commits: Dict[str, List[str]] = {}
+        header: Optional[str] = None
+        sha = None
+
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+
+        try:
+            for line in process.stdout:
+                if line.startswith(COMMIT_START):
+                    header = line[1:]
+                    sha = None
+                elif header is not None:
+                    header += line
+
+                if header is not None:
+                    if COMMIT_END in header:
+                        sha = self._parse_header(header)[0]
+                        header = None
+                    continue
+
+                parts = line.rstrip("\n").split("\t")
+                if sha is None or len(parts) < 2:
+                    continue
+
+                status, path = parts[0], parts[-1]
+                if status.startswith("R") and len(parts) == 3:
+                    head_path = aliases.pop(path, None)
+                    if head_path is not None:
+                        aliases[parts[1]] = head_path
+                elif status.startswith("A"):
+                    # Antes deste commit o caminho pertencia a outro arquivo
+                    head_path = aliases.pop(path, None)
+                elif status.startswith("D"):
+                    continue
+                else:
+                    head_path = aliases.get(path)
+
+                if head_path is None:
+                    continue
+
+                shas = file_commits.setdefault(head_path, [])
+                if len(shas) < self.min_commits:
+                    shas.append(sha)
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+
+        return file_commits
+
+
+# Backends de histórico em lote disponíveis em --analysis-mode
+HISTORY_ENGINES = {
+    "bulk": BulkHistoryEngine,
+    "blame": BlameHistoryEngine,
+}
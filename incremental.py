@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Atualização incremental dos resultados após `git pull`
+
+Os resultados registram o HEAD em que foram gerados (Repository.head_sha).
+Quando o repositório avança, `git diff --name-status -M` entre o HEAD
+registrado e o atual indica o que mudou: arquivos removidos saem dos
+resultados, e apenas os adicionados, modificados e renomeados são extraídos
+de novo.
+
+Em arquivos modificados, um método só é invalidado se algum hunk do diff
+(`git diff -U0`) tocar suas linhas; os demais mantêm `complete` e a análise
+anterior, com as linhas atualizadas. Arquivos renomeados têm todos os métodos
+invalidados, já que a renomeação entra no histórico de cada um deles.
+"""
+
+import logging
+import subprocess
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import EXTRACTION_WORKERS
+from extraction_index import ExtractionIndex, extract_methods_indexed
+from git_utils import get_head_sha, run_git
+from history_engine import Hunk, hunks_touch_range, map_range_to_old, parse_hunk_header
+from java_files import ExcludeMatcher, configured_excludes
+from models import File, Method, MethodInfo
+
+logger = logging.getLogger(__name__)
+
+# (status, caminho antigo, caminho novo); caminhos ausentes são None
+FileChange = Tuple[str, Optional[str], Optional[str]]
+
+
+def diff_name_status(repo_path: Path, old_sha: str, new_sha: str) -> List[FileChange]:
+    """Arquivos Java alterados entre dois commits, com renomeações detectadas"""
+    output = run_git(
+        repo_path,
+        ["diff", "--name-status", "-M", "-z", old_sha, new_sha, "--", "*.java"],
+    )
+    fields = output.split("\0")
+    changes = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in "RC":
+            changes.append((status, fields[i + 1], fields[i + 2]))
+            i += 3
+        else:
+            path = fields[i + 1]
+            changes.append(
+                (status, None if status == "A" else path, None if status == "D" else path)
+            )
+            i += 2
+    return changes
+
+
+def diff_hunks(repo_path: Path, old_sha: str, new_sha: str, paths: List[str]) -> Dict[str, List[Hunk]]:
+    """Hunks (-U0) de cada arquivo modificado, indexados pelo caminho"""
+    if not paths:
+        return {}
+
+    output = run_git(
+        repo_path,
+        ["-c", "core.quotePath=false", "diff", "-U0", "--no-renames", old_sha, new_sha, "--"]
+        + paths,
+    )
+    hunks: Dict[str, List[Hunk]] = {}
+    current: Optional[List[Hunk]] = None
+    for line in output.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:].rstrip("\t")
+            current = None if path == "/dev/null" else hunks.setdefault(path[2:], [])
+        elif line.startswith("@@") and current is not None:
+            hunk = parse_hunk_header(line)
+            if hunk is not None:
+                current.append(hunk)
+    return hunks
+
+
+def _new_method(name: str, start: int, end: int) -> Dict:
+    return asdict(
+        Method(
+            name=name,
+            complete=False,
+            method_info=MethodInfo(start_line=start, end_line=end, size_lines=end - start + 1),
+        )
+    )
+
+
+def _merge_methods(
+    old_file: Optional[Dict],
+    methods: List[Tuple[str, int, int]],
+    hunks: Optional[List[Hunk]],
+) -> Tuple[List[Dict], int]:
+    """
+    Combina os métodos extraídos com os resultados anteriores do arquivo
+
+    Args:
+        old_file: Entrada anterior do arquivo (None se novo)
+        methods: Métodos extraídos da versão atual
+        hunks: Hunks do diff (None invalida todos os métodos)
+
+    Returns:
+        (métodos no formato do JSON, quantidade de métodos preservados)
+    """
+    previous = {}
+    if old_file is not None and hunks is not None:
+        previous = {
+            (m["name"], m["method_info"]["start_line"], m["method_info"]["end_line"]): m
+            for m in old_file["methods"]
+        }
+
+    merged = []
+    kept = 0
+    for name, start, end in methods:
+        old_method = None
+        if previous and not hunks_touch_range(hunks, start, end):
+            old_range = map_range_to_old(hunks, start, end)
+            if old_range is not None:
+                old_method = previous.get((name,) + old_range)
+
+        if old_method is None:
+            merged.append(_new_method(name, start, end))
+            continue
+
+        method = dict(old_method)
+        method["method_info"] = asdict(
+            MethodInfo(start_line=start, end_line=end, size_lines=end - start + 1)
+        )
+        merged.append(method)
+        kept += 1
+
+    return merged, kept
+
+
+def update_repository(
+    data: Dict,
+    repo_path: Path,
+    workers: int = EXTRACTION_WORKERS,
+    index: Optional[ExtractionIndex] = None,
+) -> Optional[Dict[str, int]]:
+    """
+    Atualiza os resultados de um repositório para o HEAD atual
+
+    Args:
+        data: Resultados do repositório (asdict de models.Repository)
+        repo_path: Caminho para o repositório
+        workers: Processos usados na extração de métodos
+        index: Índice de extração consultado antes de ler os arquivos
+
+    Returns:
+        Contagem de arquivos e métodos afetados, ou None se não for possível
+        atualizar incrementalmente (sem HEAD registrado ou diff indisponível)
+    """
+    old_sha = data.get("head_sha")
+    new_sha = get_head_sha(repo_path)
+    if not old_sha or not new_sha:
+        return None
+
+    stats = {"added": 0, "modified": 0, "renamed": 0, "deleted": 0, "kept_methods": 0, "invalidated_methods": 0}
+    if old_sha == new_sha:
+        return stats
+
+    try:
+        changes = diff_name_status(repo_path, old_sha, new_sha)
+        modified = [new for status, _, new in changes if status in "MT"]
+        hunks = diff_hunks(repo_path, old_sha, new_sha, modified)
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.warning(f"Diff {old_sha[:8]}..{new_sha[:8]} indisponível em {repo_path}: {e}")
+        return None
+
+    matcher = ExcludeMatcher(configured_excludes())
+    files = {f["path"]: f for f in data["files"]}
+    # Arquivo a extrair -> (entrada anterior, hunks ou None para invalidar tudo)
+    targets: Dict[str, Tuple[Optional[Dict], Optional[List[Hunk]]]] = {}
+
+    for status, old_path, new_path in changes:
+        old_file = files.pop(old_path, None) if old_path and status != "C" else None
+
+        if status == "D" or matcher.excludes(new_path):
+            stats["deleted"] += old_file is not None
+            continue
+
+        if status in "MT":
+            targets[new_path] = (old_file, hunks.get(new_path, []))
+            stats["modified"] += 1
+        else:
+            targets[new_path] = (None, None)
+            stats["renamed" if status == "R" else "added"] += 1
+
+        if old_file is not None:
+            stats["invalidated_methods"] += len(old_file["methods"])
+
+    paths = sorted(targets, key=lambda p: Path(p).name.lower())
+    extracted = extract_methods_indexed(repo_path, [repo_path / p for p in paths], index, workers)
+
+    for path, (_, methods) in zip(paths, extracted):
+        old_file, file_hunks = targets[path]
+        merged, kept = _merge_methods(old_file, methods or [], file_hunks)
+        stats["kept_methods"] += kept
+        stats["invalidated_methods"] -= kept
+
+        files[path] = asdict(
+            File(
+                name=Path(path).name,
+                path=path,
+                # Arquivos sem métodos não têm o que analisar; os que não
+                # puderam ser lidos ficam pendentes
+                complete=methods is not None and all(m["complete"] for m in merged),
+                methods=merged,
+            )
+        )
+
+    data["files"] = sorted(files.values(), key=lambda f: f["name"].lower())
+    data["complete"] = data["complete"] and all(f["complete"] for f in data["files"])
+    data["head_sha"] = new_sha
+    return stats
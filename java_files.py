@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Descoberta dos arquivos Java de um repositório
+
+Os padrões de exclusão vêm de config.EXCLUDE_PATTERNS (respeitando
+METHOD_FILTERS["exclude_test_files"] e ["exclude_build_files"]) e são
+comparados com cada componente do caminho, nunca com trechos soltos: "test"
+exclui src/test/Foo.java, mas não src/main/Latest.java.
+
+Em repositórios Git a lista vem do índice (`git ls-files`), com os padrões
+aplicados como pathspecs. Diretórios que não são repositórios Git são
+percorridos com os.scandir, e diretórios excluídos nunca são visitados.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from config import get_exclude_patterns, get_method_filters
+from git_utils import run_git
+
+logger = logging.getLogger(__name__)
+
+# Padrões de EXCLUDE_PATTERNS controlados por METHOD_FILTERS["exclude_build_files"]
+BUILD_PATTERNS = {"target", "build", "out"}
+
+
+def configured_excludes() -> List[str]:
+    """Padrões de exclusão ativos segundo config.py"""
+    patterns = get_exclude_patterns()
+    filters = get_method_filters()
+
+    if not filters.get("exclude_test_files", True):
+        patterns = [p for p in patterns if "test" not in p.lower()]
+    if not filters.get("exclude_build_files", True):
+        patterns = [p for p in patterns if p not in BUILD_PATTERNS]
+
+    return patterns
+
+
+class ExcludeMatcher:
+    """Padrões de exclusão compilados uma única vez, aplicados por componente"""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._names = {p for p in self.patterns if not _has_wildcard(p)}
+        globs = [fnmatch.translate(p) for p in self.patterns if _has_wildcard(p)]
+        self._glob = re.compile("|".join(globs)) if globs else None
+
+    def matches(self, name: str) -> bool:
+        """Indica se um componente de caminho (diretório ou arquivo) é excluído"""
+        if name in self._names:
+            return True
+        return self._glob is not None and self._glob.match(name) is not None
+
+    def excludes(self, relative_path: str) -> bool:
+        """Indica se algum componente do caminho relativo é excluído"""
+        return any(self.matches(part) for part in relative_path.split("/"))
+
+    def pathspecs(self) -> List[str]:
+        """Pathspecs do git que excluem os mesmos caminhos"""
+        specs = []
+        for pattern in self.patterns:
+            specs.append(f":(exclude,glob)**/{pattern}")
+            specs.append(f":(exclude,glob)**/{pattern}/**")
+        return specs
+
+
+def _has_wildcard(pattern: str) -> bool:
+    return any(c in pattern for c in "*?[")
+
+
+def find_java_files(
+    repo_path: Path, excludes: Optional[Sequence[str]] = None
+) -> List[Path]:
+    """
+    Lista os arquivos .java do repositório, sem os caminhos excluídos
+
+    Args:
+        repo_path: Caminho para o repositório
+        excludes: Padrões de exclusão (padrão: configured_excludes())
+
+    Returns:
+        Caminhos absolutos dos arquivos Java (ordem não especificada)
+    """
+    repo_path = Path(repo_path)
+    matcher = ExcludeMatcher(configured_excludes() if excludes is None else excludes)
+
+    if (repo_path / ".git").exists():
+        try:
+            return _git_java_files(repo_path, matcher)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f"git ls-files falhou em {repo_path}, percorrendo o diretório: {e}")
+
+    return scan_java_files(repo_path, matcher)
+
+
+def _git_java_files(repo_path: Path, matcher: ExcludeMatcher) -> List[Path]:
+    """Arquivos Java rastreados pelo Git, filtrados por pathspecs de exclusão"""
+    pathspecs = [":(glob)**/*.java"] + matcher.pathspecs()
+    output = run_git(repo_path, ["ls-files", "-z", "--"] + pathspecs)
+    return [repo_path / path for path in output.split("\0") if path]
+
+
+def scan_java_files(root: Path, matcher: ExcludeMatcher) -> List[Path]:
+    """
+    Percorre o diretório com os.scandir, podando os diretórios excluídos
+
+    Links simbólicos para diretórios não são seguidos.
+    """
+    java_files = []
+    stack = [str(root)]
+
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if matcher.matches(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".java") and entry.is_file():
+                        java_files.append(Path(entry.path))
+        except OSError as e:
+            logger.warning(f"Erro ao listar {directory}: {e}")
+
+    return java_files
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Resultados em JSON Lines, gravados à medida que os métodos terminam
+
+Cada método analisado vira imediatamente uma linha JSON compacta, no mesmo
+formato dos registros de `<repo>_fix_analysis.json`. Enquanto o repositório
+está em andamento o arquivo se chama `<repo>_fix_analysis.jsonl.partial`; ao
+final recebe um fsync e é renomeado para `<repo>_fix_analysis.jsonl`. A
+leitura também é feita linha a linha, sem carregar o arquivo inteiro.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+from config import JSONL_FSYNC_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_SUFFIX = ".partial"
+
+
+class JsonlResultsWriter:
+    """Escrita append-only dos resultados de um repositório"""
+
+    def __init__(self, path: Union[str, Path], fsync_interval: int = JSONL_FSYNC_INTERVAL):
+        """
+        Cria o arquivo parcial do repositório (descartando um anterior)
+
+        Args:
+            path: Caminho final do arquivo .jsonl
+            fsync_interval: Registros gravados entre dois fsync
+        """
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + PARTIAL_SUFFIX)
+        self.fsync_interval = max(1, fsync_interval)
+        self.count = 0
+
+        self._lock = threading.Lock()
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+
+    def append(self, record: Dict):
+        """Acrescenta um registro e faz fsync periodicamente"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.count += 1
+            if self.count % self.fsync_interval == 0:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+    def finish(self):
+        """Grava o que falta e publica o arquivo com o nome final"""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self.partial_path, self.path)
+
+    def close(self):
+        """Fecha o arquivo parcial sem publicá-lo"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._file.close()
+
+
+def iter_jsonl(path: Union[str, Path]) -> Iterator[Dict]:
+    """Lê os registros de um arquivo JSON Lines, um por vez"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Linha truncada por um crash durante a escrita
+                logger.warning(f"Linha inválida ignorada em {path}:{line_number}")
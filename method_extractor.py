@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Extrator de métodos Java baseado em tokens
+
+Faz uma única passada pelos bytes do arquivo com expressões regulares
+compiladas que reconhecem comentários, strings, literais de caractere e text
+blocks, de modo que chaves dentro deles não afetam a contagem. Um pequeno
+analisador de pilha acompanha os corpos de tipos (classes, interfaces, enums,
+records e classes anônimas) e reconhece como método toda declaração com corpo
+feita diretamente em um deles. Assinaturas em várias linhas, anotações e
+genéricos são tratados naturalmente, já que o analisador vê tokens e não
+linhas.
+
+Durante a passada só chaves, parênteses, ";" e "new Tipo(" chegam ao laço em
+Python; o restante é consumido em trechos longos pela própria expressão
+regular. A declaração de um membro só é quebrada em tokens quando termina em
+"{", e apenas até o primeiro "(", para decidir se é um método, um tipo
+aninhado ou um bloco.
+
+Cada método é reportado como (nome, linha do nome, linha da chave de
+fechamento). A linha do nome é a que o CodeShovel usa para localizar o
+método. Construtores, métodos abstratos e de interface sem corpo são
+ignorados, como no extrator por linhas anterior.
+"""
+
+import logging
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# (nome, linha_inicio, linha_fim)
+MethodSpan = Tuple[str, int, int]
+
+# Versão do extrator: entradas do índice de extração (extraction_index.py)
+# gravadas por outra versão são ignoradas
+EXTRACTOR_VERSION = 1
+
+# Arquivos por tarefa do pool de extração: amortiza o custo de comunicação
+# entre processos sem atrasar demais o primeiro resultado
+PARALLEL_CHUNK_SIZE = 64
+
+# Os processos do pool não são criados por fork: o processo principal tem
+# threads (análises, pool do CodeShovel) e conexões SQLite abertas, cujo
+# estado (locks, descritores) seria copiado no meio de uso. O forkserver
+# parte de um processo limpo; onde não existe (Windows), usa-se spawn.
+POOL_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Caracteres de identificador
+_W = rb"[\w$\x80-\xff]"
+
+# Um "n" que não inicia a palavra "new" (no meio de uma palavra ou seguido de
+# outra coisa); os demais caracteres de palavra são consumidos em _others
+_N = rb"(?<=" + _W + rb")n|(?<!" + _W + rb")n(?!ew(?!" + _W + rb"))"
+
+# Literais e comentários, dentro dos quais chaves e parênteses não contam.
+# Cada um só casa de uma maneira (até o primeiro terminador), e "/" sozinho
+# não inicia comentário, para que um casamento que falha não seja refeito
+# com os literais partidos de outro jeito.
+_LITERAL = rb"""
+      \"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+    | "(?:\\.|[^"\\\n])*"
+    | '(?:\\.|[^'\\\n])*'
+    | //[^\n]*(?![^\n]) | /\*(?:[^*]|\*(?!/))*\*/ | /(?![/*])
+"""
+
+
+def _others(excluded: bytes) -> bytes:
+    """
+    Sequência máxima de caracteres que não são estruturais, aspas, "/" ou "n"
+
+    Exigir o fim da sequência impede que ela seja partida em pedaços, o que
+    causaria retrocesso exponencial quando um casamento falha.
+    """
+    cls = rb"[^" + excluded + rb"\"'/n]"
+    return cls + rb"+(?!" + cls + rb")"
+
+
+_FLAT = rb"|".join([_others(rb"(){}"), _N, _LITERAL])
+
+# Parênteses sem chaves ou "new" dentro, com até um nível de parênteses
+# aninhados (a maioria das chamadas e listas de parâmetros), não afetam a
+# estrutura e são pulados inteiros
+_GROUP = rb"\((?:" + _FLAT + rb"|\((?:" + _FLAT + rb")*\))*\)"
+
+# Em corpos de métodos, blocos sem chaves nem "new" dentro (corpos de if/for,
+# lambdas curtas) também não afetam a estrutura
+_FLAT_BLOCK = rb"\{(?:" + _FLAT + rb"|" + _GROUP + rb")*\}"
+
+
+def _scanner(excluded: bytes, *extra: bytes):
+    """
+    Cada casamento consome os trechos sem interesse e para logo depois do
+    próximo caractere estrutural; "new Tipo(" é um único token terminado em "("
+    """
+    skip = rb"|".join([_others(excluded), _N, _LITERAL, _GROUP, *extra])
+    return re.compile(
+        rb"(?:" + skip + rb")*(?:(?P<new>new\b[^;{}()\"]*\()|.)", re.S | re.X
+    )
+
+
+# Dentro de corpos de métodos e blocos interessam chaves e parênteses
+BODY_TOKEN = _scanner(rb"(){}", _FLAT_BLOCK)
+
+# No corpo de um tipo também interessam ";" e "," (fim de membro / constante de enum)
+MEMBER_TOKEN = _scanner(rb"(){};,")
+
+# Tokens de uma declaração de membro
+TOKEN = re.compile(
+    rb"""
+      (?P<skip>(?:\s+|//[^\n]*|/\*.*?\*/)+)
+    | (?P<text>\"\"\"(?:\\.|[^\\])*?\"\"\")
+    | (?P<string>"(?:\\.|[^"\\\n])*")
+    | (?P<char>'(?:\\.|[^'\\\n])*')
+    | (?P<ident>[A-Za-z_$\x80-\xff][\w$\x80-\xff]*)
+    | (?P<number>\d[\w.]*)
+    | (?P<punct>.)
+    """,
+    re.S | re.X,
+)
+
+# Início de uma declaração de membro que não entra na decisão: espaços,
+# comentários e anotações (exceto @interface) com argumentos simples
+HEAD_PREFIX = re.compile(
+    rb"(?:\s+|//[^\n]*|/\*.*?\*/|@\s*(?!interface(?!" + _W + rb"))"
+    rb"(?:[A-Za-z_$\x80-\xff]" + _W + rb"*\s*\.\s*)*[A-Za-z_$\x80-\xff]" + _W + rb"*"
+    rb"(?:\s*" + _GROUP + rb")?)*",
+    re.S | re.X,
+)
+
+# Tokens de um trecho de declaração sem literais, comentários nem anotações
+SIMPLE_TOKEN = re.compile(
+    rb"(?P<ident>[A-Za-z_$\x80-\xff]" + _W + rb"*)|(?P<number>\d[\w.]*)|(?P<punct>\S)"
+)
+
+TYPE_KEYWORDS = {b"class", b"interface", b"enum", b"record"}
+
+# Palavras que podem preceder "(" sem serem nomes de método
+NON_METHOD_KEYWORDS = {
+    b"if", b"for", b"while", b"switch", b"catch", b"synchronized", b"return",
+    b"new", b"try", b"do", b"else", b"throw", b"assert", b"case", b"super",
+    b"this",
+}
+
+# Apenas espaços e comentários (entre o ")" de "new Tipo(...)" e a "{")
+GAP = re.compile(rb"(?:\s+|//[^\n]*|/\*.*?\*/)*", re.S)
+
+# Literais, comentários e anotações, que exigem o tokenizador completo
+HEAD_SPECIAL = re.compile(rb"[\"'/@]")
+
+# Valor padrão de elemento de anotação: "int[] a() default {1, 2};" não tem corpo
+DEFAULT_VALUE = re.compile(rb"\)" + GAP.pattern + rb"default(?!" + _W + rb")", re.S)
+
+OPEN_PAREN, CLOSE_PAREN, OPEN_BRACE, CLOSE_BRACE = b"(){}"
+SEMICOLON, COMMA = b";,"
+
+# Tipos de frame na pilha de chaves
+TYPE_BODY, BLOCK, METHOD_BODY = 0, 1, 2
+
+# (grupo, texto, posição)
+Token = Tuple[str, bytes, int]
+
+
+class _Frame:
+    """Conteúdo de um par de chaves"""
+
+    __slots__ = ("kind", "name", "paren_base", "member_start", "enum_constants", "method")
+
+    def __init__(
+        self, kind: int, paren_base: int, member_start: int, name: Optional[bytes] = None
+    ):
+        self.kind = kind
+        self.name = name
+        self.paren_base = paren_base
+        # Início da declaração de membro em andamento (apenas em TYPE_BODY)
+        self.member_start = member_start
+        self.enum_constants = False
+        # (nome, posição do nome) quando kind == METHOD_BODY
+        self.method: Optional[Tuple[bytes, int]] = None
+
+
+def extract_methods_from_source(source: bytes) -> List[MethodSpan]:
+    """
+    Extrai os métodos de um código-fonte Java
+
+    Args:
+        source: Conteúdo do arquivo (bytes ou mmap)
+
+    Returns:
+        [(nome_metodo, linha_inicio, linha_fim)] ordenados por (nome, linha)
+    """
+    methods: List[MethodSpan] = []
+    stack = [_Frame(TYPE_BODY, 0, 0)]
+    # Um item por parêntese aberto: True se for o de uma criação de objeto
+    parens: List[bool] = []
+
+    # Contagem incremental de linhas: (posição, linha) da última consulta
+    line_pos, line_no = 0, 1
+
+    def line_at(pos: int) -> int:
+        nonlocal line_pos, line_no
+        if pos >= line_pos:
+            line_no += source[line_pos:pos].count(b"\n")
+        else:
+            line_no -= source[pos:line_pos].count(b"\n")
+        line_pos = pos
+        return line_no
+
+    # O último ")" fechou uma criação de objeto, e onde ele termina
+    closed_new_call = False
+    closed_at = -1
+    scan = MEMBER_TOKEN.match
+
+    pos, end = 0, len(source)
+    while pos < end:
+        match = scan(source, pos)
+        pos = match.end()
+        char = source[pos - 1]
+
+        if char == OPEN_PAREN:
+            parens.append(match.lastgroup == "new")
+
+        elif char == CLOSE_PAREN:
+            closed_new_call = parens.pop() if parens else False
+            closed_at = pos
+
+        elif char == OPEN_BRACE:
+            frame = stack[-1]
+            if closed_new_call and GAP.fullmatch(source, closed_at, pos - 1):
+                # Corpo de classe anônima: new Tipo(...) { ... }
+                stack.append(_Frame(TYPE_BODY, len(parens), pos))
+            elif frame.kind == TYPE_BODY and len(parens) == frame.paren_base:
+                stack.append(_open_member(source, frame, pos - 1, len(parens), pos))
+            else:
+                stack.append(_Frame(BLOCK, len(parens), pos))
+            scan = (MEMBER_TOKEN if stack[-1].kind == TYPE_BODY else BODY_TOKEN).match
+
+        elif char == CLOSE_BRACE:
+            _close(stack, parens, methods, line_at, pos - 1, pos)
+            scan = (MEMBER_TOKEN if stack[-1].kind == TYPE_BODY else BODY_TOKEN).match
+
+        elif char == SEMICOLON or char == COMMA:
+            frame = stack[-1]
+            if frame.kind == TYPE_BODY and len(parens) == frame.paren_base:
+                if char == SEMICOLON:
+                    frame.member_start = pos
+                    frame.enum_constants = False
+                elif frame.enum_constants:
+                    frame.member_start = pos
+
+    methods.sort(key=lambda m: (m[0], m[1]))
+    return methods
+
+
+def _close(
+    stack: List[_Frame],
+    parens: List[bool],
+    methods: List[MethodSpan],
+    line_at: Callable[[int], int],
+    brace_pos: int,
+    pos: int,
+):
+    """Fecha o frame do topo em uma "}", registrando o método se for um corpo"""
+    if len(stack) == 1:
+        return
+
+    closed = stack.pop()
+    if closed.kind == METHOD_BODY:
+        name, name_pos = closed.method
+        methods.append((name.decode("utf-8", "replace"), line_at(name_pos), line_at(brace_pos)))
+
+    parent = stack[-1]
+    if parent.kind == TYPE_BODY and len(parens) == parent.paren_base:
+        parent.member_start = pos
+
+
+def _open_member(
+    source: bytes, frame: _Frame, brace_pos: int, paren_base: int, pos: int
+) -> _Frame:
+    """Decide o que é a "{" que encerra a declaração de membro em andamento"""
+    tokens = _member_head(source, frame.member_start, brace_pos)
+    values = [t[1] for t in tokens]
+
+    for i, value in enumerate(values):
+        if value in TYPE_KEYWORDS and (i == 0 or values[i - 1] != b"."):
+            if value == b"record" and not (
+                i + 2 < len(values) and tokens[i + 1][0] == "ident" and values[i + 2] in (b"(", b"<")
+            ):
+                continue
+            name = values[i + 1] if i + 1 < len(values) else None
+            body = _Frame(TYPE_BODY, paren_base, pos, name)
+            body.enum_constants = value == b"enum"
+            return body
+
+    if b"=" in values:
+        # Inicializador de campo (array, lambda); classes anônimas já foram
+        # reconhecidas antes de chegar aqui
+        return _Frame(BLOCK, paren_base, pos)
+
+    if frame.enum_constants:
+        # Corpo de constante de enum: A(1) { ... }
+        return _Frame(TYPE_BODY, paren_base, pos)
+
+    if values and values[-1] == b"(" and len(tokens) > 1 and tokens[-2][0] == "ident":
+        name = values[-2]
+        if (
+            name not in NON_METHOD_KEYWORDS
+            and name != frame.name
+            and not _has_default_value(source, tokens[-1][2], brace_pos)
+        ):
+            body = _Frame(METHOD_BODY, paren_base, pos)
+            body.method = (name, tokens[-2][2])
+            return body
+
+    # Bloco de inicialização, construtor ou construtor compacto de record
+    return _Frame(BLOCK, paren_base, pos)
+
+
+def _has_default_value(source: bytes, paren_pos: int, brace_pos: int) -> bool:
+    """Se a "{" abre o valor padrão de um elemento de anotação, e não um corpo"""
+    close = source.rfind(b")", paren_pos, brace_pos)
+    return close >= 0 and DEFAULT_VALUE.match(source, close, brace_pos) is not None
+
+
+def _member_head(source: bytes, start: int, end: int) -> List[Token]:
+    """
+    Tokens de uma declaração de membro até o primeiro "(" (inclusive)
+
+    Anotações (@Nome, @a.b.Nome(...)) são descartadas. Tudo o que decide o
+    tipo do membro (palavra-chave de tipo, "=", nome do método) aparece antes
+    desse parêntese, então o restante da declaração não é quebrado em tokens.
+
+    No caso comum, comentários e anotações iniciais são pulados por uma única
+    expressão regular e o trecho até o "(" não tem literais nem comentários;
+    os demais casos passam pelo tokenizador completo.
+    """
+    head = HEAD_PREFIX.match(source, start, end).end()
+    paren = source.find(b"(", head, end)
+    stop = end if paren < 0 else paren
+    if paren != head and HEAD_SPECIAL.search(source, head, stop) is None:
+        tokens = [
+            (match.lastgroup, match.group(), match.start())
+            for match in SIMPLE_TOKEN.finditer(source, head, stop)
+        ]
+        if paren >= 0:
+            tokens.append(("punct", b"(", paren))
+        return tokens
+
+    tokens = []
+    # 0: fora de anotação; 1: espera o nome; 2: após o nome; 3: após "."
+    annotation = 0
+    depth = 0
+
+    for match in TOKEN.finditer(source, start, end):
+        group = match.lastgroup
+        if group == "skip":
+            continue
+        value = match.group()
+
+        if depth:
+            # Argumentos de uma anotação
+            if value == b"(":
+                depth += 1
+            elif value == b")":
+                depth -= 1
+            continue
+
+        if annotation == 1 or annotation == 3:
+            annotation = 2 if group == "ident" else 0
+            if value == b"interface":
+                # @interface: declaração de tipo anotação
+                annotation = 0
+                tokens.append((group, value, match.start()))
+            continue
+
+        if annotation == 2:
+            if value == b".":
+                annotation = 3
+                continue
+            annotation = 0
+            if value == b"(":
+                depth = 1
+                continue
+
+        if value == b"@":
+            annotation = 1
+            continue
+
+        tokens.append((group, value, match.start()))
+        if value == b"(":
+            break
+
+    return tokens
+
+
+def extract_methods_from_file(java_file: Union[str, Path]) -> Optional[List[MethodSpan]]:
+    """
+    Extrai os métodos de um arquivo Java, lido via mmap
+
+    Returns:
+        [(nome_metodo, linha_inicio, linha_fim)], ou None se o arquivo não
+        pôde ser lido (falha que não deve ser registrada como "sem métodos")
+    """
+    try:
+        with open(java_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                return extract_methods_from_source(source)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Erro ao processar {java_file}: {e}")
+        return None
+
+
+def _extract_chunk(files: List[Path]) -> List[Tuple[Path, Optional[List[MethodSpan]]]]:
+    """Extrai um lote de arquivos em um processo do pool"""
+    return [(java_file, extract_methods_from_file(java_file)) for java_file in files]
+
+
+def extract_methods_parallel(
+    files: Iterable[Path], workers: int = 0, chunk_size: int = PARALLEL_CHUNK_SIZE
+) -> Iterator[Tuple[Path, Optional[List[MethodSpan]]]]:
+    """
+    Extrai os métodos de muitos arquivos em um pool de processos
+
+    Os resultados são produzidos à medida que os lotes terminam, na mesma
+    ordem dos arquivos de entrada. Com poucos arquivos (ou workers == 1) a
+    extração é feita no próprio processo, sem o custo de subir o pool.
+
+    Args:
+        files: Arquivos Java
+        workers: Número de processos (0 = número de CPUs)
+        chunk_size: Arquivos enviados a um processo por vez
+
+    Yields:
+        (arquivo, [(nome_metodo, linha_inicio, linha_fim)] ou None se o
+        arquivo não pôde ser lido)
+    """
+    files = list(files)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, -(-len(files) // chunk_size))
+
+    if workers <= 1:
+        for java_file in files:
+            yield java_file, extract_methods_from_file(java_file)
+        return
+
+    chunks = [files[i : i + chunk_size] for i in range(0, len(files), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+    ) as executor:
+        for results in executor.map(_extract_chunk, chunks):
+            yield from results
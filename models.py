@@ -4,13 +4,17 @@ from typing import Dict, List, Optional
 DEFAULT_RESULTS_DIR = "./fix_analysis_results_teste"
 DEFAULT_REPOSITORIES_DIR = "./repos"
 
+# Campos de changeHistoryDetails que dependem apenas do commit
+COMMIT_FIELDS = ("commitMessage", "commitDate", "commitAuthor")
+
 @dataclass
 class CodeShovelMethodInfo:
     commit_count: int
     fix_commit_count: int
     fix_ratio: float
-    fix_commits: List[Dict]
-    total_changes: List[Dict]
+    # Arestas [sha, tipo de mudança]; os metadados dos commits ficam uma
+    # única vez por SHA no checkpoint do repositório
+    commits: List[List[Optional[str]]]
 
 @dataclass
 class MethodInfo:
@@ -37,3 +41,4 @@ class Repository:
     name: str
     complete: bool
     files: List[File]
+    head_sha: Optional[str] = None
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Estatísticas atualizadas à medida que os métodos terminam
+
+Cada FixAnalysis produzido alimenta agregadores online (geral, por
+repositório e por categoria de tamanho): contagens, média e variância pelo
+algoritmo de Welford e quantis aproximados por um histograma logarítmico com
+erro relativo limitado (no estilo do DDSketch). O estado de cada agregador
+tem tamanho fixo, independente do número de métodos.
+
+Um resumo é gravado periodicamente (escrita atômica) em
+`fix_analysis_live_stats.json`, de modo que os números correntes de uma
+execução longa podem ser acompanhados sem carregar os resultados.
+"""
+
+import logging
+import math
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from analysis_frame import SIZE_CATEGORY_BINS, SIZE_CATEGORY_NAMES
+from checkpoint import atomic_write_json
+from config import LIVE_STATS_FLUSH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Erro relativo máximo dos quantis aproximados
+QUANTILE_RELATIVE_ACCURACY = 0.01
+
+# Quantis publicados no resumo
+SUMMARY_QUANTILES = {"p25": 0.25, "median": 0.5, "p75": 0.75, "p90": 0.9}
+
+
+class RunningStats:
+    """Contagem, média, variância (Welford), mínimo e máximo de uma série"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Variância amostral (ddof=1, como no pandas)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class QuantileSketch:
+    """
+    Quantis aproximados por um histograma de buckets logarítmicos
+
+    Cada valor positivo cai no bucket ceil(log_gamma(valor)), e o quantil é
+    estimado pelo centro do bucket, com erro relativo de no máximo
+    relative_accuracy. Valores não positivos ficam em um bucket próprio e
+    são estimados como zero.
+    """
+
+    def __init__(self, relative_accuracy: float = QUANTILE_RELATIVE_ACCURACY):
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma = gamma
+        self._log_gamma = math.log(gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+
+    def add(self, value: float):
+        self.count += 1
+        if value <= 0:
+            self._zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Valor aproximado do quantil q (0 a 1), ou None sem valores"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+
+class Metric:
+    """Agregadores online de uma métrica (momentos e quantis)"""
+
+    def __init__(self):
+        self.moments = RunningStats()
+        self.quantiles = QuantileSketch()
+
+    def add(self, value: float):
+        self.moments.add(value)
+        self.quantiles.add(value)
+
+    def summary(self) -> Dict:
+        moments = self.moments
+        if moments.count == 0:
+            return {}
+        summary = {
+            "mean": moments.mean,
+            "variance": moments.variance,
+            "std": math.sqrt(moments.variance),
+            "min": moments.min,
+            "max": moments.max,
+        }
+        for name, q in SUMMARY_QUANTILES.items():
+            # A estimativa do bucket nunca sai do intervalo observado
+            summary[name] = min(max(self.quantiles.quantile(q), moments.min), moments.max)
+        return summary
+
+
+class MethodGroup:
+    """Estatísticas de um conjunto de métodos (geral, repositório ou categoria)"""
+
+    def __init__(self):
+        self.methods = 0
+        self.methods_with_fixes = 0
+        self.commits = 0
+        self.fix_commits = 0
+        self.size_lines = Metric()
+        self.fix_ratio = Metric()
+
+    def add(self, info):
+        self.methods += 1
+        self.methods_with_fixes += info.fix_commit_count > 0
+        self.commits += info.commit_count
+        self.fix_commits += info.fix_commit_count
+        self.size_lines.add(info.size_lines)
+        self.fix_ratio.add(info.fix_ratio)
+
+    def summary(self) -> Dict:
+        return {
+            "methods": self.methods,
+            "methods_with_fixes": self.methods_with_fixes,
+            "commits": self.commits,
+            "fix_commits": self.fix_commits,
+            "size_lines": self.size_lines.summary(),
+            "fix_ratio": self.fix_ratio.summary(),
+        }
+
+
+def size_category(size_lines: int) -> str:
+    """Categoria de tamanho (config.METHOD_SIZE_CATEGORIES) de um método"""
+    # Mesma regra do pd.cut: a primeira faixa cujo limite superior >= tamanho
+    index = bisect_left(SIZE_CATEGORY_BINS, size_lines, lo=1) - 1
+    return SIZE_CATEGORY_NAMES[min(index, len(SIZE_CATEGORY_NAMES) - 1)]
+
+
+class OnlineStatistics:
+    """Estatísticas da execução, atualizadas a cada método concluído"""
+
+    def __init__(
+        self,
+        state_path: Union[str, Path],
+        flush_interval: int = LIVE_STATS_FLUSH_INTERVAL,
+    ):
+        """
+        Args:
+            state_path: Arquivo do resumo (regravado a cada flush_interval
+                métodos e em save())
+            flush_interval: Métodos entre duas gravações do resumo
+        """
+        self.state_path = Path(state_path)
+        self.flush_interval = max(1, flush_interval)
+        self.overall = MethodGroup()
+        self.repositories: Dict[str, MethodGroup] = {}
+        self.size_categories: Dict[str, MethodGroup] = {
+            name: MethodGroup() for name in SIZE_CATEGORY_NAMES
+        }
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def add(self, analysis):
+        """Acrescenta a análise de um método concluído"""
+        if analysis is None:
+            return
+        info = analysis.method_info
+        with self._lock:
+            self.overall.add(info)
+            self.repositories.setdefault(info.repository, MethodGroup()).add(info)
+            self.size_categories[size_category(info.size_lines)].add(info)
+
+            self._pending += 1
+            if self._pending >= self.flush_interval:
+                self._save()
+
+    def summary(self) -> Dict:
+        """Números correntes: geral, por repositório e por categoria de tamanho"""
+        with self._lock:
+            return self._summary()
+
+    def _summary(self) -> Dict:
+        return {
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "overall": self.overall.summary(),
+            "repositories": {
+                name: group.summary() for name, group in sorted(self.repositories.items())
+            },
+            "size_categories": {
+                name: group.summary() for name, group in self.size_categories.items()
+            },
+        }
+
+    def save(self):
+        """Grava o resumo corrente"""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        try:
+            atomic_write_json(self.state_path, self._summary())
+        except OSError as e:
+            logger.warning(f"Erro ao gravar {self.state_path}: {e}")
+        self._pending = 0
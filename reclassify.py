@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Reclassificação dos resultados gravados com outras palavras-chave de fix
+
+Os registros de `<repo>_fix_analysis.json`/`.jsonl` guardam a lista de commits
+de cada método (pares [sha, tipo]) e `<repo>_commits.json` guarda a mensagem
+de cada commit. Com isso, trocar as palavras-chave não exige executar o
+CodeShovel de novo: as mensagens do repositório são classificadas em lote, e
+os registros são percorridos uma única vez, recalculando fix_commit_count e
+fix_ratio e regravando o arquivo (escrita em arquivo temporário e renomeação).
+
+Registros antigos, que ainda carregam o `codeshovel_data` completo, são
+reclassificados a partir das mensagens embutidas. Registros sem nenhuma fonte
+das mensagens (só com as contagens) nunca são zerados: mantêm os valores
+gravados.
+"""
+
+import json
+import logging
+import os
+import textwrap
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Union
+
+import pandas as pd
+
+from commit_table import CommitTable
+from fix_classifier import FixClassifier
+from jsonl_results import iter_jsonl
+from results_loader import iter_json_array, project_record
+
+logger = logging.getLogger(__name__)
+
+RESULTS_SUFFIX = "_fix_analysis"
+
+
+def _fix_count(
+    record: Dict,
+    commits: Optional[CommitTable],
+    fix_shas: Set[str],
+    classifier: FixClassifier,
+) -> Optional[int]:
+    """
+    Número de commits de fix do método segundo o novo classificador, ou None
+    se as mensagens dos commits do método não estiverem disponíveis
+    """
+    edges = record.get("commits") or []
+    if edges and commits is not None and all(sha in commits for sha, _ in edges):
+        return sum(1 for sha, _ in edges if sha in fix_shas)
+
+    # Registro no formato antigo, com os detalhes dos commits embutidos
+    codeshovel_data = record["method_info"].get("codeshovel_data") or {}
+    details = codeshovel_data.get("changeHistoryDetails") or {}
+    messages = [data.get("commitMessage") for data in details.values() if isinstance(data, dict)]
+    if messages:
+        return int(classifier.is_fix_many(pd.Series(messages, dtype=object)).sum())
+
+    if not edges and not record["method_info"]["commit_count"]:
+        return 0
+    return None
+
+
+def _reclassify_record(
+    record: Dict,
+    commits: Optional[CommitTable],
+    fix_shas: Set[str],
+    classifier: FixClassifier,
+) -> bool:
+    """Atualiza fix_commit_count e fix_ratio; False mantém o registro como está"""
+    fix_count = _fix_count(record, commits, fix_shas, classifier)
+    if fix_count is None:
+        return False
+    info = record["method_info"]
+    record["fix_commit_count"] = fix_count
+    info["fix_ratio"] = fix_count / info["commit_count"] if info["commit_count"] else 0.0
+    return True
+
+
+def reclassify_results_file(
+    path: Union[str, Path], classifier: FixClassifier
+) -> Iterator[Dict]:
+    """
+    Reclassifica um arquivo de resultados, regravando-o ao final
+
+    Registros sem as mensagens dos seus commits (sem `<repo>_commits.json`
+    ou no formato que guardava só as contagens) mantêm os valores gravados;
+    se nenhum registro puder ser reclassificado, o arquivo não é regravado.
+
+    Args:
+        path: `<repo>_fix_analysis.json` ou `.jsonl`
+        classifier: Novo classificador
+
+    Yields:
+        Registros projetados (colunas do relatório) já reclassificados
+    """
+    path = Path(path)
+    jsonl = path.suffix == ".jsonl"
+    repo_name = path.stem[: -len(RESULTS_SUFFIX)]
+
+    commits = None
+    fix_shas: Set[str] = set()
+    commits_path = path.with_name(f"{repo_name}_commits.json")
+    if commits_path.is_file():
+        commits = CommitTable.load(commits_path)
+        if len(commits):
+            fix_shas = commits.reclassify(classifier)
+            logger.info(f"{repo_name}: {len(fix_shas)}/{len(commits)} commits de fix")
+        else:
+            commits = None
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    count = 0
+    reclassified = 0
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        if jsonl:
+            for record in iter_jsonl(path):
+                reclassified += _reclassify_record(record, commits, fix_shas, classifier)
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                count += 1
+                yield project_record(record)
+        else:
+            # Mesmo formato de json.dump(..., indent=2), um registro por vez
+            out.write("[")
+            for record in iter_json_array(path):
+                reclassified += _reclassify_record(record, commits, fix_shas, classifier)
+                out.write(",\n" if count else "\n")
+                out.write(
+                    textwrap.indent(json.dumps(record, indent=2, ensure_ascii=False), "  ")
+                )
+                count += 1
+                yield project_record(record)
+            out.write("\n]" if count else "]")
+
+    if reclassified < count:
+        logger.warning(
+            f"{path}: {count - reclassified} métodos sem as mensagens dos commits "
+            "mantiveram a classificação gravada"
+        )
+    if not reclassified:
+        tmp_path.unlink()
+        return
+
+    os.replace(tmp_path, path)
+    if commits is not None:
+        commits.save(commits_path)
+    logger.info(f"Reclassificado: {path} ({reclassified}/{count} métodos)")
+
+
+def iter_reclassified_results(
+    results_dir: Union[str, Path],
+    classifier: FixClassifier,
+    pattern: str = "*_fix_analysis.json",
+) -> Iterator[Dict]:
+    """Registros projetados e reclassificados de todos os arquivos do diretório"""
+    for path in sorted(Path(results_dir).glob(pattern)):
+        try:
+            yield from reclassify_results_file(path, classifier)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Erro ao reclassificar {path}: {e}")
+            tmp_path = path.with_name(path.name + ".tmp")
+            if tmp_path.exists():
+                tmp_path.unlink()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Leitura incremental dos arquivos `<repo>_fix_analysis.json`
+
+Os arquivos são arrays JSON com um registro por método, cada um carregando o
+`codeshovel_data` completo. Em vez de `json.load` no arquivo inteiro, os
+registros são decodificados um a um a partir de blocos lidos do disco, e só
+os campos usados nos relatórios são mantidos. O pico de memória fica limitado
+ao maior registro, independentemente do tamanho do arquivo.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+from jsonl_results import iter_jsonl
+
+logger = logging.getLogger(__name__)
+
+# Colunas usadas pelas estatísticas, visualizações e relatório
+REPORT_COLUMNS = [
+    "method_name",
+    "repository",
+    "size_lines",
+    "commit_count",
+    "fix_commit_count",
+    "fix_ratio",
+]
+
+# Tamanho dos blocos lidos do arquivo (caracteres)
+READ_CHUNK_SIZE = 1024 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(path: Union[str, Path], chunk_size: int = READ_CHUNK_SIZE) -> Iterator:
+    """
+    Percorre os elementos de um array JSON sem carregar o arquivo inteiro
+
+    Raises:
+        ValueError: Se o arquivo não for um array JSON válido
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} não contém um array JSON")
+        pos = 1
+        eof = False
+
+        while True:
+            # Separadores entre elementos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = f.read(chunk_size), 0
+                eof = not buffer
+
+            if pos >= len(buffer):
+                raise ValueError(f"{path}: array JSON não terminado")
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Elemento incompleto no bloco atual: lê mais e tenta de novo
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+
+            yield item
+            pos = end
+
+
+def project_record(record: Dict) -> Dict:
+    """Campos de um registro usados pelas estatísticas e relatórios"""
+    info = record["method_info"]
+    return {
+        "method_name": info["name"],
+        "repository": info["repository"],
+        "size_lines": info["size_lines"],
+        "commit_count": info["commit_count"],
+        "fix_commit_count": record["fix_commit_count"],
+        "fix_ratio": info["fix_ratio"],
+    }
+
+
+def iter_projected_results(results_dir: Union[str, Path], pattern: str = "*_fix_analysis.json") -> Iterator[Dict]:
+    """
+    Registros projetados de todos os arquivos de resultados do diretório
+
+    Args:
+        results_dir: Diretório de resultados
+        pattern: Arquivos lidos (*.json como array, *.jsonl linha a linha)
+    """
+    for path in sorted(Path(results_dir).glob(pattern)):
+        records = iter_jsonl(path) if path.suffix == ".jsonl" else iter_json_array(path)
+        count = 0
+        try:
+            for record in records:
+                yield project_record(record)
+                count += 1
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Erro ao carregar {path}: {e}")
+            continue
+        logger.info(f"Carregado: {path} ({count} métodos)")
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Armazenamento dos resultados em SQLite
+
+Alternativa aos arquivos `<repo>_fix_analysis.json`: um único banco com as
+tabelas repositories, files, methods, commits e method_commits, indexado por
+repositório, caminho de arquivo e tamanho de método. Cada método é gravado
+(upsert) assim que sua análise termina, e os relatórios consultam o banco
+diretamente em vez de carregar todos os resultados em dicionários Python.
+
+Os metadados de um commit (autor, data, mensagem) ficam uma única vez por
+repositório em commits; method_commits liga cada método aos seus commits.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    repository_id INTEGER NOT NULL REFERENCES repositories (id),
+    path TEXT NOT NULL,
+    UNIQUE (repository_id, path)
+);
+
+CREATE TABLE IF NOT EXISTS methods (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    name TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    size_lines INTEGER NOT NULL,
+    commit_count INTEGER NOT NULL,
+    fix_commit_count INTEGER NOT NULL,
+    fix_ratio REAL NOT NULL,
+    UNIQUE (file_id, name, start_line)
+);
+
+CREATE TABLE IF NOT EXISTS commits (
+    repository_id INTEGER NOT NULL REFERENCES repositories (id),
+    sha TEXT NOT NULL,
+    commit_date TEXT,
+    author TEXT,
+    message TEXT,
+    is_fix INTEGER NOT NULL,
+    PRIMARY KEY (repository_id, sha)
+);
+
+CREATE TABLE IF NOT EXISTS method_commits (
+    method_id INTEGER NOT NULL REFERENCES methods (id),
+    sha TEXT NOT NULL,
+    change_type TEXT,
+    PRIMARY KEY (method_id, sha)
+);
+
+CREATE INDEX IF NOT EXISTS idx_files_path ON files (path);
+CREATE INDEX IF NOT EXISTS idx_methods_size ON methods (size_lines);
+CREATE INDEX IF NOT EXISTS idx_method_commits_sha ON method_commits (sha);
+"""
+
+# Colunas usadas pelas estatísticas, visualizações e relatório
+FRAME_QUERY = """
+SELECT m.name AS method_name,
+       r.name AS repository,
+       m.size_lines,
+       m.commit_count,
+       m.fix_commit_count,
+       m.fix_ratio
+FROM methods m
+JOIN files f ON f.id = m.file_id
+JOIN repositories r ON r.id = f.repository_id
+"""
+
+
+class ResultsStore:
+    """Resultados por método em um banco SQLite, gravados incrementalmente"""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Abre (ou cria) o banco de resultados
+
+        Args:
+            db_path: Caminho do arquivo SQLite
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        self._repository_ids: Dict[str, int] = {}
+        self._file_ids: Dict[Tuple[int, str], int] = {}
+
+    def _repository_id(self, name: str) -> int:
+        if name not in self._repository_ids:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO repositories (name) VALUES (?)", (name,)
+            )
+            row = self._conn.execute(
+                "SELECT id FROM repositories WHERE name = ?", (name,)
+            ).fetchone()
+            self._repository_ids[name] = row[0]
+        return self._repository_ids[name]
+
+    def _file_id(self, repository_id: int, path: str) -> int:
+        key = (repository_id, path)
+        if key not in self._file_ids:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO files (repository_id, path) VALUES (?, ?)", key
+            )
+            row = self._conn.execute(
+                "SELECT id FROM files WHERE repository_id = ? AND path = ?", key
+            ).fetchone()
+            self._file_ids[key] = row[0]
+        return self._file_ids[key]
+
+    def put_analysis(self, analysis):
+        """
+        Grava (ou substitui) a análise de um método
+
+        Args:
+            analysis: FixAnalysis do método
+        """
+        info = analysis.method_info
+        details = {}
+        if isinstance(info.codeshovel_data, dict):
+            details = info.codeshovel_data.get("changeHistoryDetails") or {}
+        fix_names = {c.get("commitName") for c in analysis.fix_commits}
+
+        with self._lock:
+            repository_id = self._repository_id(info.repository)
+            file_id = self._file_id(repository_id, info.file_path)
+
+            self._conn.execute(
+                """
+                INSERT INTO methods (
+                    file_id, name, start_line, end_line, size_lines,
+                    commit_count, fix_commit_count, fix_ratio
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (file_id, name, start_line) DO UPDATE SET
+                    end_line = excluded.end_line,
+                    size_lines = excluded.size_lines,
+                    commit_count = excluded.commit_count,
+                    fix_commit_count = excluded.fix_commit_count,
+                    fix_ratio = excluded.fix_ratio
+                """,
+                (
+                    file_id,
+                    info.name,
+                    info.start_line,
+                    info.end_line,
+                    info.size_lines,
+                    info.commit_count,
+                    info.fix_commit_count,
+                    info.fix_ratio,
+                ),
+            )
+            method_id = self._conn.execute(
+                "SELECT id FROM methods WHERE file_id = ? AND name = ? AND start_line = ?",
+                (file_id, info.name, info.start_line),
+            ).fetchone()[0]
+
+            commits = []
+            edges = []
+            for sha, change in details.items():
+                if not isinstance(change, dict):
+                    continue
+                commits.append(
+                    (
+                        repository_id,
+                        sha,
+                        change.get("commitDate"),
+                        change.get("commitAuthor"),
+                        change.get("commitMessage"),
+                        int(sha in fix_names or change.get("commitName") in fix_names),
+                    )
+                )
+                edges.append((method_id, sha, change.get("type")))
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO commits "
+                "(repository_id, sha, commit_date, author, message, is_fix) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                commits,
+            )
+            self._conn.execute("DELETE FROM method_commits WHERE method_id = ?", (method_id,))
+            self._conn.executemany(
+                "INSERT INTO method_commits (method_id, sha, change_type) VALUES (?, ?, ?)",
+                edges,
+            )
+            self._conn.commit()
+
+    def mark_complete(self, repo_name: str):
+        """Marca o repositório como concluído"""
+        with self._lock:
+            repository_id = self._repository_id(repo_name)
+            self._conn.execute(
+                "UPDATE repositories SET complete = 1 WHERE id = ?", (repository_id,)
+            )
+            self._conn.commit()
+
+    def is_complete(self, repo_name: str) -> bool:
+        """Indica se o repositório já foi concluído em uma execução anterior"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT complete FROM repositories WHERE name = ?", (repo_name,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def iter_methods(self, repo_name: str) -> Iterator[Tuple[Dict, List[Dict], Set[str]]]:
+        """
+        Percorre os métodos gravados de um repositório
+
+        Yields:
+            (colunas do método, [commits no formato de changeHistoryDetails],
+            SHAs dos commits de fix)
+        """
+        with self._lock:
+            methods = self._conn.execute(
+                """
+                SELECT m.id, f.repository_id, m.name, f.path, m.start_line, m.end_line,
+                       m.size_lines, m.commit_count, m.fix_commit_count, m.fix_ratio
+                FROM methods m
+                JOIN files f ON f.id = m.file_id
+                JOIN repositories r ON r.id = f.repository_id
+                WHERE r.name = ?
+                ORDER BY lower(f.path), m.start_line
+                """,
+                (repo_name,),
+            ).fetchall()
+
+        columns = [
+            "id", "repository_id", "name", "file_path", "start_line", "end_line", "size_lines",
+            "commit_count", "fix_commit_count", "fix_ratio",
+        ]
+        for row in methods:
+            method = dict(zip(columns, row))
+            with self._lock:
+                changes = self._conn.execute(
+                    """
+                    SELECT mc.sha, mc.change_type, c.commit_date, c.author, c.message, c.is_fix
+                    FROM method_commits mc
+                    JOIN commits c ON c.repository_id = ? AND c.sha = mc.sha
+                    WHERE mc.method_id = ?
+                    """,
+                    (method["repository_id"], method["id"]),
+                ).fetchall()
+            yield method, [
+                {
+                    "type": change_type,
+                    "commitMessage": message,
+                    "commitDate": date,
+                    "commitName": sha,
+                    "commitAuthor": author,
+                }
+                for sha, change_type, date, author, message, _ in changes
+            ], {sha for sha, *_, is_fix in changes if is_fix}
+
+    def reclassify(self, classifier) -> int:
+        """
+        Reclassifica todos os commits gravados e recalcula fix_commit_count e
+        fix_ratio de todos os métodos
+
+        Args:
+            classifier: FixClassifier com as novas palavras-chave
+
+        Returns:
+            Número de commits de fix
+        """
+        with self._lock:
+            commits = pd.read_sql_query(
+                "SELECT repository_id, sha, message FROM commits", self._conn
+            )
+            is_fix = classifier.is_fix_many(commits["message"])
+            self._conn.executemany(
+                "UPDATE commits SET is_fix = ? WHERE repository_id = ? AND sha = ?",
+                zip(
+                    is_fix.astype(int).tolist(),
+                    commits["repository_id"].tolist(),
+                    commits["sha"].tolist(),
+                ),
+            )
+            self._conn.execute(
+                """
+                UPDATE methods SET fix_commit_count = (
+                    SELECT COUNT(*)
+                    FROM method_commits mc
+                    JOIN files f ON f.id = methods.file_id
+                    JOIN commits c ON c.repository_id = f.repository_id AND c.sha = mc.sha
+                    WHERE mc.method_id = methods.id AND c.is_fix = 1
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                UPDATE methods SET fix_ratio = CASE
+                    WHEN commit_count > 0 THEN CAST(fix_commit_count AS REAL) / commit_count
+                    ELSE 0
+                END
+                """
+            )
+            self._conn.commit()
+        return int(is_fix.sum())
+
+    def load_frame(self) -> pd.DataFrame:
+        """DataFrame com uma linha por método, nas colunas usadas pelos relatórios"""
+        with self._lock:
+            return pd.read_sql_query(FRAME_QUERY, self._conn)
+
+    def close(self):
+        """Fecha o banco"""
+        with self._lock:
+            self._conn.close()
@@ -73,6 +73,10 @@ def main_wrapper():
         print(
             "  python run_analysis.py --codeshovel-jar <jar_path> --repositories-dir <repos_dir>"
         )
+        print(
+            "  python run_analysis.py reclassify --repositories-dir <repos_dir> "
+            "--fix-keywords <a,b>"
+        )
         print("\nExemplo:")
         print(
             "  python run_analysis.py --codeshovel-jar codeshovel.jar --repositories-dir ./repos"
@@ -80,6 +84,16 @@ def main_wrapper():
         print("\nOpções:")
         print("  --repo-limit <num>     Limite de repositórios (padrão: 5)")
         print("  --method-limit <num>   Limite de métodos por repo (padrão: 50)")
+        print("  --jobs <num>           Métodos analisados em paralelo (padrão: 1)")
+        print("  --pool-size <num>      Workers persistentes do CodeShovel (padrão: 0)")
+        print("  --no-cache             Não usa o cache de resultados do CodeShovel")
+        print("  --refresh              Ignora o cache e minera o histórico novamente")
+        print("  --no-resume            Descarta checkpoints e recomeça do zero")
+        print("  --analysis-mode <modo> Backend de histórico: codeshovel, bulk ou blame")
+        print("  --min-file-commits <n> Arquivos com menos commits não usam o CodeShovel")
+        print("  --extraction-workers <n> Processos na extração de métodos (0 = CPUs)")
+        print("  --results-format <f>   Resultados: json, jsonl, sqlite, parquet ou arrow")
+        print("  --fix-keywords <a,b>   Palavras-chave de fix (padrão: config.py)")
         sys.exit(1)
 
     args = sys.argv[1:]
@@ -87,10 +101,17 @@ def main_wrapper():
     repos_dir = None
     repo_limit = 5
     method_limit = 50
+    jobs = 1
+    pool_size = 0
+    command = "analyze"
+    flags = []
 
     i = 0
     while i < len(args):
-        if args[i] == "--codeshovel-jar" and i + 1 < len(args):
+        if args[i] in ("analyze", "reclassify"):
+            command = args[i]
+            i += 1
+        elif args[i] == "--codeshovel-jar" and i + 1 < len(args):
             jar_path = args[i + 1]
             i += 2
         elif args[i] == "--repositories-dir" and i + 1 < len(args):
@@ -102,35 +123,61 @@ def main_wrapper():
         elif args[i] == "--method-limit" and i + 1 < len(args):
             method_limit = int(args[i + 1])
             i += 2
+        elif args[i] == "--jobs" and i + 1 < len(args):
+            jobs = int(args[i + 1])
+            i += 2
+        elif args[i] == "--pool-size" and i + 1 < len(args):
+            pool_size = int(args[i + 1])
+            i += 2
+        elif args[i] in ("--no-cache", "--refresh", "--no-resume"):
+            flags.append(args[i])
+            i += 1
+        elif args[i] in (
+            "--analysis-mode",
+            "--min-file-commits",
+            "--extraction-workers",
+            "--results-format",
+            "--fix-keywords",
+        ) and i + 1 < len(args):
+            flags.extend(args[i : i + 2])
+            i += 2
         else:
             i += 1
 
-    if not jar_path or not repos_dir:
+    if not repos_dir or (command == "analyze" and not jar_path):
         print("✗ Argumentos obrigatórios não fornecidos")
         sys.exit(1)
 
-    # Verificações
-    if not check_codeshovel_jar(jar_path):
+    # Verificações (a reclassificação não executa o CodeShovel)
+    if command == "analyze" and not check_codeshovel_jar(jar_path):
         sys.exit(1)
 
     if not check_repositories_dir(repos_dir):
         sys.exit(1)
 
-    print("\n🚀 Iniciando análise...")
+    if command == "reclassify":
+        print("\n🚀 Reclassificando resultados salvos...")
+    else:
+        print("\n🚀 Iniciando análise...")
     print("=" * 50)
 
     try:
         sys.argv = [
             "fix_analysis.py",
-            "--codeshovel-jar",
-            jar_path,
+            command,
             "--repositories-dir",
             repos_dir,
             "--repo-limit",
             str(repo_limit),
             "--method-limit",
             str(method_limit),
-        ]
+            "--jobs",
+            str(jobs),
+            "--pool-size",
+            str(pool_size),
+        ] + flags
+        if jar_path:
+            sys.argv += ["--codeshovel-jar", jar_path]
 
         main()
 
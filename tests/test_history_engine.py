@@ -0,0 +1,129 @@
+"""Regressões do motor de histórico em lote (history_engine.BulkHistoryEngine)"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from history_engine import BulkHistoryEngine, start_line_added  # noqa: E402
+
+
+def _git(repo: Path, *args: str):
+    subprocess.run(
+        ["git", "-C", str(repo), *args],
+        check=True,
+        capture_output=True,
+        env={
+            "GIT_AUTHOR_NAME": "t",
+            "GIT_AUTHOR_EMAIL": "t@example.com",
+            "GIT_COMMITTER_NAME": "t",
+            "GIT_COMMITTER_EMAIL": "t@example.com",
+            "HOME": str(repo),
+            "PATH": "/usr/bin:/bin:/usr/local/bin",
+        },
+    )
+
+
+def _commit(repo: Path, source: str, message: str):
+    (repo / "A.java").write_text(source)
+    _git(repo, "add", "A.java")
+    _git(repo, "commit", "-q", "-m", message)
+
+
+def _history(repo: Path, methods):
+    result = BulkHistoryEngine(repo).analyze({"A.java": methods})
+    return {
+        key[1]: [
+            (details["type"], details["commitMessage"])
+            for details in data["changeHistoryDetails"].values()
+        ]
+        for key, data in result.items()
+    }
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _commit(
+        tmp_path,
+        "public class A {\n"
+        "    public int bar() {\n"
+        "        return 2;\n"
+        "    }\n"
+        "}\n",
+        "initial",
+    )
+    return tmp_path
+
+
+def test_method_appended_at_end_of_class_is_introduced(repo):
+    # O `}` de bar desliza para dentro do hunk que adiciona baz
+    _commit(
+        repo,
+        "public class A {\n"
+        "    public int bar() {\n"
+        "        return 2;\n"
+        "    }\n"
+        "\n"
+        "    public int baz() {\n"
+        "        return 4;\n"
+        "    }\n"
+        "}\n",
+        "add baz",
+    )
+
+    history = _history(repo, [("bar", 2, 4), ("baz", 6, 8)])
+
+    assert history["baz"] == [("Yintroduced", "add baz")]
+    assert history["bar"] == [("Yintroduced", "initial")]
+
+
+def test_method_appended_while_changing_previous_body_is_introduced(repo):
+    _commit(
+        repo,
+        "public class A {\n"
+        "    public int bar() {\n"
+        "        return 3;\n"
+        "    }\n"
+        "\n"
+        "    public int baz() {\n"
+        "        return 4;\n"
+        "    }\n"
+        "}\n",
+        "change bar, add baz",
+    )
+
+    history = _history(repo, [("bar", 2, 4), ("baz", 6, 8)])
+
+    assert history["baz"] == [("Yintroduced", "change bar, add baz")]
+    assert history["bar"] == [
+        ("Ybodychange", "change bar, add baz"),
+        ("Yintroduced", "initial"),
+    ]
+
+
+def test_signature_change_keeps_history(repo):
+    _commit(
+        repo,
+        "public class A {\n"
+        "    public long bar() {\n"
+        "        return 2;\n"
+        "    }\n"
+        "}\n",
+        "widen bar",
+    )
+
+    history = _history(repo, [("bar", 2, 4)])
+
+    assert history["bar"] == [("Ybodychange", "widen bar"), ("Yintroduced", "initial")]
+
+
+def test_start_line_added():
+    # -9 +9,5: a linha 9 substitui a antiga, 10-13 são adições puras
+    hunks = [(9, 1, 9, 5)]
+    assert not start_line_added(hunks, 9)
+    assert start_line_added(hunks, 12)
+    assert not start_line_added(hunks, 20)